@@ -1,23 +1,22 @@
 import os
-import base64
-from io import BytesIO
-import pandas as pd
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-from flask import Flask, render_template, request, jsonify
+import json
+import math
+import time
+from flask import Flask, Response, render_template, request, jsonify, stream_with_context
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
-from pymongo import MongoClient
+from werkzeug.exceptions import RequestEntityTooLarge
 from dotenv import load_dotenv
-from transformers import pipeline
-from datetime import datetime
 
 # 📦 Core IA
 from core.regression_model import predict_performance
+from core import regression_model
 from core.classifier import classify_sharpe
-from core.llm_advisor import generate_financial_advice
-from core.portfolio_utils import load_cleaned_data
+from core.llm_advisor import generate_financial_advice, stream_financial_advice
+from core import (advice_cache, batch_metrics, chart_service, database, llm_service, market_snapshot, optimizer,
+                  jobs, portfolio_ingest, risk_engine, symbol_index)
+from core.model_registry import get_stats
+from core import sentiment_cache
 
 # 🔐 Load env
 load_dotenv()
@@ -25,40 +24,94 @@ load_dotenv()
 app = Flask(__name__, static_folder='static', template_folder='templates')
 CORS(app)
 app.config['UPLOAD_FOLDER'] = 'uploads'
+app.config['MAX_CONTENT_LENGTH'] = portfolio_ingest.UPLOAD_MAX_BYTES
 
-client = MongoClient(os.getenv("MONGO_URI"))
-db = client["gainers_db"]
+# 📈 Modèle de régression persisté (models/regression_model.npz) rechargé au démarrage
+regression_model.get_model()
 
 @app.route('/')
 def index():
     return render_template('index.html')
 
 # 🤖 IA Otto (LLM)
+_market_version = {"value": None, "checked_at": 0.0}
+
+def market_data_version():
+    """
+    🇫🇷 Version des données utilisées par Otto : change dès que avg_sentiment ou yahoo_gainers est mis à jour.
+    🇬🇧 Version of the data Otto answers from; changes whenever avg_sentiment or yahoo_gainers is refreshed.
+    """
+    now = time.monotonic()
+    if now - _market_version["checked_at"] > 10:
+        try:
+            sentiment_doc = database.latest_avg_sentiment()
+            _market_version["value"] = (
+                f"{sentiment_doc['_id'] if sentiment_doc else None}/{database.latest_gainers_timestamp()}"
+            )
+        except Exception:
+            _market_version["value"] = None
+        _market_version["checked_at"] = now
+    return _market_version["value"]
+
+def _advice_kwargs(data):
+    return dict(
+        question=data.get("question", ""),
+        sentiment_score=float(data.get("sentiment_score", 0.0)),
+        gainers_list=data.get("gainers_list", []),
+        portfolio=data.get("portfolio", {}),
+        sharpe_value=float(data["sharpe_value"]) if data.get("sharpe_value") is not None else None,
+        transactions=data.get("transactions", ""),
+        data_version=market_data_version()
+    )
+
+def _advice_metrics(data):
+    performance = predict_performance(float(data.get("price", 100)), float(data.get("sentiment_score", 0.0)))
+    # 📉 Sharpe annualisé du portefeuille (rendement moyen et covariance locaux), comme /portfolio-metrics
+    risk = risk_engine.portfolio_risk(data.get("portfolio") or {}, 0.02)
+    sharpe = risk["sharpe_ratio"]
+    return {"prediction": performance, "sharpe": sharpe,
+            "classification": classify_sharpe(sharpe) if sharpe is not None else None,
+            "volatility_used": risk["volatility"]}
+
 @app.route('/ask-llm', methods=['POST'])
 def ask_llm():
     try:
         data = request.get_json()
-        answer = generate_financial_advice(
-            question=data.get("question", ""),
-            sentiment_score=float(data.get("sentiment_score", 0.0)),
-            gainers_list=data.get("gainers_list", []),
-            portfolio=data.get("portfolio", {}),
-            sharpe_value=float(data.get("sharpe_value", 0.0)),
-            transactions=data.get("transactions", "")
-        )
-        performance = predict_performance(float(data.get("price", 100)), float(data.get("sentiment_score", 0.0)))
-        sharpe = (performance - 0.02) / 0.2
-        classification = classify_sharpe(sharpe)
-        return jsonify({
-            "status": "success",
-            "answer": answer,
-            "prediction": performance,
-            "sharpe": sharpe,
-            "classification": classification
-        })
+        answer = generate_financial_advice(**_advice_kwargs(data))
+        return jsonify({"status": "success", "answer": answer, **_advice_metrics(data)})
     except Exception as e:
         return jsonify({"status": "error", "message": f"LLM error: {str(e)}"}), 500
 
+# 📡 IA Otto en streaming (Server-Sent Events)
+@app.route('/ask-llm-stream', methods=['POST'])
+def ask_llm_stream():
+    try:
+        data = request.get_json()
+        kwargs = _advice_kwargs(data)
+        metrics = _advice_metrics(data)
+    except Exception as e:
+        return jsonify({"status": "error", "message": f"LLM error: {str(e)}"}), 400
+
+    def sse(event, payload):
+        return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+    def events():
+        yield sse("meta", metrics)
+        try:
+            for text in stream_financial_advice(**kwargs):
+                yield sse("token", {"text": text})
+            yield sse("done", {"status": "success"})
+        except llm_service.LLMBusyError as e:
+            yield sse("error", {"status": "busy", "message": str(e)})
+        except Exception as e:
+            yield sse("error", {"status": "error", "message": f"LLM error: {str(e)}"})
+
+    return Response(
+        stream_with_context(events()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 # 📤 Upload de portefeuille
 @app.route('/upload', methods=['POST'])
 def upload_portfolio():
@@ -66,20 +119,24 @@ def upload_portfolio():
         file = request.files.get('file')
         if not file:
             return jsonify({"status": "error", "message": "No file uploaded"}), 400
+        # 🖼️ ?chart=png (défaut, base64) | svg | json (données seules, dessinées par le navigateur)
+        chart_format = request.args.get('chart', 'png').lower()
+        if chart_format not in chart_service.CHART_FORMATS:
+            return jsonify({"status": "error", "message": f"Unknown chart format '{chart_format}'"}), 400
         filename = secure_filename(file.filename)
-        ext = os.path.splitext(filename)[1].lower()
-        df = pd.read_csv(file) if ext == ".csv" else pd.read_excel(file)
-        df = df[['Symbol', 'Quantity']]
-        df['Quantity'] = pd.to_numeric(df['Quantity'], errors='coerce').fillna(0)
-        summary = df.groupby('Symbol')['Quantity'].sum().to_dict()
-        fig, ax = plt.subplots()
-        ax.pie(summary.values(), labels=summary.keys(), autopct='%1.1f%%')
-        plt.title("Portfolio Allocation")
-        buf = BytesIO()
-        plt.savefig(buf, format="png")
-        buf.seek(0)
-        chart_base64 = base64.b64encode(buf.read()).decode('utf-8')
-        return jsonify({"status": "success", "summary": summary, "chart": chart_base64})
+        # 🌊 Lecture par paquets (core.portfolio_ingest) : colonnes Symbol/Quantity seulement
+        ingest = portfolio_ingest.aggregate(file.stream, filename)
+        summary = ingest.pop("summary")
+        chart = chart_service.render_allocation(summary, chart_format)
+        return jsonify({"status": "success", "summary": summary, "chart": chart, "chart_format": chart_format,
+                        "ingest": ingest})
+    except RequestEntityTooLarge:
+        limit_mb = portfolio_ingest.UPLOAD_MAX_BYTES / 1024 ** 2
+        return jsonify({"status": "error", "message": f"File too large (max {limit_mb:.0f} MB)"}), 413
+    except portfolio_ingest.UploadLimitError as e:
+        return jsonify({"status": "error", "message": str(e)}), 413
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)}), 500
 
@@ -91,34 +148,75 @@ def portfolio_metrics():
         portfolio = data.get("portfolio", {})
         if not portfolio:
             return jsonify({"status": "error", "message": "Empty portfolio"}), 400
-        df = load_cleaned_data()
-        df = df[df['_id'].isin(portfolio.keys())]
-        df['quantity'] = df['_id'].map(portfolio)
-        df['weighted_perf'] = df['performance'] * df['quantity']
-        avg_perf = df['weighted_perf'].sum() / df['quantity'].sum()
-        volatility = 0.2
-        sharpe = (avg_perf - 0.02) / volatility
-        return jsonify({
-            "status": "success",
-            "average_performance": round(avg_perf, 4),
-            "sharpe_ratio": round(sharpe, 4),
-            "volatility_used": volatility
-        })
+        # ⚡ Même calcul vectorisé que le lot (snapshot en mémoire + covariance en cache), avec K = 1
+        result = batch_metrics.evaluate([{symbol: float(quantity) for symbol, quantity in portfolio.items()}])[0]
+        if result["status"] != "success":
+            return jsonify(result), 404
+        return jsonify(result)
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+# 📦 Métriques en lot (back-office) : JSON ou NDJSON en entrée, JSON Lines en sortie (streaming)
+@app.route('/portfolio-metrics/batch', methods=['POST'])
+def portfolio_metrics_batch():
+    try:
+        risk_free_rate = float(request.args.get("risk_free_rate", 0.02))
+        if not math.isfinite(risk_free_rate):
+            raise ValueError
+    except ValueError:
+        return jsonify({"status": "error", "message": "risk_free_rate must be a finite number"}), 400
+    if request.mimetype in ("application/x-ndjson", "application/jsonl"):
+        def items():
+            for line in request.stream:
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except ValueError as e:
+                        yield {"error": str(e)}
+    else:
+        data = request.get_json(silent=True) or {}
+        portfolios = data.get("portfolios")
+        if not isinstance(portfolios, list):
+            return jsonify({"status": "error", "message": "Expected {'portfolios': [{'id': ..., 'portfolio': {...}}]}"}), 400
+        items = lambda: iter(portfolios)
+
+    def lines():
+        for result in batch_metrics.iter_evaluate(items(), risk_free_rate):
+            yield json.dumps(result) + "\n"
+
+    return Response(stream_with_context(lines()), mimetype="application/x-ndjson")
+
+# 🧮 Optimisation moyenne-variance (variance minimale, Sharpe maximal, rendement cible)
+@app.route('/optimize-portfolio', methods=['POST'])
+def optimize_portfolio():
+    try:
+        data = request.get_json()
+        portfolio = data.get("portfolio", {})
+        if not portfolio:
+            return jsonify({"status": "error", "message": "Empty portfolio"}), 400
+        target = data.get("target_return")
+        result = optimizer.optimize_portfolio(
+            portfolio,
+            objective=data.get("objective", "max_sharpe"),
+            target=float(target) if target is not None else None,
+            max_weight=float(data.get("max_weight", 1.0)),
+            risk_free_rate=float(data.get("risk_free_rate", 0.02)),
+            frontier_points=int(data.get("frontier_points", 20))
+        )
+        return jsonify({"status": "success", **result})
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)}), 500
 
 # 🔍 Recherche d’un symbole
 @app.route('/search-symbol', methods=['POST'])
 def search_symbol():
-    user_input = request.json.get('query', '').strip().lower()
-    coll = db['yahoo_all_stocks']
-    result = coll.find_one({
-        "$or": [
-            {"_id": user_input.upper()},
-            {"name": {"$regex": user_input, "$options": "i"}},
-        ]
-    })
-    if result:
+    user_input = request.json.get('query', '').strip()
+    # 🔎 Index en mémoire (core.symbol_index) : plus de $regex construit à partir de la saisie
+    results = symbol_index.search(user_input, limit=1)
+    if results:
+        result = results[0]
         result['_id'] = str(result['_id'])
         return jsonify({"status": "found", "data": [result]})
     return jsonify({"status": "not_found", "message": f"No stock found for '{user_input}'"})
@@ -126,14 +224,8 @@ def search_symbol():
 # 🧠 Autocomplete
 @app.route('/autocomplete-symbols', methods=['POST'])
 def autocomplete_symbols():
-    query = request.json.get('query', '').strip().lower()
-    coll = db['yahoo_all_stocks']
-    results = coll.find({
-        "$or": [
-            {"_id": {"$regex": f"^{query}", "$options": "i"}},
-            {"name": {"$regex": query, "$options": "i"}}
-        ]
-    }).limit(5)
+    query = request.json.get('query', '').strip()
+    results = symbol_index.search(query, limit=5)
     matches = [{"_id": doc["_id"], "name": doc.get("name", "")} for doc in results]
     return jsonify({"status": "success", "matches": matches})
 
@@ -142,19 +234,13 @@ def autocomplete_symbols():
 def top_gainers():
     offset = int(request.args.get('offset', 0))
     limit = int(request.args.get('limit', 5))
-    docs = db["yahoo_gainers"].find().sort("change", -1).skip(offset).limit(limit)
-    result = [{'_id': doc['_id'], 'price': doc['price'], 'change': doc['change']} for doc in docs]
-    return jsonify(result)
+    return jsonify(database.top_gainers(offset, limit))
 
 # 📰 Analyse de sentiment
 @app.route('/analyze-sentiment')
 def analyze_sentiment():
-    news = list(db["news_articles"].aggregate([
-        {"$sample": {"size": 5}},  # 5 articles aléatoires
-        {"$project": {"_id": 1, "title": 1, "link": 1}}  # Exclure le contenu pour ne garder que le titre et le lien
-    ]))
-    avg_doc = db["avg_sentiment"].find_one()
-    avg_score = avg_doc.get("avg_sentiment_score", 0.0) if avg_doc else 0.0
+    news = database.sample_news(5)  # 5 articles aléatoires (titre + lien)
+    avg_score = database.get_avg_sentiment_score() or 0.0
     return jsonify({
         "news": [{"title": n["title"], "link": n["link"]} for n in news],
         "avg_score": avg_score
@@ -164,29 +250,84 @@ def analyze_sentiment():
 @app.route('/analyze-news-local')
 def analyze_news_local():
     try:
-        news = list(db["news_articles"].find().sort("scraped_at", -1).limit(5))
-        texts = [n["title"] for n in news]
-        sentiment_pipeline = pipeline("sentiment-analysis", model="mrm8488/distilroberta-finetuned-financial-news-sentiment-analysis")
-        results = sentiment_pipeline(texts)
-        scores = [r['score'] if r['label'] == 'positive' else -r['score'] for r in results]
-        avg_score = round(sum(scores) / len(scores), 4) if scores else 0.0
-
-        # Mettre à jour les articles avec leur sentiment et score
-        for i, article in enumerate(news):
-            sentiment = results[i]['label']
-            sentiment_score = scores[i]
-            db["news_articles"].update_one(
-                {"_id": article["_id"]},
-                {"$set": {"sentiment": sentiment, "sentiment_score": sentiment_score, "analyzed_at": datetime.utcnow().isoformat()}}
-            )
+        return jsonify(jobs.analyze_latest_news())
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e)}), 500
 
-        return jsonify({
-            "news": [{"title": n["title"], "link": n["link"]} for n in news],
-            "avg_score": avg_score,
-            "details": results
-        })
+# ⏳ Tâches asynchrones (core.jobs) : identifiant immédiat, calcul dans un pool de processus
+def _job_params(kind, data):
+    if kind == "ask-llm":
+        # 🧮 Prompt et métriques préparés ici (rapides), seule la génération part dans le worker
+        return {"advice": _advice_kwargs(data), "metrics": _advice_metrics(data)}
+    if kind == "analyze-news-local":
+        return {"limit": int(data.get("limit", 5))}
+    if kind == "alpha-beta":
+        return {"limit": int(data.get("limit", 50))}
+    return data
+
+@app.route('/jobs/<kind>', methods=['POST'])
+def submit_job(kind):
+    if kind not in jobs.TASKS:
+        return jsonify({"status": "error", "message": f"Unknown job kind '{kind}'"}), 400
+    try:
+        params = _job_params(kind, request.get_json(silent=True) or {})
+    except (TypeError, ValueError) as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    try:
+        job_id = jobs.submit(kind, params)
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)}), 500
+    return jsonify({"status": "queued", "job_id": job_id,
+                    "status_url": f"/jobs/{job_id}", "result_url": f"/jobs/{job_id}/result"}), 202
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    job = jobs.status(job_id)
+    if job is None:
+        return jsonify({"status": "error", "message": "Unknown job"}), 404
+    return jsonify(job)
+
+@app.route('/jobs/<job_id>/result', methods=['GET'])
+def job_result(job_id):
+    job, result = jobs.result(job_id)
+    if job is None:
+        return jsonify({"status": "error", "message": "Unknown job"}), 404
+    if job["status"] in (jobs.QUEUED, jobs.RUNNING):
+        return jsonify(job), 202
+    if job["status"] != jobs.DONE:
+        return jsonify({**job, "message": job["error"] or f"Job {job['status']}"}), 409
+    return jsonify({**job, "result": result})
+
+@app.route('/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    job = jobs.cancel(job_id)
+    if job is None:
+        return jsonify({"status": "error", "message": "Unknown job"}), 404
+    return jsonify(job)
+
+# 🩺 Compteurs mémoire/latence des modèles
+@app.route('/model-stats')
+def model_stats():
+    stats = get_stats()
+    stats["sentiment_cache"] = sentiment_cache.get_stats()
+    stats["llm"] = llm_service.get_stats()
+    stats["advice_cache"] = advice_cache.get_stats()
+    stats["regression"] = regression_model.get_stats()
+    stats["charts"] = chart_service.get_stats()
+    stats["jobs"] = jobs.get_stats()
+    return jsonify(stats)
+
+# 🩺 Métriques MongoDB (pool + latence par commande)
+@app.route('/db-stats')
+def db_stats():
+    stats = database.get_stats()
+    stats["market_snapshot"] = market_snapshot.get_stats()
+    stats["symbol_index"] = symbol_index.get_stats()
+    try:
+        stats["ping_ms"] = database.timed_ping()
+    except Exception as e:
+        stats["ping_error"] = str(e)
+    return jsonify(stats)
 
 # 🚀 Local ou Azure (PORT variable)
 if __name__ == '__main__':
@@ -1,30 +1,133 @@
-import schedule
+# auto_schedule.py
+# 🇫🇷 Planificateur en processus : gainers → news → sentiment → moyennes → régression (+ all_stocks en parallèle).
+# 🇩🇪 In-Process-Planer: Gainers → News → Sentiment → Durchschnitte → Regression (+ all_stocks parallel).
+# 🇬🇧 In-process pipeline scheduler (core.pipeline) replacing the former fixed-interval subprocesses.
+#
+#   python auto_schedule.py                      # boucle : gainers toutes les 5 min, pipeline complet toutes les 15 min
+#   python auto_schedule.py --once               # un seul passage complet puis sortie (run.sh option 3)
+#   python auto_schedule.py --once --stages news # "news" et ses dépendances seulement
+#
+# Les étapes tournent dans ce processus : modèle de sentiment et client MongoDB restent chauds
+# d’un passage à l’autre. Un passage encore en cours fait ignorer le suivant, et chaque passage
+# (statut + durée par étape) est enregistré dans la collection pipeline_runs.
+
+import os
+import sys
 import time
-import subprocess
+import argparse
+import threading
+import importlib.util
 from datetime import datetime
 
+import schedule
+from dotenv import load_dotenv
+
+import backfill_prices
+import update_all_stocks
+import update_gainers
+import update_news
+from core import regression_model
+from core.database import close_client, insert_pipeline_run
+from core.pipeline import OK, Pipeline, Stage
+
+load_dotenv()
 LOG_PATH = "logs/auto.log"
+GAINERS_INTERVAL = int(os.getenv("GAINERS_INTERVAL_MINUTES", 5))
+PIPELINE_INTERVAL = int(os.getenv("PIPELINE_INTERVAL_MINUTES", 15))
+BACKFILL_AT = os.getenv("BACKFILL_AT", "23:00")
+ANALYSE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts scraping", "analyse")
+
 
 def log(message):
+    os.makedirs(os.path.dirname(LOG_PATH), exist_ok=True)
     with open(LOG_PATH, "a") as f:
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         f.write(f"[{timestamp}] {message}\n")
     print(f"[{timestamp}] {message}")
 
-def run_gainers():
-    log("🔄 Updating Top Gainers...")
-    subprocess.run(["python3", "update_gainers.py"])
 
-def run_news():
-    log("📰 Updating News & Sentiment...")
-    subprocess.run(["python3", "update_news.py"])
+def load_script(name: str):
+    # 📂 "scripts scraping/" n’est pas un paquet importable (espace dans le nom)
+    spec = importlib.util.spec_from_file_location(name, os.path.join(ANALYSE_DIR, f"{name}.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+analyze_sentiment = load_script("analyze_sentiment")
+compute_avg_sentiment = load_script("compute_avg_sentiment")
+
+market = Pipeline("market", [
+    Stage("gainers", update_gainers.fetch_yahoo_gainers),
+    Stage("news", update_news.main, after=["gainers"]),                 # lit les symboles de yahoo_gainers
+    Stage("sentiment", lambda: analyze_sentiment.main([]), after=["news"]),
+    Stage("averages", compute_avg_sentiment.main, after=["sentiment"]),
+    # 📈 Nouvel instantané des gainers ajouté au modèle de régression (statistiques suffisantes, sans réentraînement)
+    Stage("regression", regression_model.update_from_gainers, after=["gainers", "averages"]),
+    Stage("all_stocks", update_all_stocks.main),                        # indépendant : en parallèle
+])
+daily = Pipeline("daily", [
+    Stage("backfill", lambda: backfill_prices.main(["--period", "5d"])),
+])
+
+_last_full = {"at": None}
+
+
+def run_pipeline(pipeline: Pipeline, targets=None):
+    """
+    🇬🇧 Runs `pipeline` (or `targets` and their dependencies), logs the per-stage durations and
+        stores the run in pipeline_runs. Returns the run record, None if the run was skipped.
+    """
+    record = pipeline.run(targets)
+    if record is None:
+        log(f"⏭️ {pipeline.name} : passage précédent encore en cours, ignoré")
+        return None
+    if pipeline is market and targets is None:
+        _last_full["at"] = time.monotonic() - record["seconds"]
+
+    stages = ", ".join(f"{name} {r['seconds']:.1f}s" + ("" if r["status"] == OK else f" ({r['status']})")
+                       for name, r in record["stages"].items())
+    log(f"{'✅' if record['status'] == OK else '❌'} {pipeline.name} en {record['seconds']:.1f}s — {stages}")
+    try:
+        insert_pipeline_run(record)
+    except Exception as e:
+        log(f"⚠️ Passage non enregistré dans pipeline_runs : {e}")
+    return record
+
+
+def tick():
+    # 🔁 Toutes les GAINERS_INTERVAL minutes : pipeline complet si le dernier date de PIPELINE_INTERVAL, sinon gainers seuls
+    full = _last_full["at"] is None or time.monotonic() - _last_full["at"] >= PIPELINE_INTERVAL * 60
+    targets = None if full else ["gainers"]
+    threading.Thread(target=run_pipeline, args=(market, targets), name="market-run", daemon=True).start()
+
+
+def run_daily():
+    threading.Thread(target=run_pipeline, args=(daily,), name="daily-run", daemon=True).start()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dependency-aware scraping / analysis scheduler")
+    parser.add_argument("--once", action="store_true", help="Un seul passage puis sortie")
+    parser.add_argument("--stages", nargs="*", choices=market.order, metavar="STAGE",
+                        help=f"Étapes cibles (défaut : toutes) parmi {', '.join(market.order)}")
+    args = parser.parse_args()
+
+    if args.once:
+        record = run_pipeline(market, args.stages)
+        close_client()
+        sys.exit(0 if record and record["status"] == OK else 1)
+
+    schedule.every(GAINERS_INTERVAL).minutes.do(tick)
+    schedule.every().day.at(BACKFILL_AT).do(run_daily)
+    log(f"✅ Scheduler started: gainers every {GAINERS_INTERVAL} min, full pipeline "
+        f"({', '.join(market.order)}) every {PIPELINE_INTERVAL} min, price backfill daily at {BACKFILL_AT}")
+    tick()
 
-# Schedule tasks
-schedule.every(5).minutes.do(run_gainers)
-schedule.every(15).minutes.do(run_news)
+    while True:
+        schedule.run_pending()
+        time.sleep(1)
 
-log("✅ Scheduler started: Gainers every 5 min, News every 15 min")
 
-while True:
-    schedule.run_pending()
-    time.sleep(1)
+if __name__ == "__main__":
+    main()
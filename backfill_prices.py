@@ -0,0 +1,75 @@
+# backfill_prices.py
+# 🇫🇷 Remplit l’historique local des prix (core.price_store) avec les barres journalières de Yahoo Finance.
+# 🇩🇪 Füllt die lokale Preishistorie (core.price_store) mit Tagesbars von Yahoo Finance.
+# 🇬🇧 Backfills the local price store with daily bars from Yahoo Finance (run offline; older bars
+#     are merged into the stored history and re-running skips bars already stored).
+#
+#   python backfill_prices.py --period 1y
+#   python backfill_prices.py --symbols AAPL MSFT --period 5y
+
+import argparse
+
+import numpy as np
+from dotenv import load_dotenv
+
+from core import price_store
+from core.database import close_client, get_db, list_gainer_symbols
+from core.risk_engine import MARKET_INDEX
+
+load_dotenv()
+
+
+def universe() -> list:
+    """
+    🇬🇧 Symbols of yahoo_gainers and yahoo_all_stocks, plus the market index used for betas.
+    """
+    symbols = set(list_gainer_symbols()) | {MARKET_INDEX}
+    symbols.update(doc["_id"] for doc in get_db()["yahoo_all_stocks"].find({}, {"_id": 1}))
+    return sorted(symbols)
+
+
+def backfill(symbols: list, period: str) -> int:
+    import yfinance as yf
+    import pandas as pd
+
+    data = yf.download(symbols, period=period, interval="1d", progress=False, auto_adjust=False, group_by="column")
+    if data.empty:
+        return 0
+    if not isinstance(data.columns, pd.MultiIndex):
+        data.columns = pd.MultiIndex.from_product([data.columns, symbols])
+
+    # 🕛 Une barre par jour, horodatée à minuit UTC
+    ts = (data.index.tz_localize(None).values.astype("datetime64[s]").astype(np.int64))
+    written = 0
+    for symbol in symbols:
+        if symbol not in data["Close"].columns:
+            print(f"[⚠️] Pas de données pour {symbol}")
+            continue
+        # 💲 Clôture brute (non ajustée), comme les cotations enregistrées par les scrapers
+        close = data["Close"][symbol].to_numpy(dtype=np.float64)
+        volume = data["Volume"][symbol].to_numpy(dtype=np.float64)
+        added = price_store.append_bars(symbol, ts, close, volume)
+        written += added
+        print(f"[✓] {symbol} : {added} barres ajoutées")
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backfill the local price store from Yahoo Finance")
+    parser.add_argument("--period", default="1y")
+    parser.add_argument("--symbols", nargs="*", help="Par défaut : tous les symboles en base")
+    args = parser.parse_args(argv)
+
+    symbols = args.symbols or universe()
+    if not symbols:
+        print("[⚠️] Aucun symbole à compléter.")
+        return
+    print(f"[🔍] Historique {args.period} pour {len(symbols)} symboles…")
+    written = backfill(symbols, args.period)
+    price_store.bump_version()
+    print(f"[✅] {written} barres ajoutées dans {price_store.PRICE_STORE_DIR}")
+
+
+if __name__ == "__main__":
+    main()
+    close_client()
@@ -0,0 +1,102 @@
+# benchmarks/compare_sentiment_backends.py
+# 🇫🇷 Compare précision et latence des backends de sentiment (int8, ONNX) par rapport au modèle fp32.
+# 🇩🇪 Vergleicht Genauigkeit und Latenz der Sentiment-Backends (int8, ONNX) mit dem fp32-Modell.
+# 🇬🇧 Accuracy-vs-latency report of the sentiment backends against the fp32 reference model.
+#
+#   python benchmarks/compare_sentiment_backends.py --backends fp32 int8 onnx --repeat 5
+
+import os
+import sys
+import json
+import time
+import argparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from core.sentiment_backends import BACKENDS
+from core.sentiment_engine import score_texts
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "headlines.txt")
+
+
+def load_headlines(path: str) -> list:
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def run_backend(backend: str, headlines: list, batch_size: int, repeat: int) -> dict:
+    # 🔥 Premier passage = chargement + warm-up, exclu des mesures
+    start = time.perf_counter()
+    results = score_texts(headlines, batch_size=batch_size, use_cache=False, backend=backend)
+    first_run = time.perf_counter() - start
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        score_texts(headlines, batch_size=batch_size, use_cache=False, backend=backend)
+        timings.append(time.perf_counter() - start)
+
+    per_headline_ms = np.array(timings) / len(headlines) * 1000
+    return {
+        "results": results,
+        "load_and_first_run_s": round(first_run, 3),
+        "ms_per_headline_p50": round(float(np.percentile(per_headline_ms, 50)), 3),
+        "ms_per_headline_p95": round(float(np.percentile(per_headline_ms, 95)), 3),
+        "headlines_per_s": round(len(headlines) / float(np.median(timings)), 1),
+    }
+
+
+def compare(reference: list, candidate: list) -> dict:
+    ref_labels = [r["label"] for r in reference]
+    cand_labels = [r["label"] for r in candidate]
+    prob_diff = np.abs(np.array([r["probs"] for r in reference]) - np.array([r["probs"] for r in candidate]))
+    disagreements = [i for i, (a, b) in enumerate(zip(ref_labels, cand_labels)) if a != b]
+    return {
+        "label_agreement": round(1 - len(disagreements) / len(reference), 4),
+        "max_abs_prob_diff": round(float(prob_diff.max()), 5),
+        "mean_abs_prob_diff": round(float(prob_diff.mean()), 5),
+        "disagreements": disagreements,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sentiment backends: accuracy vs latency")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=BACKENDS)
+    parser.add_argument("--fixture", default=FIXTURE)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="Sortie JSON au lieu du tableau")
+    args = parser.parse_args()
+
+    headlines = load_headlines(args.fixture)
+    backends = ["fp32"] + [b for b in args.backends if b != "fp32"]
+    print(f"[📰] {len(headlines)} titres de référence — backends : {', '.join(backends)}\n")
+
+    report = {}
+    for backend in backends:
+        try:
+            report[backend] = run_backend(backend, headlines, args.batch_size, args.repeat)
+        except Exception as e:
+            print(f"[⚠️] Backend {backend} indisponible : {e}")
+
+    reference = report["fp32"]["results"]
+    for backend, entry in report.items():
+        entry.update(compare(reference, entry.pop("results")))
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"{'backend':<8} {'agree':>7} {'max Δp':>8} {'p50 ms':>8} {'p95 ms':>8} {'tit./s':>8} {'load s':>8}")
+    for backend, e in report.items():
+        print(f"{backend:<8} {e['label_agreement']:>7.2%} {e['max_abs_prob_diff']:>8.4f} "
+              f"{e['ms_per_headline_p50']:>8.2f} {e['ms_per_headline_p95']:>8.2f} "
+              f"{e['headlines_per_s']:>8.1f} {e['load_and_first_run_s']:>8.2f}")
+    for backend, e in report.items():
+        for i in e["disagreements"]:
+            print(f"[≠] {backend}: « {headlines[i]} »")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# benchmarks/html_extractors.py
+# 🇫🇷 Compare temps d’analyse et mémoire des extracteurs d’actualités (core.news_extractors) sur des pages enregistrées.
+# 🇩🇪 Vergleicht Parse-Zeit und Speicher der Nachrichten-Extraktoren (core.news_extractors) auf gespeicherten Seiten.
+# 🇬🇧 Parse time and peak memory of the news extractors on saved Yahoo Finance pages.
+#
+#   python benchmarks/html_extractors.py --repeat 20
+#   python benchmarks/html_extractors.py --limit 0   # toutes les actualités de la page
+
+import os
+import sys
+import glob
+import time
+import argparse
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from core.news_extractors import EXTRACTORS
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "yahoo_*.html")
+
+
+def measure(extract, html: str, limit, repeat: int) -> dict:
+    extract(html, limit)  # 🔥 warm-up (imports, caches)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        extract(html, limit)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    # 🧠 tracemalloc ne voit que le tas Python (pas les arbres libxml2 alloués en C par lxml)
+    tracemalloc.start()
+    links = extract(html, limit)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"p50_ms": float(np.median(timings)), "py_peak_kb": peak / 1024, "links": links}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="News extractor parse time and memory")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=1, help="Liens à extraire (0 = tous)")
+    parser.add_argument("--fixtures", default=FIXTURES)
+    args = parser.parse_args()
+    limit = args.limit or None
+
+    for path in sorted(glob.glob(args.fixtures)):
+        with open(path, encoding="utf-8") as f:
+            html = f.read()
+        print(f"\n[📄] {os.path.basename(path)} ({len(html) / 1024:.0f} KB, limit={limit})")
+        results = {name: measure(extract, html, limit, args.repeat) for name, extract in EXTRACTORS.items()}
+        reference = results["bs4"]
+        for name, r in results.items():
+            same = "✓" if r["links"] == reference["links"] else "≠ bs4"
+            print(f"{name:<8} {r['p50_ms']:>9.2f} ms  {r['py_peak_kb']:>9.0f} KB (tas Python)  "
+                  f"x{reference['p50_ms'] / r['p50_ms']:>6.1f}  {len(r['links'])} liens {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# benchmarks/optimizer_speed.py
+# 🇫🇷 Temps de résolution de l’optimiseur (core.optimizer) sur un univers synthétique.
+# 🇩🇪 Lösungszeit des Optimierers (core.optimizer) auf einem synthetischen Universum.
+# 🇬🇧 Solve time of core.optimizer on a synthetic universe (one-factor returns).
+#
+#   python benchmarks/optimizer_speed.py --symbols 500 --max-weight 0.05
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from core import optimizer
+from core.risk_engine import RiskModel
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Optimizer solve time")
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--days", type=int, default=252)
+    parser.add_argument("--max-weight", type=float, default=0.05)
+    parser.add_argument("--frontier-points", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    returns = rng.normal(0.0008, 0.02, (args.days, args.symbols)) + rng.normal(0, 0.01, (args.days, 1))
+    model = RiskModel([f"S{i}" for i in range(args.symbols)], returns)
+    mu, cov = model.mean, model.cov
+
+    low, ms_min = timed(lambda: optimizer.min_variance(mu, cov, args.max_weight))
+    high = float(optimizer.max_return_weights(mu, args.max_weight) @ mu)
+    target = (low["expected_return"] + high) / 2
+    _, ms_target = timed(lambda: optimizer.target_return(mu, cov, target, args.max_weight))
+    best, ms_sharpe = timed(lambda: optimizer.max_sharpe(mu, cov, args.max_weight))
+    frontier, ms_frontier = timed(lambda: optimizer.efficient_frontier(mu, cov, args.frontier_points, args.max_weight))
+
+    print(f"[📊] {args.symbols} actifs, plafond {args.max_weight:.0%}")
+    print(f"{'min_variance':<22} {ms_min:>8.1f} ms")
+    print(f"{'target_return':<22} {ms_target:>8.1f} ms")
+    print(f"{'max_sharpe':<22} {ms_sharpe:>8.1f} ms  (Sharpe {best['sharpe_ratio']:.3f})")
+    print(f"{'efficient_frontier':<22} {ms_frontier:>8.1f} ms  ({len(frontier)} points)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# benchmarks/portfolio_ingest.py
+# 🇫🇷 Débit et mémoire de l’import de portefeuille : lecture par paquets (core.portfolio_ingest) contre read_csv complet.
+# 🇩🇪 Durchsatz und Speicher des Portfolio-Imports: paketweises Lesen (core.portfolio_ingest) gegen vollständiges read_csv.
+# 🇬🇧 Rows/s and peak memory of core.portfolio_ingest against the former full pd.read_csv + groupby.
+#
+#   python benchmarks/portfolio_ingest.py --rows 1000000
+#   python benchmarks/portfolio_ingest.py --rows 200000 --chunk-rows 20000
+
+import io
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from core import portfolio_ingest
+
+
+def synthetic_csv(rows: int, symbols: int, rng) -> bytes:
+    # 📄 Export de courtier typique : colonnes inutiles autour de Symbol / Quantity
+    tickers = np.array([f"SYM{i:05d}" for i in range(symbols)])
+    df = pd.DataFrame({
+        "Date": pd.date_range("2020-01-01", periods=rows, freq="min").strftime("%Y-%m-%d %H:%M"),
+        "Account": rng.integers(1000, 9999, rows),
+        "Symbol": tickers[rng.integers(0, symbols, rows)],
+        "Description": "Buy order executed on primary exchange",
+        "Quantity": rng.integers(1, 500, rows),
+        "Price": rng.random(rows) * 100,
+        "Currency": "USD",
+    })
+    return df.to_csv(index=False).encode("utf-8")
+
+
+def full_read(stream, filename):
+    df = pd.read_csv(stream)
+    df = df[["Symbol", "Quantity"]]
+    df["Quantity"] = pd.to_numeric(df["Quantity"], errors="coerce").fillna(0)
+    return {"summary": df.groupby("Symbol")["Quantity"].sum().to_dict()}
+
+
+def measure(fn, body: bytes, **kwargs) -> dict:
+    start = time.perf_counter()
+    result = fn(io.BytesIO(body), "portfolio.csv", **kwargs)
+    seconds = time.perf_counter() - start
+
+    tracemalloc.start()
+    fn(io.BytesIO(body), "portfolio.csv", **kwargs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": seconds, "peak_mb": peak / 1024 ** 2, "summary": result["summary"]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Portfolio upload ingestion throughput")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--chunk-rows", type=int, default=portfolio_ingest.UPLOAD_CHUNK_ROWS)
+    args = parser.parse_args()
+
+    body = synthetic_csv(args.rows, args.symbols, np.random.default_rng(0))
+    print(f"[📊] {args.rows} lignes, {args.symbols} symboles, {len(body) / 1024 ** 2:.1f} MB")
+
+    baseline = measure(full_read, body)
+    streamed = measure(portfolio_ingest.aggregate, body, chunk_rows=args.chunk_rows,
+                       max_rows=args.rows, max_symbols=args.symbols)
+    same = "✓" if baseline["summary"] == streamed["summary"] else "≠"
+    for name, r in (("read_csv", baseline), ("par paquets", streamed)):
+        print(f"{name:<12} {r['seconds']:>7.2f} s  {args.rows / r['seconds']:>10.0f} lignes/s  "
+              f"pic {r['peak_mb']:>7.1f} MB")
+    print(f"[✅] Résumés identiques : {same}")
+
+
+if __name__ == "__main__":
+    main()
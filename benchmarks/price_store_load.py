@@ -0,0 +1,52 @@
+# benchmarks/price_store_load.py
+# 🇫🇷 Temps de chargement d’une matrice de rendements depuis l’historique local (core.price_store).
+# 🇩🇪 Ladezeit einer Renditematrix aus der lokalen Preishistorie.
+# 🇬🇧 Time to load a return matrix from the local price store (synthetic data in a temp dir).
+#
+#   python benchmarks/price_store_load.py --symbols 500 --days 1000
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from core import price_store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Price store load time")
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--days", type=int, default=1000)
+    parser.add_argument("--lookback", type=int, default=252)
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="price_store_")
+    try:
+        rng = np.random.default_rng(0)
+        ts = np.arange(args.days, dtype=np.int64) * price_store.DAY_SECONDS
+        symbols = [f"S{i:04d}" for i in range(args.symbols)]
+        start = time.perf_counter()
+        for symbol in symbols:
+            closes = 100 * np.cumprod(1 + rng.normal(0.0005, 0.02, args.days))
+            price_store.append_bars(symbol, ts, closes, rng.random(args.days) * 1e6, root=root)
+        write = time.perf_counter() - start
+
+        timings = []
+        for _ in range(5):
+            start = time.perf_counter()
+            _, returns = price_store.return_matrix(symbols, days=args.lookback, root=root)
+            timings.append(time.perf_counter() - start)
+
+        print(f"[✍️] Écriture {args.symbols} symboles × {args.days} jours : {write:.2f}s")
+        print(f"[⚡] return_matrix {returns.shape} : {np.median(timings) * 1000:.1f} ms (médiane de 5)")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
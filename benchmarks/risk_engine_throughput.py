@@ -0,0 +1,57 @@
+# benchmarks/risk_engine_throughput.py
+# 🇫🇷 Débit du moteur de risque : portefeuilles évalués par seconde (volatilité + Sharpe + contributions).
+# 🇩🇪 Durchsatz der Risiko-Engine: bewertete Portfolios pro Sekunde.
+# 🇬🇧 Risk engine throughput: portfolios evaluated per second (volatility + Sharpe + contributions).
+#
+#   python benchmarks/risk_engine_throughput.py --symbols 500 --portfolios 10000
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from core.risk_engine import RiskModel
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Risk engine throughput")
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--days", type=int, default=252)
+    parser.add_argument("--portfolios", type=int, default=10000)
+    parser.add_argument("--holdings", type=int, default=20, help="Titres par portefeuille")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    returns = rng.normal(0.0005, 0.02, size=(args.days, args.symbols))
+
+    start = time.perf_counter()
+    model = RiskModel([f"S{i}" for i in range(args.symbols)], returns)
+    build = time.perf_counter() - start
+
+    # 🎲 Portefeuilles aléatoires de `holdings` titres
+    weights = np.zeros((args.portfolios, args.symbols))
+    rows = np.repeat(np.arange(args.portfolios), args.holdings)
+    cols = rng.integers(0, args.symbols, size=args.portfolios * args.holdings)
+    weights[rows, cols] = rng.random(rows.size)
+    weights /= weights.sum(axis=1, keepdims=True)
+
+    start = time.perf_counter()
+    model.sharpe(weights)
+    model.risk_contributions(weights)
+    batch = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for w in weights[:1000]:
+        model.sharpe(w)
+    single = (time.perf_counter() - start) / min(1000, args.portfolios)
+
+    print(f"[⏱️] Covariance {args.symbols}×{args.symbols} ({args.days} jours) : {build * 1000:.1f} ms")
+    print(f"[⚡] Batch : {args.portfolios / batch:,.0f} portefeuilles/s ({batch * 1000:.1f} ms)")
+    print(f"[🐢] Un par un : {1 / single:,.0f} portefeuilles/s")
+
+
+if __name__ == "__main__":
+    main()
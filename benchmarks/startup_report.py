@@ -0,0 +1,66 @@
+# benchmarks/startup_report.py
+# 🇫🇷 Rapport du temps de démarrage de l’application, ventilé par import.
+# 🇩🇪 Bericht über die Startzeit der App, aufgeschlüsselt nach Imports.
+# 🇬🇧 Startup-time report for the Flask app, broken down per import (python -X importtime).
+#
+#   python benchmarks/startup_report.py               # import app
+#   python benchmarks/startup_report.py --warmup      # import app + load the warm-up models
+
+import os
+import sys
+import time
+import argparse
+import subprocess
+from collections import defaultdict
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def parse_importtime(stderr: str) -> list:
+    """
+    🇬🇧 Parses `-X importtime` lines into (module, self_us, cumulative_us).
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_part, cumulative_part, raw_name = line.split("|", 2)
+        self_us = int(self_part.split(":", 1)[1])
+        rows.append((raw_name.strip(), self_us, int(cumulative_part)))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="App startup time per import")
+    parser.add_argument("--module", default="app", help="Module à importer (défaut: app)")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--warmup", action="store_true", help="Charger aussi les modèles de WARMUP_MODELS")
+    args = parser.parse_args()
+
+    code = f"import {args.module}"
+    if args.warmup:
+        code += "; from core.model_registry import warm_up; warm_up()"
+
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          cwd=ROOT, capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    if proc.returncode != 0:
+        print(proc.stderr.splitlines()[-1] if proc.stderr else "❌ import failed")
+        sys.exit(proc.returncode)
+
+    rows = parse_importtime(proc.stderr)
+    # 📦 Temps cumulé par paquet de premier niveau (imports directs de l’app + leurs dépendances)
+    per_package = defaultdict(int)
+    for name, self_us, _ in rows:
+        per_package[name.split(".")[0]] += self_us
+
+    print(f"[⏱️] `{code}` : {wall:.2f}s wall-clock (interpreter included)\n")
+    print(f"{'package':<28} {'ms':>9}")
+    for name, us in sorted(per_package.items(), key=lambda kv: -kv[1])[:args.top]:
+        print(f"{name:<28} {us / 1000:>9.1f}")
+    print(f"{'TOTAL imports':<28} {sum(per_package.values()) / 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# benchmarks/symbol_search.py
+# 🇫🇷 Latence de l’autocomplétion : index en mémoire (core.symbol_index) contre le $regex MongoDB historique.
+# 🇩🇪 Latenz der Autovervollständigung: In-Memory-Index (core.symbol_index) gegen das bisherige MongoDB-$regex.
+# 🇬🇧 Autocomplete latency of core.symbol_index against the former MongoDB $regex path.
+#
+#   python benchmarks/symbol_search.py --stocks 10000
+#   python benchmarks/symbol_search.py --stocks 10000 --mongo   # + $regex sur une collection temporaire
+#
+# Sans --mongo, le chemin historique est approché par un balayage `re` en Python de tous les noms
+# (borne basse du coût d’un collection scan, sans l’aller-retour réseau).
+
+import os
+import re
+import sys
+import time
+import string
+import argparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from core.symbol_index import SymbolIndex
+
+WORDS = ("global advanced micro systems energy capital bio pharma health financial holdings trust "
+         "technologies industries realty american first united national digital solar motors foods "
+         "semiconductor networks therapeutics partners resources brands logistics media").split()
+SUFFIXES = ["Inc.", "Corporation", "Holdings, Inc.", "Ltd.", "plc", "Group", "Co."]
+QUERIES = ["A", "AAP", "MS", "glob", "energy cap", "pharma", "semicondutor", "techologies", "zzzz", "Trust"]
+
+
+def synthetic_stocks(count: int, rng) -> list:
+    tickers, docs = set(), []
+    while len(docs) < count:
+        ticker = "".join(rng.choice(list(string.ascii_uppercase), rng.integers(1, 6)))
+        if ticker in tickers:
+            continue
+        tickers.add(ticker)
+        words = [w.capitalize() for w in rng.choice(WORDS, rng.integers(1, 4), replace=False)]
+        docs.append({"_id": ticker, "name": " ".join(words + [str(rng.choice(SUFFIXES))]), "price": 1.0})
+    return docs
+
+
+def timed(fn, repeat: int) -> np.ndarray:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return np.array(timings)
+
+
+def regex_scan(docs: list, query: str):
+    # ≈ {"$or": [{"_id": {"$regex": "^q", "$options": "i"}}, {"name": {"$regex": q, "$options": "i"}}]}
+    ticker = re.compile(f"^{re.escape(query)}", re.I)
+    name = re.compile(re.escape(query), re.I)
+    return [d for d in docs if ticker.search(d["_id"]) or name.search(d["name"])][:5]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Symbol autocomplete latency")
+    parser.add_argument("--stocks", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--mongo", action="store_true", help="Compare aussi au $regex sur MongoDB ($MONGO_URI)")
+    args = parser.parse_args()
+
+    docs = synthetic_stocks(args.stocks, np.random.default_rng(0))
+    start = time.perf_counter()
+    index = SymbolIndex(docs, version=1)
+    print(f"[📊] {len(index)} actions, index construit en {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    collection = None
+    if args.mongo:
+        from core.database import get_db
+        collection = get_db()["bench_symbol_search"]
+        collection.drop()
+        collection.insert_many([dict(d) for d in docs])
+
+    print(f"{'requête':<14} {'index p50':>10} {'index p99':>10} {'scan re p50':>12}"
+          + (f" {'mongo p50':>10}" if collection is not None else "") + "  top 3")
+    try:
+        for query in QUERIES:
+            index_ms = timed(lambda: index.search(query, 5), args.repeat)
+            scan_ms = timed(lambda: regex_scan(docs, query), max(args.repeat // 5, 3))
+            line = (f"{query:<14} {np.median(index_ms):>9.3f}  {np.percentile(index_ms, 99):>9.3f}  "
+                    f"{np.median(scan_ms):>11.3f}")
+            if collection is not None:
+                mongo_query = {"$or": [{"_id": {"$regex": f"^{re.escape(query)}", "$options": "i"}},
+                                       {"name": {"$regex": re.escape(query), "$options": "i"}}]}
+                mongo_ms = timed(lambda: list(collection.find(mongo_query).limit(5)), max(args.repeat // 5, 3))
+                line += f" {np.median(mongo_ms):>10.3f}"
+            print(line + "  " + ", ".join(index.symbols[i] for i in index.search(query, 3)))
+    finally:
+        if collection is not None:
+            collection.drop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+# core/advice_cache.py
+"""
+🇫🇷 Cache des réponses d’Otto + regroupement des requêtes identiques simultanées (single-flight).
+🇩🇪 Cache für Ottos Antworten + Zusammenfassen gleichzeitiger identischer Anfragen (Single-Flight).
+🇬🇧 Answer cache for Otto with single-flight coalescing.
+
+    Keys combine the normalised prompt with a market data version (when avg_sentiment /
+    yahoo_gainers last changed), so a new scrape invalidates answers immediately; entries also
+    expire after $ADVICE_CACHE_TTL seconds. While one request generates an answer, identical
+    concurrent requests wait for it instead of starting their own generation.
+"""
+
+import os
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+from dotenv import load_dotenv
+
+load_dotenv()
+ADVICE_CACHE_TTL = float(os.getenv("ADVICE_CACHE_TTL", 900))
+ADVICE_CACHE_SIZE = int(os.getenv("ADVICE_CACHE_SIZE", 512))
+
+_entries = OrderedDict()
+_inflight = {}
+_lock = threading.Lock()
+_counters = {"hits": 0, "misses": 0, "coalesced": 0, "waiter_retries": 0}
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.failed = False
+
+
+def make_key(prompt: str, data_version=None) -> str:
+    """
+    🇫🇷 Clé = hash du prompt normalisé (casse + espaces) et de la version des données de marché.
+    🇩🇪 Schlüssel = Hash des normalisierten Prompts und der Marktdaten-Version.
+    🇬🇧 Key = hash of the normalised prompt (case and whitespace) and the market data version.
+    """
+    normalised = " ".join(prompt.casefold().split())
+    return hashlib.sha256(f"{data_version}\x00{normalised}".encode("utf-8")).hexdigest()
+
+
+def get(key: str):
+    with _lock:
+        entry = _entries.get(key)
+        if entry is None:
+            return None
+        answer, expires_at = entry
+        if expires_at < time.monotonic():
+            del _entries[key]
+            return None
+        _entries.move_to_end(key)
+        return answer
+
+
+def put(key: str, answer: str) -> None:
+    with _lock:
+        _entries[key] = (answer, time.monotonic() + ADVICE_CACHE_TTL)
+        _entries.move_to_end(key)
+        while len(_entries) > ADVICE_CACHE_SIZE:
+            _entries.popitem(last=False)
+
+
+def cached_stream(key: str, make_stream):
+    """
+    🇫🇷 Sert la réponse depuis le cache, attend une génération identique en cours, ou génère et met en cache.
+    🇩🇪 Liefert die Antwort aus dem Cache, wartet auf eine laufende identische Generierung oder generiert selbst.
+    🇬🇧 Yields the answer for `key`:
+        - from the cache (one chunk),
+        - or from an identical in-flight generation (one chunk, once it is finished),
+        - or by running `make_stream()` itself, streaming its chunks and caching the full answer.
+        If the leading generation fails or its client disconnects, one waiter becomes the new
+        leader and the others keep waiting on it.
+    """
+    answer = get(key)
+    if answer is not None:
+        _count("hits")
+        yield answer
+        return
+
+    while True:
+        with _lock:
+            flight = _inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = _inflight[key] = _Flight()
+        if leader:
+            break
+        flight.done.wait()
+        if not flight.failed:
+            _count("coalesced")
+            yield flight.result
+            return
+        # 🔁 Échec du meneur : un seul des clients en attente prend le relais, les autres l’attendent
+        _count("waiter_retries")
+
+    _count("misses")
+    parts = []
+    try:
+        for text in make_stream():
+            parts.append(text)
+            yield text
+    except BaseException:
+        _finish(key, flight, None)
+        raise
+
+    answer = "".join(parts)
+    put(key, answer)
+    _finish(key, flight, answer)
+
+
+def _finish(key, flight, answer):
+    with _lock:
+        _inflight.pop(key, None)
+    flight.result = answer
+    flight.failed = answer is None
+    flight.done.set()
+
+
+def _count(name):
+    with _lock:
+        _counters[name] += 1
+
+
+def get_stats() -> dict:
+    """
+    🇬🇧 Hits, misses, coalesced requests and current number of cached answers.
+    """
+    with _lock:
+        stats = dict(_counters)
+        stats["entries"] = len(_entries)
+        stats["inflight"] = len(_inflight)
+    stats["ttl_seconds"] = ADVICE_CACHE_TTL
+    return stats
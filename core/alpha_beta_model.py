@@ -2,7 +2,8 @@
 
 from core.regression_model import predict_price
 from core.portfolio_utils import load_cleaned_data
-from core.classifier import classify_sharpe
+from core.classifier import classify_sharpe_array
+from core.risk_engine import symbol_betas
 
 import pandas as pd
 import numpy as np
@@ -32,7 +33,8 @@ def score_alpha_beta(df, predicted_returns):
 
     df["predicted_return"] = predicted_returns
     df["alpha"] = df["predicted_return"] - df["performance"]  # 🇫🇷 rendement excessif
-    df["beta"] = df["performance"].rolling(3, min_periods=1).std()  # 🇬🇧 rolling std = beta proxy
+    # 🇬🇧 True beta: regression of each symbol's daily returns on the market index (one matrix pass)
+    df["beta"] = symbol_betas(df["_id"].tolist())["beta"]
 
     return df
 
@@ -56,6 +58,8 @@ def alpha_beta_pipeline():
 
     print("\n[🤖] Prédiction IA des rendements futurs…")
     predicted = predict_price(df)
+    if predicted is None:
+        raise RuntimeError("❌ Modèle de régression non entraîné : lancez simulate_performance.py ou le pipeline.")
 
     print("\n[📊] Calcul des scores alpha / beta…")
     df_scored = score_alpha_beta(df, predicted)
@@ -68,7 +72,7 @@ def alpha_beta_pipeline():
     )
 
     print("\n[🔍] Interprétation qualitative du Sharpe Ratio…")
-    df_scored["label"] = df_scored["sharpe_ratio"].apply(classify_sharpe)
+    df_scored["label"] = classify_sharpe_array(df_scored["sharpe_ratio"].to_numpy())
 
     print("\n[✅] Filtrage des meilleures opportunités…")
     top_assets = filter_top_assets(df_scored)
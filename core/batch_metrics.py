@@ -0,0 +1,151 @@
+# core/batch_metrics.py
+"""
+🇫🇷 Évaluation en lot de nombreux portefeuilles : matrice de poids creuse et un seul passage vectorisé.
+🇩🇪 Stapelbewertung vieler Portfolios: dünn besetzte Gewichtsmatrix und ein vektorisierter Durchlauf.
+🇬🇧 Batch evaluation of many portfolios.
+
+    Portfolios ({symbol: quantity}) become two sparse CSR weight matrices (K x N): one over the
+    market snapshot universe (core.market_snapshot) for the quantity-weighted performance, one
+    over the risk model universe (core.risk_engine) for the annualised expected return,
+    volatility and risk contributions, from which the Sharpe ratio is computed. All K portfolios
+    are then scored with sparse/dense products, in chunks of $BATCH_CHUNK_SIZE so the results can
+    be streamed. /portfolio-metrics is the K = 1 case of the same code path.
+"""
+
+import os
+
+import numpy as np
+from dotenv import load_dotenv
+from scipy import sparse
+
+from core import market_snapshot, risk_engine
+from core.classifier import classify_sharpe_array
+
+load_dotenv()
+BATCH_CHUNK_SIZE = int(os.getenv("BATCH_CHUNK_SIZE", 1000))
+
+
+def weight_matrix(portfolios: list, index, coverage=None):
+    """
+    🇫🇷 Matrice creuse des quantités (lignes = portefeuilles) sur l’univers `index`, lignes normalisées.
+    🇩🇪 Dünn besetzte Mengenmatrix (Zeilen = Portfolios) über das Universum `index`, zeilennormiert.
+    🇬🇧 Row-normalised sparse CSR matrix of the quantities over the `index` universe
+        ({symbol: column}). `coverage` optionally masks columns that cannot be used.
+        Returns (weights, row totals before normalisation, missing symbols per row).
+    """
+    rows, cols, values, missing = [], [], [], []
+    for k, portfolio in enumerate(portfolios):
+        absent = []
+        for symbol, quantity in portfolio.items():
+            j = index.get(symbol)
+            if j is None or (coverage is not None and not coverage[j]):
+                absent.append(symbol)
+                continue
+            rows.append(k)
+            cols.append(j)
+            values.append(float(quantity))
+        missing.append(absent)
+    weights = sparse.csr_matrix((values, (rows, cols)), shape=(len(portfolios), len(index)))
+    weights.sum_duplicates()
+    totals = np.asarray(weights.sum(axis=1)).ravel()
+    scale = np.divide(1.0, totals, out=np.zeros_like(totals), where=totals != 0)
+    return sparse.diags(scale) @ weights, totals, missing
+
+
+def _risk(portfolios: list, model):
+    """
+    🇬🇧 Annualised expected return, volatility and risk contributions of K portfolios against
+        the risk model (NaN for the portfolios without any history).
+    """
+    if model is None:
+        unknown = np.full(len(portfolios), np.nan)
+        return unknown, unknown.copy(), None, [list(p) for p in portfolios]
+    weights, totals, missing = weight_matrix(portfolios, model.index, model.observations >= 2)
+    # w_i·(Σw)_i : produit élément par élément, seulement sur les positions détenues
+    products = weights.multiply(weights @ model.cov).tocsr()
+    variance = np.asarray(products.sum(axis=1)).ravel()
+    volatility = np.where(totals != 0, np.sqrt(np.maximum(variance, 0.0)), np.nan)
+    expected = np.where(totals != 0, weights @ model.mean, np.nan)
+    scale = np.divide(1.0, variance, out=np.zeros_like(variance), where=variance > 0)
+    contributions = (sparse.diags(scale) @ products).tocsr()
+    return expected, volatility, contributions, missing
+
+
+def evaluate(portfolios: list, risk_free_rate: float = 0.02) -> list:
+    """
+    🇫🇷 Performance moyenne, volatilité, Sharpe et classification de K portefeuilles en un passage.
+    🇩🇪 Durchschnittliche Performance, Volatilität, Sharpe und Klassifizierung von K Portfolios in einem Durchlauf.
+    🇬🇧 Average performance, volatility, Sharpe ratio and classify_sharpe label of K portfolios
+        in one vectorised pass; each result has the shape of a /portfolio-metrics response.
+        The Sharpe ratio uses the annualised expected return of the risk model, like
+        risk_engine.portfolio_risk; it is None when no symbol has price history.
+    """
+    snapshot = market_snapshot.get_snapshot()
+    model = risk_engine.get_risk_model()
+
+    perf_weights, perf_totals, _ = weight_matrix(portfolios, snapshot.index)
+    performance = perf_weights @ snapshot.performance
+    expected, volatility, contributions, missing = _risk(portfolios, model)
+    volatility, source = risk_engine.effective_volatility(volatility)
+    sharpe = (expected - risk_free_rate) / volatility
+
+    labels = classify_sharpe_array(sharpe)
+    results = []
+    for k in range(len(portfolios)):
+        if not perf_totals[k]:
+            results.append({"status": "error", "message": "No market data for the portfolio symbols"})
+            continue
+        held = {}
+        if contributions is not None:
+            start, end = contributions.indptr[k], contributions.indptr[k + 1]
+            held = {model.symbols[j]: round(float(c), 4)
+                    for j, c in zip(contributions.indices[start:end], contributions.data[start:end])}
+        value = None if np.isnan(sharpe[k]) else round(float(sharpe[k]), 4)
+        results.append({
+            "status": "success",
+            "average_performance": round(float(performance[k]), 4),
+            "expected_return": None if np.isnan(expected[k]) else round(float(expected[k]), 4),
+            "sharpe_ratio": value,
+            "classification": labels[k] if value is not None else None,
+            "volatility_used": round(float(volatility[k]), 4),
+            "volatility_source": str(source[k]),
+            "risk_contributions": held,
+            "missing_symbols": missing[k],
+        })
+    return results
+
+
+def iter_evaluate(items, risk_free_rate: float = 0.02, chunk_size: int = BATCH_CHUNK_SIZE):
+    """
+    🇫🇷 Évalue un flux de portefeuilles par paquets et produit les résultats au fur et à mesure.
+    🇩🇪 Bewertet einen Strom von Portfolios paketweise und liefert die Ergebnisse fortlaufend.
+    🇬🇧 Scores a stream of {"id", "portfolio"} items chunk by chunk and yields
+        {"id", **metrics} as soon as each chunk is done. Invalid items yield an error result.
+    """
+    chunk = []
+    for position, item in enumerate(items):
+        chunk.append((position, item))
+        if len(chunk) >= chunk_size:
+            yield from _evaluate_chunk(chunk, risk_free_rate)
+            chunk = []
+    if chunk:
+        yield from _evaluate_chunk(chunk, risk_free_rate)
+
+
+def _evaluate_chunk(chunk, risk_free_rate):
+    valid, results = [], [None] * len(chunk)
+    for i, (_, item) in enumerate(chunk):
+        portfolio = item.get("portfolio") if isinstance(item, dict) else None
+        try:
+            if not portfolio or not isinstance(portfolio, dict):
+                raise ValueError(item.get("error", "Empty portfolio") if isinstance(item, dict) else "Empty portfolio")
+            cleaned = {str(symbol): float(quantity) for symbol, quantity in portfolio.items()}
+        except (TypeError, ValueError) as e:
+            results[i] = {"status": "error", "message": str(e)}
+            continue
+        valid.append((i, cleaned))
+    if valid:
+        for (i, _), metrics in zip(valid, evaluate([p for _, p in valid], risk_free_rate)):
+            results[i] = metrics
+    for i, (position, item) in enumerate(chunk):
+        yield {"id": item.get("id", position) if isinstance(item, dict) else position, **results[i]}
@@ -0,0 +1,154 @@
+# core/chart_service.py
+"""
+🇫🇷 Rendu des graphiques d’allocation hors du thread de requête, avec cache et métriques de latence.
+🇩🇪 Rendering der Allokationsdiagramme außerhalb des Request-Threads, mit Cache und Latenzmetriken.
+🇬🇧 Allocation chart rendering service.
+
+    Charts are drawn with matplotlib's object-oriented API (Figure + FigureCanvasAgg, never the
+    global pyplot state) on a bounded pool of $CHART_WORKERS threads. Each worker thread reuses
+    one Figure, cleared between renders, so memory stays flat. Results are cached (LRU,
+    $CHART_CACHE_SIZE entries) on the format and the allocation summary, and the "json" format
+    returns the chart data only, for the browser to draw itself (Chart.js).
+"""
+
+import io
+import os
+import json
+import time
+import base64
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from dotenv import load_dotenv
+
+load_dotenv()
+CHART_WORKERS = int(os.getenv("CHART_WORKERS", 2))
+CHART_CACHE_SIZE = int(os.getenv("CHART_CACHE_SIZE", 128))
+CHART_TIMEOUT = float(os.getenv("CHART_TIMEOUT", 10))
+CHART_FORMATS = ("png", "svg", "json")
+CHART_TITLE = "Portfolio Allocation"
+
+_executor = None
+_local = threading.local()
+_cache = OrderedDict()
+_lock = threading.Lock()
+_stats = {"renders": 0, "cache_hits": 0, "render_seconds": 0.0, "max_render_seconds": 0.0,
+          "queue_seconds": 0.0, "timeouts": 0}
+
+
+def _pool() -> ThreadPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=CHART_WORKERS, thread_name_prefix="chart")
+        return _executor
+
+
+def _figure():
+    """
+    🇬🇧 The Figure of the current worker thread, created once and cleared before each render.
+    """
+    figure = getattr(_local, "figure", None)
+    if figure is None:
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        figure = Figure(figsize=(6.4, 4.8))
+        FigureCanvasAgg(figure)
+        _local.figure = figure
+    figure.clear()
+    return figure
+
+
+def chart_data(summary: dict) -> dict:
+    """
+    🇫🇷 Données du camembert (positions positives uniquement) pour un rendu côté navigateur.
+    🇩🇪 Daten des Kreisdiagramms (nur positive Positionen) für das Rendern im Browser.
+    🇬🇧 Pie chart data (positive positions only) for client-side drawing.
+    """
+    items = [(str(symbol), float(quantity)) for symbol, quantity in summary.items() if float(quantity) > 0]
+    total = sum(quantity for _, quantity in items)
+    return {
+        "title": CHART_TITLE,
+        "labels": [symbol for symbol, _ in items],
+        "values": [quantity for _, quantity in items],
+        "percentages": [round(100 * quantity / total, 2) for _, quantity in items] if total else [],
+    }
+
+
+def _render(data: dict, fmt: str, queued_at: float) -> str:
+    started = time.perf_counter()
+    figure = _figure()
+    ax = figure.subplots()
+    if data["values"]:
+        ax.pie(data["values"], labels=data["labels"], autopct="%1.1f%%")
+    ax.set_title(data["title"])
+    buf = io.BytesIO()
+    figure.savefig(buf, format=fmt)
+    figure.clear()
+    body = buf.getvalue()
+    chart = base64.b64encode(body).decode("ascii") if fmt == "png" else body.decode("utf-8")
+
+    elapsed = time.perf_counter() - started
+    with _lock:
+        _stats["renders"] += 1
+        _stats["render_seconds"] += elapsed
+        _stats["max_render_seconds"] = max(_stats["max_render_seconds"], elapsed)
+        _stats["queue_seconds"] += started - queued_at
+    return chart
+
+
+def cache_key(summary: dict, fmt: str) -> str:
+    items = sorted((str(symbol), round(float(quantity), 6)) for symbol, quantity in summary.items())
+    return hashlib.sha256(json.dumps([fmt, items]).encode("utf-8")).hexdigest()
+
+
+def render_allocation(summary: dict, fmt: str = "png"):
+    """
+    🇫🇷 Graphique d’allocation au format demandé : PNG en base64, SVG (texte) ou données JSON.
+    🇩🇪 Allokationsdiagramm im gewünschten Format: PNG als Base64, SVG (Text) oder JSON-Daten.
+    🇬🇧 Allocation chart as a base64 PNG, an SVG document or the JSON chart data.
+        PNG/SVG renders run on the worker pool and are cached; raises TimeoutError after
+        $CHART_TIMEOUT seconds.
+    """
+    if fmt not in CHART_FORMATS:
+        raise ValueError(f"❌ Unknown chart format '{fmt}' (expected {', '.join(CHART_FORMATS)})")
+    data = chart_data(summary)
+    if fmt == "json":
+        return data
+
+    key = cache_key(summary, fmt)
+    with _lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            _stats["cache_hits"] += 1
+            return _cache[key]
+
+    future = _pool().submit(_render, data, fmt, time.perf_counter())
+    try:
+        chart = future.result(timeout=CHART_TIMEOUT)
+    except TimeoutError:
+        with _lock:
+            _stats["timeouts"] += 1
+        raise
+    with _lock:
+        _cache[key] = chart
+        _cache.move_to_end(key)
+        while len(_cache) > CHART_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return chart
+
+
+def get_stats() -> dict:
+    with _lock:
+        stats = dict(_stats)
+        stats["cached"] = len(_cache)
+    renders = stats["renders"]
+    stats["avg_render_ms"] = round(stats["render_seconds"] / renders * 1000, 3) if renders else None
+    stats["avg_queue_ms"] = round(stats["queue_seconds"] / renders * 1000, 3) if renders else None
+    stats["max_render_ms"] = round(stats.pop("max_render_seconds") * 1000, 3)
+    del stats["render_seconds"], stats["queue_seconds"]
+    stats["workers"] = CHART_WORKERS
+    return stats
@@ -4,22 +4,37 @@
 🇬🇧 Module to classify Sharpe Ratio into performance levels.
 """
 
+import numpy as np
+
+# 📏 Bornes inférieures des niveaux 2..5 : un ratio r appartient au niveau i si SHARPE_THRESHOLDS[i-1] ≤ r
+SHARPE_THRESHOLDS = np.array([0.0, 0.5, 1.0, 1.5])
+SHARPE_LABELS = np.array([
+    "⚠️ Négatif — Risque excessif pour retour négatif",
+    "🔴 Faible — Retour insuffisant pour le niveau de risque",
+    "🟠 Modéré — Acceptable mais pas optimal",
+    "🟢 Bon — Bonne efficacité rendement/risque",
+    "🟣 Excellent — Portefeuille très performant",
+], dtype=object)
+
+
+def classify_sharpe_array(sharpe_ratios) -> np.ndarray:
+    """
+    🇫🇷 Classe un tableau de Sharpe Ratios en une seule recherche binaire vectorisée.
+    🇩🇪 Klassifiziert ein Array von Sharpe-Verhältnissen mit einer vektorisierten Binärsuche.
+    🇬🇧 Labels an array of Sharpe ratios with one vectorised binary search over the thresholds
+        (NaN sorts last, hence "Excellent", as with the scalar comparisons).
+    """
+    bins = np.searchsorted(SHARPE_THRESHOLDS, np.asarray(sharpe_ratios, dtype=np.float64), side="right")
+    return SHARPE_LABELS[bins]
+
+
 def classify_sharpe(sharpe_ratio):
     """
     🇫🇷 Retourne une étiquette qualitative selon le Sharpe Ratio.
     🇩🇪 Gibt ein qualitatives Label basierend auf dem Sharpe-Verhältnis zurück.
     🇬🇧 Returns a qualitative label based on Sharpe Ratio.
     """
-    if sharpe_ratio < 0:
-        return "⚠️ Négatif — Risque excessif pour retour négatif"
-    elif sharpe_ratio < 0.5:
-        return "🔴 Faible — Retour insuffisant pour le niveau de risque"
-    elif sharpe_ratio < 1.0:
-        return "🟠 Modéré — Acceptable mais pas optimal"
-    elif sharpe_ratio < 1.5:
-        return "🟢 Bon — Bonne efficacité rendement/risque"
-    else:
-        return "🟣 Excellent — Portefeuille très performant"
+    return str(classify_sharpe_array([sharpe_ratio])[0])
 
 # 🔎 Exemple d'utilisation
 if __name__ == "__main__":
@@ -0,0 +1,434 @@
+# core/database.py
+"""
+🇫🇷 Couche d’accès MongoDB : un seul client (pool de connexions) par processus + fonctions typées par collection.
+🇩🇪 MongoDB-Zugriffsschicht: ein Client (Connection-Pool) pro Prozess + typisierte Funktionen pro Collection.
+🇬🇧 MongoDB data-access layer: one pooled client per process (re-created after a fork, so it is
+    safe with gunicorn --preload), typed repository functions for each collection of `gainers_db`,
+    and command latency / connection pool metrics.
+"""
+
+import os
+import time
+import threading
+from itertools import islice
+from collections import defaultdict
+from datetime import datetime, timezone
+
+from dotenv import load_dotenv
+from pymongo import MongoClient, ReturnDocument, UpdateOne, monitoring
+
+load_dotenv()
+MONGO_URI = os.getenv("MONGO_URI")
+DB_NAME = "gainers_db"
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", 50))
+SNAPSHOT_HISTORY = int(os.getenv("SNAPSHOT_HISTORY", 5))
+BULK_CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE", 1000))
+
+_client = None
+_client_pid = None
+_lock = threading.Lock()
+
+
+# 📊 Métriques : latence par commande + événements du pool de connexions
+class _CommandMetrics(monitoring.CommandListener):
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.commands = defaultdict(lambda: {"count": 0, "failures": 0, "total_ms": 0.0, "max_ms": 0.0})
+
+    def started(self, event):
+        pass
+
+    def _record(self, event, failed):
+        ms = event.duration_micros / 1000
+        with self.lock:
+            stats = self.commands[event.command_name]
+            stats["count"] += 1
+            stats["failures"] += int(failed)
+            stats["total_ms"] += ms
+            stats["max_ms"] = max(stats["max_ms"], ms)
+
+    def succeeded(self, event):
+        self._record(event, False)
+
+    def failed(self, event):
+        self._record(event, True)
+
+
+class _PoolMetrics(monitoring.ConnectionPoolListener):
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = defaultdict(int)
+
+    def _bump(self, name):
+        with self.lock:
+            self.counters[name] += 1
+
+    def pool_created(self, event):
+        self._bump("pools_created")
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self._bump("pools_cleared")
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self._bump("connections_created")
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._bump("connections_closed")
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        self._bump("checkout_failures")
+
+    def connection_checked_out(self, event):
+        self._bump("checkouts")
+
+    def connection_checked_in(self, event):
+        pass
+
+
+_command_metrics = _CommandMetrics()
+_pool_metrics = _PoolMetrics()
+
+
+def get_client() -> MongoClient:
+    """
+    🇫🇷 Retourne le client MongoDB du processus (créé au premier appel, recréé après un fork).
+    🇩🇪 Gibt den MongoDB-Client des Prozesses zurück (beim ersten Aufruf bzw. nach einem Fork erstellt).
+    🇬🇧 Returns this process's MongoClient, created on first use and re-created after a fork
+        (MongoClient instances must not be shared across fork()).
+    """
+    global _client, _client_pid
+    pid = os.getpid()
+    if _client is None or _client_pid != pid:
+        with _lock:
+            if _client is None or _client_pid != pid:
+                _client = MongoClient(
+                    MONGO_URI,
+                    maxPoolSize=MONGO_MAX_POOL_SIZE,
+                    appname="portfolio-optimizer",
+                    event_listeners=[_command_metrics, _pool_metrics],
+                )
+                _client_pid = pid
+    return _client
+
+
+def get_db():
+    return get_client()[DB_NAME]
+
+
+def close_client() -> None:
+    """
+    🇬🇧 Closes the client of this process (end of a batch script).
+    """
+    global _client, _client_pid
+    with _lock:
+        if _client is not None and _client_pid == os.getpid():
+            _client.close()
+        _client, _client_pid = None, None
+
+
+def get_stats() -> dict:
+    """
+    🇫🇷 Latence par commande MongoDB et compteurs du pool de connexions.
+    🇩🇪 Latenz pro MongoDB-Befehl und Zähler des Connection-Pools.
+    🇬🇧 Per-command latency and connection pool counters for this process.
+    """
+    with _command_metrics.lock:
+        commands = {
+            name: {
+                "count": s["count"],
+                "failures": s["failures"],
+                "avg_ms": round(s["total_ms"] / s["count"], 3) if s["count"] else None,
+                "max_ms": round(s["max_ms"], 3),
+            }
+            for name, s in _command_metrics.commands.items()
+        }
+    with _pool_metrics.lock:
+        pool = dict(_pool_metrics.counters)
+    return {"pid": os.getpid(), "max_pool_size": MONGO_MAX_POOL_SIZE, "pool": pool, "commands": commands}
+
+
+# ============================================================
+# 📦 Écritures en lot
+# ============================================================
+def iter_chunks(iterable, size: int = BULK_CHUNK_SIZE):
+    """
+    🇬🇧 Lists of at most `size` items from any iterable (e.g. a cursor), without materialising it.
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def bulk_write_chunks(collection, ops, chunk_size: int = BULK_CHUNK_SIZE) -> dict:
+    """
+    🇫🇷 Envoie un flux d’opérations en bulk_write non ordonnés de `chunk_size` opérations.
+    🇩🇪 Sendet einen Strom von Operationen als ungeordnete bulk_writes zu je `chunk_size` Operationen.
+    🇬🇧 Sends a stream of write operations as unordered bulk_writes of `chunk_size` ops each,
+        so client memory stays bounded. Returns the summed matched/modified/upserted counts.
+    """
+    totals = {"matched": 0, "modified": 0, "upserted": 0}
+    for chunk in iter_chunks(ops, chunk_size):
+        result = collection.bulk_write(chunk, ordered=False)
+        totals["matched"] += result.matched_count
+        totals["modified"] += result.modified_count
+        totals["upserted"] += result.upserted_count
+    return totals
+
+
+# ============================================================
+# 🔁 Remplacement atomique d’une collection (staging + rename)
+# ============================================================
+def history_collections(name: str) -> list:
+    """
+    🇬🇧 Names of the kept snapshots of `name` ("<name>__v<N>"), oldest first.
+    """
+    prefix = f"{name}__v"
+    versions = [int(c[len(prefix):]) for c in get_db().list_collection_names(filter={"name": {"$regex": f"^{prefix}"}})
+                if c[len(prefix):].isdigit()]
+    return [f"{prefix}{v}" for v in sorted(versions)]
+
+
+def swap_collection(name: str, docs: list, keep: int = SNAPSHOT_HISTORY) -> str:
+    """
+    🇫🇷 Remplace tout le contenu de `name` sans état intermédiaire visible par les lecteurs.
+    🇩🇪 Ersetzt den gesamten Inhalt von `name`, ohne dass Leser einen Zwischenzustand sehen.
+    🇬🇧 Replaces the whole content of `name` without readers ever seeing a partial collection.
+
+        The documents are written with one insert_many into `<name>__staging`, copied server-side
+        ($out) to the history collection `<name>__v<N>`, then the staging collection is renamed
+        over `name` (renameCollection with dropTarget is atomic). Only the last `keep` history
+        snapshots are kept. Returns the history collection name (None when keep is 0).
+    """
+    db = get_db()
+    staging = db[f"{name}__staging"]
+    staging.drop()
+    if docs:
+        staging.insert_many(docs, ordered=False)
+    else:
+        db.create_collection(staging.name)
+
+    history = history_collections(name)
+    version = int(history[-1].rsplit("__v", 1)[1]) + 1 if history else 1
+    snapshot = f"{name}__v{version}"
+    if keep > 0:
+        staging.aggregate([{"$out": snapshot}])
+        history.append(snapshot)
+    staging.rename(name, dropTarget=True)
+
+    for old in history[:max(len(history) - keep, 0)]:
+        db.drop_collection(old)
+    return snapshot if keep > 0 else None
+
+
+# ============================================================
+# 📈 yahoo_gainers
+# ============================================================
+def load_gainers_performance() -> list:
+    """
+    🇬🇧 Gainers with a known change, projected as {_id, price, volume, market_cap, performance,
+        percent_change} (performance = the day's change in dollars).
+    """
+    pipeline = [
+        {"$match": {"change": {"$ne": None}}},
+        {"$project": {
+            "_id": 1,
+            "price": "$price",
+            "volume": "$volume",
+            "market_cap": "$market_cap",
+            "performance": "$change",
+            "percent_change": "$percent_change"
+        }}
+    ]
+    return list(get_db()["yahoo_gainers"].aggregate(pipeline))
+
+
+def list_gainer_symbols() -> list:
+    return [doc["_id"] for doc in get_db()["yahoo_gainers"].find({}, {"_id": 1})]
+
+
+def top_gainers(offset: int = 0, limit: int = 5) -> list:
+    docs = get_db()["yahoo_gainers"].find({}, {"price": 1, "change": 1}).sort("change", -1).skip(offset).limit(limit)
+    return [{"_id": doc["_id"], "price": doc["price"], "change": doc["change"]} for doc in docs]
+
+
+def latest_gainers_timestamp():
+    doc = get_db()["yahoo_gainers"].find_one({}, {"timestamp": 1}, sort=[("timestamp", -1)])
+    return doc.get("timestamp") if doc else None
+
+
+def replace_gainers(docs: list) -> int:
+    swap_collection("yahoo_gainers", docs)
+    # 🔔 Nouvelle version des données de marché → les snapshots en mémoire se rechargent
+    bump_snapshot_version("market")
+    return len(docs)
+
+
+# ============================================================
+# 📘 yahoo_all_stocks
+# ============================================================
+def find_stocks_with_performance() -> list:
+    return list(get_db()["yahoo_all_stocks"].find({
+        "price": {"$exists": True},
+        "performance": {"$exists": True}
+    }))
+
+
+def load_all_stocks() -> list:
+    return list(get_db()["yahoo_all_stocks"].find({}))
+
+
+def find_stock(query: dict):
+    return get_db()["yahoo_all_stocks"].find_one(query)
+
+
+def find_stocks(query: dict, limit: int = 5) -> list:
+    return list(get_db()["yahoo_all_stocks"].find(query).limit(limit))
+
+
+def replace_all_stocks(docs: list) -> int:
+    swap_collection("yahoo_all_stocks", docs)
+    bump_snapshot_version("all_stocks")
+    return len(docs)
+
+
+# ============================================================
+# 📰 news_articles / news_by_symbol
+# ============================================================
+def latest_news(limit: int = 5) -> list:
+    return list(get_db()["news_articles"].find().sort("scraped_at", -1).limit(limit))
+
+
+def sample_news(size: int = 5) -> list:
+    return list(get_db()["news_articles"].aggregate([
+        {"$sample": {"size": size}},
+        {"$project": {"_id": 1, "title": 1, "link": 1}}
+    ]))
+
+
+def news_articles_collection():
+    return get_db()["news_articles"]
+
+
+def news_by_symbol_collection():
+    return get_db()["news_by_symbol"]
+
+
+def apply_sentiment_scores(mapping: dict) -> int:
+    """
+    🇫🇷 Convertit côté serveur chaque label de sentiment en score (un seul update_many, idempotent).
+    🇩🇪 Wandelt serverseitig jedes Sentiment-Label in einen Score um (ein einziges update_many, idempotent).
+    🇬🇧 Maps sentiment labels to scores server-side with one update_many and an aggregation
+        pipeline ($switch). Documents already holding the right score are not matched, so
+        re-running it writes nothing. Returns the number of modified documents.
+    """
+    branches = [{"case": {"$eq": ["$sentiment", label]}, "then": score} for label, score in mapping.items()]
+    score = {"$switch": {"branches": branches, "default": "$sentiment_score"}}
+    result = news_articles_collection().update_many(
+        {"sentiment": {"$in": list(mapping)}, "$expr": {"$ne": ["$sentiment_score", score]}},
+        [{"$set": {"sentiment_score": score}}],
+    )
+    return result.modified_count
+
+
+# ============================================================
+# 🧠 avg_sentiment
+# ============================================================
+def latest_avg_sentiment():
+    """
+    🇬🇧 Most recent avg_sentiment document (ObjectId order), or None.
+    """
+    return get_db()["avg_sentiment"].find_one({}, sort=[("_id", -1)])
+
+
+def get_avg_sentiment_score():
+    doc = latest_avg_sentiment()
+    if doc and "avg_sentiment_score" in doc:
+        return doc["avg_sentiment_score"]
+    return None
+
+
+def insert_avg_sentiment(doc: dict) -> None:
+    """
+    🇬🇧 Appends a new average; get_avg_sentiment_score and the Otto data version read the latest one.
+    """
+    get_db()["avg_sentiment"].insert_one(doc)
+
+
+# ============================================================
+# 🗓️ pipeline_runs (auto_schedule.py)
+# ============================================================
+def insert_pipeline_run(doc: dict) -> None:
+    """
+    🇬🇧 Stores one scheduler run (per-stage status and duration) in pipeline_runs.
+    """
+    get_db()["pipeline_runs"].insert_one(dict(doc))
+
+
+# ============================================================
+# 🏷️ fetch_state (ETag / Last-Modified / hash des réponses des scrapers)
+# ============================================================
+def load_fetch_state(urls: list) -> dict:
+    """
+    🇬🇧 Stored validators of the given URLs: {url: {"etag", "last_modified", "content_hash"}}.
+    """
+    return {doc["_id"]: doc for doc in get_db()["fetch_state"].find({"_id": {"$in": list(urls)}})}
+
+
+def save_fetch_state(states: dict) -> int:
+    """
+    🇫🇷 Enregistre les validateurs HTTP des URLs traitées (un seul bulk_write).
+    🇩🇪 Speichert die HTTP-Validatoren der verarbeiteten URLs (ein einziges bulk_write).
+    🇬🇧 Upserts the validators of the processed URLs in one bulk_write.
+    """
+    if not states:
+        return 0
+    ops = [UpdateOne({"_id": url}, {"$set": state}, upsert=True) for url, state in states.items()]
+    get_db()["fetch_state"].bulk_write(ops, ordered=False)
+    return len(ops)
+
+
+# ============================================================
+# 🔖 snapshot_meta (version stamps written by the scrapers)
+# ============================================================
+def get_snapshot_version(name: str = "market"):
+    doc = get_db()["snapshot_meta"].find_one({"_id": name}, {"version": 1})
+    return doc.get("version") if doc else None
+
+
+def bump_snapshot_version(name: str = "market") -> int:
+    """
+    🇫🇷 Incrémente le tampon de version d’un jeu de données (appelé après chaque écriture des scrapers).
+    🇩🇪 Erhöht den Versionsstempel eines Datensatzes (nach jedem Schreiben der Scraper).
+    🇬🇧 Increments the version stamp of a dataset; called by the scrapers after each new batch.
+    """
+    doc = get_db()["snapshot_meta"].find_one_and_update(
+        {"_id": name},
+        {"$inc": {"version": 1}, "$set": {"updated_at": datetime.now(timezone.utc)}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    return doc["version"]
+
+
+def timed_ping() -> float:
+    """
+    🇬🇧 Round-trip time of a `ping` in milliseconds (health checks).
+    """
+    start = time.perf_counter()
+    get_client().admin.command("ping")
+    return round((time.perf_counter() - start) * 1000, 3)
@@ -0,0 +1,262 @@
+# core/http_fetcher.py
+"""
+🇫🇷 Téléchargement concurrent des pages des scrapers : session keep-alive partagée, débit limité, reprises.
+🇩🇪 Nebenläufiges Herunterladen der Scraper-Seiten: geteilte Keep-Alive-Session, Ratenlimit, Wiederholungen.
+🇬🇧 Concurrent page fetcher for the scrapers.
+
+    A bounded thread pool shares one keep-alive requests.Session. Every request first takes a
+    token from a global token bucket ($FETCH_RATE requests/s, bursts of $FETCH_BURST), then a slot
+    of its host's semaphore ($FETCH_PER_HOST parallel connections per host). Connection errors,
+    429 and 5xx answers are retried up to $FETCH_RETRIES times with exponential backoff and jitter
+    (or the server's Retry-After, in seconds or as an HTTP date), each wait capped at
+    $FETCH_MAX_BACKOFF seconds, so one slow or throttling page never stalls the whole batch.
+
+    ConditionalCache adds incremental fetching on top: each URL's ETag / Last-Modified and the hash
+    of its last processed body are kept in the `fetch_state` collection, requests are sent as
+    conditional GETs, and a 304 or an identical body is reported as unchanged so the scraper can
+    skip parsing and database writes.
+"""
+
+import os
+import time
+import random
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+
+from core import database
+
+load_dotenv()
+FETCH_WORKERS = int(os.getenv("FETCH_WORKERS", 8))
+FETCH_RATE = float(os.getenv("FETCH_RATE", 4))
+FETCH_BURST = int(os.getenv("FETCH_BURST", 4))
+FETCH_PER_HOST = int(os.getenv("FETCH_PER_HOST", 4))
+FETCH_RETRIES = int(os.getenv("FETCH_RETRIES", 3))
+FETCH_BACKOFF = float(os.getenv("FETCH_BACKOFF", 0.5))
+FETCH_MAX_BACKOFF = float(os.getenv("FETCH_MAX_BACKOFF", 30))
+FETCH_TIMEOUT = float(os.getenv("FETCH_TIMEOUT", 10))
+DEFAULT_HEADERS = {"User-Agent": "Mozilla/5.0"}
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """
+    🇬🇧 Thread-safe token bucket: `rate` tokens per second, at most `burst` stored.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        🇬🇧 Blocks until a token is available; returns the time spent waiting.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class Fetcher:
+    """
+    🇫🇷 Client HTTP partagé par un lot de téléchargements (à utiliser dans un bloc `with`).
+    🇩🇪 Gemeinsamer HTTP-Client für einen Download-Stapel (in einem `with`-Block verwenden).
+    🇬🇧 HTTP client shared by one batch of downloads; use it as a context manager.
+    """
+
+    def __init__(self, workers: int = FETCH_WORKERS, rate: float = FETCH_RATE, burst: int = FETCH_BURST,
+                 per_host: int = FETCH_PER_HOST, retries: int = FETCH_RETRIES, backoff: float = FETCH_BACKOFF,
+                 timeout: float = FETCH_TIMEOUT, headers: dict = None, max_backoff: float = FETCH_MAX_BACKOFF):
+        self.workers = workers
+        self.per_host = per_host
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.bucket = TokenBucket(rate, burst)
+        self.session = requests.Session()
+        self.session.headers.update(headers or DEFAULT_HEADERS)
+        adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._hosts = {}
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "retries": 0, "failures": 0, "throttled_seconds": 0.0}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        self.session.close()
+
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = threading.BoundedSemaphore(self.per_host)
+            return self._hosts[host]
+
+    def _count(self, key: str, value=1) -> None:
+        with self._lock:
+            self._stats[key] += value
+
+    def _delay(self, attempt: int, response=None) -> float:
+        """
+        🇬🇧 Wait before the next attempt: the server's Retry-After (delay in seconds or HTTP date)
+            when it is readable, exponential backoff with jitter otherwise, at most max_backoff.
+        """
+        retry_after = response.headers.get("Retry-After", "").strip() if response is not None else ""
+        delay = None
+        if retry_after.isdigit():
+            delay = float(retry_after)
+        elif retry_after:
+            try:
+                when = parsedate_to_datetime(retry_after)
+                # 🕐 Les dates HTTP sont toujours en GMT
+                when = when if when.tzinfo else when.replace(tzinfo=timezone.utc)
+                delay = when.timestamp() - time.time()
+            except (TypeError, ValueError, OverflowError):
+                delay = None
+        if delay is None:
+            delay = self.backoff * 2 ** attempt * (0.5 + random.random() / 2)
+        return min(max(delay, 0.0), self.max_backoff)
+
+    def fetch(self, url: str, headers: dict = None):
+        """
+        🇫🇷 Télécharge une URL avec limitation de débit et reprises ; None après le dernier échec.
+        🇩🇪 Lädt eine URL mit Ratenlimit und Wiederholungen; None nach dem letzten Fehlschlag.
+        🇬🇧 GETs `url` through the rate limiter, the per-host cap and the retry policy.
+            Returns the final Response (any status) or None if every attempt raised.
+        """
+        slot = self._host_slot(url)
+        for attempt in range(self.retries + 1):
+            self._count("throttled_seconds", self.bucket.acquire())
+            response, error = None, None
+            with slot:
+                self._count("requests")
+                try:
+                    response = self.session.get(url, headers=headers, timeout=self.timeout)
+                except requests.RequestException as e:
+                    error = e
+            if error is None and response.status_code not in RETRY_STATUS:
+                return response
+            if attempt == self.retries:
+                break
+            self._count("retries")
+            time.sleep(self._delay(attempt, response))
+
+        self._count("failures")
+        reason = error if error is not None else f"HTTP {response.status_code}"
+        print(f"[⚠️] Échec du téléchargement de {url} après {self.retries + 1} essais : {reason}")
+        return response
+
+    def fetch_all(self, urls: list, headers=None) -> list:
+        """
+        🇬🇧 Fetches `urls` concurrently on the thread pool; results keep the order of `urls`.
+            `headers` is a dict for every request or a callable url -> dict.
+        """
+        if not urls:
+            return []
+        headers_for = headers if callable(headers) else (lambda url: headers)
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(urls)), thread_name_prefix="fetch") as pool:
+            return list(pool.map(lambda url: self.fetch(url, headers_for(url)), urls))
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["throttled_seconds"] = round(stats["throttled_seconds"], 3)
+        return stats
+
+
+def content_hash(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()
+
+
+class ConditionalCache:
+    """
+    🇫🇷 Validateurs HTTP (ETag, Last-Modified, hash du contenu) d’un lot d’URLs.
+    🇩🇪 HTTP-Validatoren (ETag, Last-Modified, Inhalts-Hash) eines URL-Stapels.
+    🇬🇧 HTTP validators of a batch of URLs.
+
+        headers(url) gives the conditional request headers and is_unchanged(url, response) tells
+        whether the response can be skipped. Call mark_processed(url, response) once the body has
+        been parsed and written, then save(): a page whose processing failed is fetched again on
+        the next run.
+    """
+
+    def __init__(self, urls: list, state: dict = None):
+        self.state = database.load_fetch_state(urls) if state is None else dict(state)
+        self._pending = {}
+        self._lock = threading.Lock()
+        self.stats = {"fetched": 0, "not_modified": 0, "unchanged": 0, "changed": 0}
+
+    def headers(self, url: str) -> dict:
+        known = self.state.get(url) or {}
+        headers = {}
+        if known.get("etag"):
+            headers["If-None-Match"] = known["etag"]
+        if known.get("last_modified"):
+            headers["If-Modified-Since"] = known["last_modified"]
+        return headers
+
+    def is_unchanged(self, url: str, response) -> bool:
+        """
+        🇬🇧 True for a 304 or a 200 whose body hash equals the last processed one.
+        """
+        with self._lock:
+            self.stats["fetched"] += 1
+            if response is not None and response.status_code == 304:
+                self.stats["not_modified"] += 1
+                return True
+            if response is not None and response.ok:
+                known = self.state.get(url) or {}
+                if known.get("content_hash") == content_hash(response.content):
+                    self.stats["unchanged"] += 1
+                    return True
+            self.stats["changed"] += 1
+            return False
+
+    def mark_processed(self, url: str, response) -> None:
+        with self._lock:
+            self._pending[url] = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "content_hash": content_hash(response.content),
+                "checked_at": time.time(),
+            }
+
+    def save(self) -> int:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        self.state.update(pending)
+        return database.save_fetch_state(pending)
+
+    @property
+    def short_circuited(self) -> int:
+        return self.stats["not_modified"] + self.stats["unchanged"]
+
+    def summary(self) -> str:
+        return (f"{self.short_circuited}/{self.stats['fetched']} téléchargements inchangés "
+                f"({self.stats['not_modified']} × 304, {self.stats['unchanged']} × même contenu)")
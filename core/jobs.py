@@ -0,0 +1,343 @@
+# core/jobs.py
+"""
+🇫🇷 File de tâches locale pour les analyses longues (sentiment, Otto, pipeline alpha/bêta).
+🇩🇪 Lokale Job-Warteschlange für lange Analysen (Sentiment, Otto, Alpha/Beta-Pipeline).
+🇬🇧 Local job queue for long-running analytics.
+
+    A request only inserts a row in the SQLite job table ($JOBS_DB, shared by every gunicorn
+    worker) and hands the job to a pool of $JOB_WORKERS worker processes, then returns the job
+    id at once. Workers keep their models and MongoDB client warm between jobs and write the
+    status and the JSON result back to the table, so any web worker can answer status / result /
+    cancel calls. Queued jobs are cancelled before they start; a running job cannot be
+    interrupted, its result is discarded instead. Finished jobs are purged after $JOB_RESULT_TTL
+    seconds.
+"""
+
+import os
+import json
+import time
+import uuid
+import sqlite3
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from dotenv import load_dotenv
+
+load_dotenv()
+JOBS_DB = os.getenv("JOBS_DB", "cache/jobs.sqlite3")
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", 2))
+JOB_RESULT_TTL = int(os.getenv("JOB_RESULT_TTL", 24 * 3600))
+# 🧵 "spawn" : les workers ne héritent pas des threads du serveur web (pool de graphiques, warm-up)
+JOB_START_METHOD = os.getenv("JOB_START_METHOD", "spawn")
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+FINISHED = (DONE, FAILED, CANCELLED)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    params TEXT,
+    result TEXT,
+    error TEXT,
+    worker_pid INTEGER,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+)
+"""
+
+
+# ============================================================
+# 🧩 Tâches exécutées dans les workers
+# ============================================================
+def analyze_latest_news(limit: int = 5) -> dict:
+    """
+    🇫🇷 Recalcule le sentiment des derniers articles et l’enregistre dans news_articles.
+    🇩🇪 Berechnet das Sentiment der neuesten Artikel neu und speichert es in news_articles.
+    🇬🇧 Re-scores the latest news articles and writes label / score back to news_articles.
+    """
+    from datetime import datetime
+    from pymongo import UpdateOne
+    from core import database
+    from core.sentiment_engine import score_texts
+
+    news = database.latest_news(limit)
+    results = [{"label": r["label"], "score": r["score"]} for r in score_texts([n["title"] for n in news])]
+    scores = [r["score"] if r["label"] == "positive" else -r["score"] for r in results]
+    avg_score = round(sum(scores) / len(scores), 4) if scores else 0.0
+
+    # Mettre à jour les articles avec leur sentiment et score (un seul bulk_write non ordonné)
+    analyzed_at = datetime.utcnow().isoformat()
+    database.bulk_write_chunks(database.news_articles_collection(), (
+        UpdateOne(
+            {"_id": article["_id"]},
+            {"$set": {"sentiment": result["label"], "sentiment_score": score, "analyzed_at": analyzed_at}}
+        )
+        for article, result, score in zip(news, results, scores)
+    ))
+    return {
+        "news": [{"title": n["title"], "link": n["link"]} for n in news],
+        "avg_score": avg_score,
+        "details": results
+    }
+
+
+def ask_llm(advice: dict, metrics: dict = None) -> dict:
+    """
+    🇬🇧 Otto's answer for the prompt arguments built by the web request (`advice`), plus the
+        portfolio metrics already computed there.
+    """
+    from core.llm_advisor import generate_financial_advice
+
+    return {"answer": generate_financial_advice(**advice), **(metrics or {})}
+
+
+def alpha_beta(limit: int = 50) -> dict:
+    """
+    🇬🇧 Runs core.alpha_beta_model.alpha_beta_pipeline and returns the best `limit` assets.
+    """
+    from core.alpha_beta_model import alpha_beta_pipeline
+
+    scored, top = alpha_beta_pipeline()
+    columns = [c for c in ("_id", "price", "performance", "predicted_return", "alpha", "beta",
+                           "sharpe_ratio", "label") if c in top.columns]
+    top = top.sort_values("sharpe_ratio", ascending=False).head(limit)[columns]
+    # 🧹 NaN → null pour un JSON valide
+    return {"assets": len(scored), "top_assets": json.loads(top.to_json(orient="records"))}
+
+
+TASKS = {
+    "analyze-news-local": analyze_latest_news,
+    "ask-llm": ask_llm,
+    "alpha-beta": alpha_beta,
+}
+
+
+# ============================================================
+# 🗄️ Table des tâches (SQLite)
+# ============================================================
+def _connect(path: str) -> sqlite3.Connection:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(_SCHEMA)
+    return conn
+
+
+def _run_job(path: str, job_id: str, func, params: dict) -> None:
+    """
+    🇬🇧 Worker-side wrapper: claims the job (unless it was cancelled meanwhile), runs it and
+        stores the outcome. A job cancelled while running keeps its "cancelled" status.
+    """
+    conn = _connect(path)
+    try:
+        claimed = conn.execute(
+            "UPDATE jobs SET status = ?, started_at = ?, worker_pid = ? WHERE id = ? AND status = ?",
+            (RUNNING, time.time(), os.getpid(), job_id, QUEUED),
+        ).rowcount
+        if not claimed:
+            return
+        try:
+            result, error, status = json.dumps(func(**params), default=str), None, DONE
+        except Exception as e:
+            result, error, status = None, f"{type(e).__name__}: {e}", FAILED
+        conn.execute(
+            "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE id = ? AND status = ?",
+            (status, result, error, time.time(), job_id, RUNNING),
+        )
+    finally:
+        conn.close()
+
+
+def _public(row) -> dict:
+    job = {key: row[key] for key in ("id", "kind", "status", "error", "worker_pid",
+                                     "created_at", "started_at", "finished_at")}
+    end = row["finished_at"] or time.time()
+    job["queued_seconds"] = round((row["started_at"] or end) - row["created_at"], 3)
+    job["run_seconds"] = round(end - row["started_at"], 3) if row["started_at"] else None
+    return job
+
+
+class JobQueue:
+    """
+    🇬🇧 Job table at `path` plus the worker pool of this process (created on first submit).
+    """
+
+    def __init__(self, path: str = JOBS_DB, workers: int = JOB_WORKERS, tasks: dict = None,
+                 start_method: str = JOB_START_METHOD):
+        self.path = path
+        self.workers = workers
+        self.tasks = TASKS if tasks is None else tasks
+        self.start_method = start_method
+        self._executor = None
+        self._futures = {}
+        self._lock = threading.Lock()
+        _connect(path).close()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context(self.start_method)
+                )
+            return self._executor
+
+    def submit(self, kind: str, params: dict = None) -> str:
+        """
+        🇫🇷 Enregistre une tâche et la confie aux workers ; renvoie immédiatement son identifiant.
+        🇩🇪 Registriert einen Job, übergibt ihn den Workern und gibt sofort seine ID zurück.
+        🇬🇧 Records a job, hands it to the worker pool and returns its id immediately.
+            Raises KeyError for an unknown `kind`.
+        """
+        if kind not in self.tasks:
+            raise KeyError(f"Unknown job kind '{kind}' (expected {', '.join(sorted(self.tasks))})")
+        params = params or {}
+        job_id = uuid.uuid4().hex
+        conn = _connect(self.path)
+        try:
+            conn.execute("DELETE FROM jobs WHERE status IN (?, ?, ?) AND finished_at < ?",
+                         (*FINISHED, time.time() - JOB_RESULT_TTL))
+            conn.execute("INSERT INTO jobs (id, kind, status, params, created_at) VALUES (?, ?, ?, ?, ?)",
+                         (job_id, kind, QUEUED, json.dumps(params, default=str), time.time()))
+        finally:
+            conn.close()
+
+        try:
+            future = self._pool().submit(_run_job, self.path, job_id, self.tasks[kind], params)
+        except BrokenProcessPool:
+            # 💥 Un worker est mort depuis le dernier submit : nouveau pool, une seule fois
+            with self._lock:
+                self._executor = None
+            future = self._pool().submit(_run_job, self.path, job_id, self.tasks[kind], params)
+        with self._lock:
+            self._futures[job_id] = future
+        future.add_done_callback(lambda f: self._on_done(job_id, f))
+        return job_id
+
+    def _on_done(self, job_id: str, future) -> None:
+        with self._lock:
+            self._futures.pop(job_id, None)
+        if future.cancelled() or future.exception() is None:
+            return
+        error = future.exception()
+        if isinstance(error, BrokenProcessPool):
+            # 💥 Worker tué (OOM…) : le pool est inutilisable, le prochain submit en recrée un
+            with self._lock:
+                self._executor = None
+        self._finish(job_id, FAILED, f"{type(error).__name__}: {error}", (QUEUED, RUNNING))
+
+    def _finish(self, job_id: str, status: str, error, from_statuses) -> bool:
+        conn = _connect(self.path)
+        try:
+            marks = ",".join("?" * len(from_statuses))
+            return bool(conn.execute(
+                f"UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE id = ? AND status IN ({marks})",
+                (status, error, time.time(), job_id, *from_statuses),
+            ).rowcount)
+        finally:
+            conn.close()
+
+    def _row(self, job_id: str):
+        conn = _connect(self.path)
+        try:
+            return conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        finally:
+            conn.close()
+
+    def status(self, job_id: str):
+        """
+        🇬🇧 Public fields and timings of a job, or None if it does not exist.
+        """
+        row = self._row(job_id)
+        return _public(row) if row else None
+
+    def result(self, job_id: str):
+        """
+        🇬🇧 (job, result): the decoded result is only set once the job is done.
+        """
+        row = self._row(job_id)
+        if row is None:
+            return None, None
+        return _public(row), json.loads(row["result"]) if row["result"] is not None else None
+
+    def cancel(self, job_id: str):
+        """
+        🇫🇷 Annule une tâche : retirée de la file si elle n’a pas démarré, résultat ignoré sinon.
+        🇩🇪 Bricht einen Job ab: aus der Warteschlange entfernt oder sein Ergebnis verworfen.
+        🇬🇧 Cancels a job. A queued job never starts; a running one finishes but its result is
+            dropped. Returns the job status afterwards, or None if the job does not exist.
+        """
+        with self._lock:
+            future = self._futures.get(job_id)
+        if future is not None:
+            future.cancel()
+        self._finish(job_id, CANCELLED, None, (QUEUED, RUNNING))
+        return self.status(job_id)
+
+    def get_stats(self) -> dict:
+        conn = _connect(self.path)
+        try:
+            counts = dict(conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+            avg_run = conn.execute(
+                "SELECT kind, AVG(finished_at - started_at), COUNT(*) FROM jobs "
+                "WHERE status = ? GROUP BY kind", (DONE,)
+            ).fetchall()
+        finally:
+            conn.close()
+        with self._lock:
+            in_flight = len(self._futures)
+        return {
+            "workers": self.workers,
+            "in_flight_here": in_flight,
+            "by_status": counts,
+            "avg_run_ms": {kind: round(seconds * 1000, 1) for kind, seconds, _ in avg_run},
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_queue() -> JobQueue:
+    """
+    🇬🇧 The job queue of this process (one worker pool per gunicorn worker, one shared table).
+    """
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = JobQueue()
+    return _queue
+
+
+def submit(kind: str, params: dict = None) -> str:
+    return get_queue().submit(kind, params)
+
+
+def status(job_id: str):
+    return get_queue().status(job_id)
+
+
+def result(job_id: str):
+    return get_queue().result(job_id)
+
+
+def cancel(job_id: str):
+    return get_queue().cancel(job_id)
+
+
+def get_stats() -> dict:
+    return get_queue().get_stats()
@@ -1,68 +1,32 @@
-import os
-import torch
-import yfinance as yf
-import pandas as pd
-from dotenv import load_dotenv
-from transformers import AutoTokenizer, AutoModelForSequenceClassification, pipeline
-
-# 🔐 Chargement des variables d’environnement (.env)
-load_dotenv()
-HF_TOKEN = os.getenv("HF_TOKEN")
-
-# 🔎 Chargement du modèle de sentiment Hugging Face
-SENTIMENT_MODEL = "mrm8488/distilroberta-finetuned-financial-news-sentiment-analysis"
-tokenizer = AutoTokenizer.from_pretrained(SENTIMENT_MODEL, token=HF_TOKEN)
-model = AutoModelForSequenceClassification.from_pretrained(SENTIMENT_MODEL, token=HF_TOKEN)
-
-# 🧠 Chargement du modèle GPT-2 (Otto)
-generator = pipeline("text-generation", model="gpt2")
-
-# 📈 Analyse des meilleurs gainers sur Yahoo Finance
-def get_top_gainers(tickers: list, period="5d") -> list:
-    data = yf.download(tickers, period=period, interval="1d", progress=False, auto_adjust=False)
+import numpy as np
 
-    if isinstance(data.columns, pd.MultiIndex):
-        if "Adj Close" not in data.columns.levels[0]:
-            raise ValueError("❌ 'Adj Close' not found in multi-index data.")
-        data = data["Adj Close"]
-    else:
-        if "Adj Close" not in data.columns:
-            raise ValueError("❌ 'Adj Close' not found in Yahoo Finance data.")
-        data = data["Adj Close"]
+from core import advice_cache, llm_service, price_store
+from core.risk_engine import portfolio_risk
 
-    returns = data.pct_change().sum().sort_values(ascending=False)
-    return returns.head(5).index.tolist()
+# 🔎 Les modèles (sentiment + LLM) sont chargés à la demande (core.model_registry, core.llm_service)
 
-# 💡 Calcul simplifié du Sharpe Ratio
+# 📈 Meilleurs gainers à partir de l’historique local (core.price_store, sans réseau)
+def get_top_gainers(tickers: list, period="5d") -> list:
+    days = int(period.rstrip("d"))
+    _, returns = price_store.return_matrix(tickers, days=days)
+    if not len(returns):
+        return []
+    totals = np.nansum(returns, axis=0)
+    known = [i for i in np.argsort(-totals, kind="stable") if not np.isnan(returns[:, i]).all()]
+    return [tickers[i] for i in known[:5]]
+
+# 💡 Sharpe Ratio annualisé à partir des rendements locaux (core.risk_engine, sans réseau)
 def calculate_sharpe_ratio(portfolio: dict, risk_free_rate=0.01) -> float:
     if not portfolio:
         return None
 
-    tickers = list(portfolio.keys())
-    weights = [portfolio[t] for t in tickers]
-    total = sum(weights)
-    weights = [w / total for w in weights]
-
-    prices = yf.download(tickers, period="6mo", interval="1d", progress=False, auto_adjust=False)
-
-    if isinstance(prices.columns, pd.MultiIndex):
-        if "Adj Close" not in prices.columns.levels[0]:
-            raise ValueError("❌ 'Adj Close' not found in multi-index data.")
-        prices = prices["Adj Close"]
-    else:
-        if "Adj Close" not in prices.columns:
-            raise ValueError("❌ 'Adj Close' not found in Yahoo Finance data.")
-        prices = prices["Adj Close"]
-
-    daily_returns = prices.pct_change().dropna()
-    portfolio_returns = (daily_returns * weights).sum(axis=1)
-
-    excess_returns = portfolio_returns - (risk_free_rate / 252)
-    sharpe_ratio = excess_returns.mean() / excess_returns.std()
-    return round(sharpe_ratio * (252**0.5), 2)
+    risk = portfolio_risk(portfolio, risk_free_rate)
+    if risk["source"] != "covariance" or risk["sharpe_ratio"] is None:
+        return None
+    return round(risk["sharpe_ratio"], 2)
 
-# 🧠 Otto – Conseiller IA (version GPT-2 locale)
-def generate_financial_advice(
+# 🧠 Otto – Construction du prompt à partir des données du client
+def build_advice_prompt(
     question: str,
     sentiment_score: float = None,
     gainers_list: list = None,
@@ -70,9 +34,6 @@ def generate_financial_advice(
     sharpe_value: float = None,
     transactions: str = ""
 ) -> str:
-    if not question.strip():
-        return "❗️Please enter a valid financial question so Otto can assist you."
-
     gainers = ', '.join(gainers_list[:5]) if gainers_list else "Not provided"
     portfolio_str = str(portfolio) if portfolio else "No current holdings"
     sentiment_str = (
@@ -81,7 +42,7 @@ def generate_financial_advice(
     )
     sharpe_str = f"{sharpe_value:.2f}" if sharpe_value is not None else "Not provided"
 
-    prompt = f"""
+    return f"""
 You are Otto, a senior portfolio strategist at a private bank. Your job is to give concise and professional advice to clients based on data.
 
 Client's Question:
@@ -99,20 +60,58 @@ Respond in 2 to 4 sentences. Stay professional, helpful, and focused on the clie
 Otto's answer:
 """.strip()
 
+# 🧠 Otto – Conseiller IA (LLM local partagé, voir core.llm_service)
+def generate_financial_advice(
+    question: str,
+    sentiment_score: float = None,
+    gainers_list: list = None,
+    portfolio: dict = None,
+    sharpe_value: float = None,
+    transactions: str = "",
+    data_version=None
+) -> str:
+    if not question.strip():
+        return "❗️Please enter a valid financial question so Otto can assist you."
+
+    prompt = build_advice_prompt(question, sentiment_score, gainers_list, portfolio, sharpe_value, transactions)
     try:
-        output = generator(prompt, max_length=250, num_return_sequences=1)[0]["generated_text"]
-        answer = output.split("Otto's answer:")[-1].strip()
-        return answer
+        # ♻️ Même prompt + mêmes données de marché → même réponse (cache + single-flight)
+        key = advice_cache.make_key(prompt, data_version)
+        return "".join(advice_cache.cached_stream(key, lambda: llm_service.stream(prompt))).strip()
     except Exception as e:
         return f"❌ Otto encountered an error: {e}"
 
+# 📡 Otto – Réponse diffusée morceau par morceau (SSE)
+def stream_financial_advice(
+    question: str,
+    sentiment_score: float = None,
+    gainers_list: list = None,
+    portfolio: dict = None,
+    sharpe_value: float = None,
+    transactions: str = "",
+    data_version=None
+):
+    if not question.strip():
+        yield "❗️Please enter a valid financial question so Otto can assist you."
+        return
+
+    prompt = build_advice_prompt(question, sentiment_score, gainers_list, portfolio, sharpe_value, transactions)
+    key = advice_cache.make_key(prompt, data_version)
+    first = True
+    for text in advice_cache.cached_stream(key, lambda: llm_service.stream(prompt)):
+        if first:
+            text = text.lstrip()
+            first = not text
+            if first:
+                continue
+        yield text
+
 # 📊 Analyse de sentiment
 def analyze_sentiment(text: str) -> float:
+    from core.sentiment_engine import score_texts
+
     try:
-        inputs = tokenizer(text, return_tensors="pt", truncation=True)
-        with torch.no_grad():
-            outputs = model(**inputs)
-        scores = torch.nn.functional.softmax(outputs.logits, dim=-1)[0]
+        scores = score_texts([text])[0]["probs"]
         return float(scores[1] - scores[0])
     except Exception as e:
         print(f"⚠️ Erreur d’analyse du sentiment: {e}")
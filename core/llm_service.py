@@ -0,0 +1,207 @@
+# core/llm_service.py
+"""
+🇫🇷 Service LLM local partagé : une seule instance de modèle par processus, file d’attente bornée et streaming des tokens.
+🇩🇪 Gemeinsamer lokaler LLM-Dienst: eine Modellinstanz pro Prozess, begrenzte Warteschlange und Token-Streaming.
+🇬🇧 Shared local LLM service for Otto: one model instance per process behind a bounded request
+    queue, with token streaming.
+
+    Backends ($LLM_BACKEND):
+    - "llama": llama-cpp-python over the GGUF file in $GGUF_MODEL_PATH. Weights are memory-mapped,
+      so every gunicorn worker shares the same physical pages instead of holding its own copy.
+    - "gpt2":  Hugging Face GPT-2 via core.model_registry (previous behaviour).
+    - "auto" (default): llama if the GGUF file exists, otherwise gpt2.
+
+    $LLM_CONCURRENCY generations run at the same time (default 1); further requests wait in the
+    queue up to $LLM_QUEUE_TIMEOUT seconds before LLMBusyError is raised.
+"""
+
+import os
+import time
+import threading
+
+from dotenv import load_dotenv
+
+from core.model_registry import get_model, get_text_generator, is_loaded, register
+
+load_dotenv()
+LLM_BACKEND = os.getenv("LLM_BACKEND", "auto")
+GGUF_MODEL_PATH = os.getenv("GGUF_MODEL_PATH", "models/llama-model.gguf")
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", 1))
+LLM_QUEUE_TIMEOUT = float(os.getenv("LLM_QUEUE_TIMEOUT", 120))
+LLM_MAX_NEW_TOKENS = int(os.getenv("LLM_MAX_NEW_TOKENS", 120))
+LLM_THREADS = int(os.getenv("LLM_THREADS", 0)) or None
+
+
+class LLMBusyError(RuntimeError):
+    """
+    🇬🇧 Raised when a request waited longer than $LLM_QUEUE_TIMEOUT for a free generation slot.
+    """
+
+
+class LlamaCppBackend:
+    """
+    🇬🇧 llama.cpp backend (GGUF, memory-mapped weights).
+    """
+
+    name = "llama"
+
+    def __init__(self, model_path: str):
+        from llama_cpp import Llama
+
+        self.llm = Llama(
+            model_path=model_path,
+            n_ctx=int(os.getenv("LLM_CONTEXT", 2048)),
+            n_threads=LLM_THREADS,
+            use_mmap=True,
+            verbose=False,
+        )
+
+    def stream(self, prompt: str, max_new_tokens: int):
+        for chunk in self.llm(prompt, max_tokens=max_new_tokens, stream=True):
+            text = chunk["choices"][0]["text"]
+            if text:
+                yield text
+
+
+class TransformersBackend:
+    """
+    🇬🇧 Hugging Face backend (GPT-2 pipeline from the model registry), streamed with TextIteratorStreamer.
+    """
+
+    name = "gpt2"
+
+    def __init__(self):
+        generator = get_text_generator()
+        self.model = generator.model
+        self.tokenizer = generator.tokenizer
+
+    def stream(self, prompt: str, max_new_tokens: int):
+        import torch
+        from transformers import StoppingCriteria, StoppingCriteriaList, TextIteratorStreamer
+
+        stop = threading.Event()
+
+        class _StopOnEvent(StoppingCriteria):
+            def __call__(self, input_ids, scores, **kwargs):
+                return torch.full((input_ids.shape[0],), stop.is_set(), dtype=torch.bool)
+
+        inputs = self.tokenizer(prompt, return_tensors="pt")
+        streamer = TextIteratorStreamer(self.tokenizer, skip_prompt=True, skip_special_tokens=True)
+        errors = []
+
+        def run():
+            try:
+                self.model.generate(
+                    **inputs,
+                    streamer=streamer,
+                    max_new_tokens=max_new_tokens,
+                    pad_token_id=self.tokenizer.eos_token_id,
+                    stopping_criteria=StoppingCriteriaList([_StopOnEvent()]),
+                )
+            except Exception as e:
+                # ⚠️ Débloque le consommateur, l’erreur est relancée ci-dessous
+                errors.append(e)
+                streamer.end()
+
+        thread = threading.Thread(target=run, name="llm-generate", daemon=True)
+        thread.start()
+        try:
+            for text in streamer:
+                if text:
+                    yield text
+        finally:
+            # 🛑 Client parti : on arrête la génération au prochain token
+            stop.set()
+            thread.join()
+        if errors:
+            raise errors[0]
+
+
+def _load_llm():
+    backend = LLM_BACKEND
+    if backend == "auto":
+        backend = "llama" if os.path.exists(GGUF_MODEL_PATH) else "gpt2"
+    if backend == "llama":
+        return LlamaCppBackend(GGUF_MODEL_PATH)
+    if backend == "gpt2":
+        return TransformersBackend()
+    raise ValueError(f"❌ Unknown LLM_BACKEND '{LLM_BACKEND}' (expected auto, llama or gpt2)")
+
+
+register("llm", _load_llm)
+
+_slots = threading.BoundedSemaphore(LLM_CONCURRENCY)
+_stats_lock = threading.Lock()
+_stats = {
+    "requests": 0,
+    "rejected": 0,
+    "waiting": 0,
+    "active": 0,
+    "chunks": 0,
+    "queue_wait_seconds": 0.0,
+    "ttft_seconds": 0.0,
+    "generation_seconds": 0.0,
+}
+
+
+def _bump(**deltas):
+    with _stats_lock:
+        for key, value in deltas.items():
+            _stats[key] += value
+
+
+def stream(prompt: str, max_new_tokens: int = LLM_MAX_NEW_TOKENS):
+    """
+    🇫🇷 Génère la réponse token par token (générateur de morceaux de texte).
+    🇩🇪 Erzeugt die Antwort Token für Token (Generator von Textstücken).
+    🇬🇧 Yields the completion piece by piece once a generation slot is free.
+        Closing the generator (client disconnect) stops the generation.
+    """
+    queued_at = time.perf_counter()
+    _bump(waiting=1)
+    acquired = _slots.acquire(timeout=LLM_QUEUE_TIMEOUT)
+    _bump(waiting=-1)
+    if not acquired:
+        _bump(rejected=1)
+        raise LLMBusyError("⏳ Otto is busy, please retry in a moment.")
+
+    started = time.perf_counter()
+    _bump(requests=1, active=1, queue_wait_seconds=started - queued_at)
+    chunks = 0
+    try:
+        backend = get_model("llm")
+        for text in backend.stream(prompt, max_new_tokens):
+            if chunks == 0:
+                _bump(ttft_seconds=time.perf_counter() - started)
+            chunks += 1
+            yield text
+    finally:
+        _bump(active=-1, chunks=chunks, generation_seconds=time.perf_counter() - started)
+        _slots.release()
+
+
+def generate(prompt: str, max_new_tokens: int = LLM_MAX_NEW_TOKENS) -> str:
+    """
+    🇬🇧 Blocking variant of stream(): returns the full completion.
+    """
+    return "".join(stream(prompt, max_new_tokens))
+
+
+def get_stats() -> dict:
+    """
+    🇫🇷 File d’attente, temps jusqu’au premier token et débit du service LLM.
+    🇩🇪 Warteschlange, Zeit bis zum ersten Token und Durchsatz des LLM-Dienstes.
+    🇬🇧 Queue depth, time-to-first-token and throughput of the LLM service.
+    """
+    with _stats_lock:
+        stats = dict(_stats)
+    n = stats["requests"]
+    queue_wait, ttft, generation_seconds = (
+        stats.pop("queue_wait_seconds"), stats.pop("ttft_seconds"), stats.pop("generation_seconds")
+    )
+    stats["backend"] = get_model("llm").name if is_loaded("llm") else None
+    stats["concurrency"] = LLM_CONCURRENCY
+    stats["avg_queue_wait_seconds"] = round(queue_wait / n, 4) if n else None
+    stats["avg_ttft_seconds"] = round(ttft / n, 4) if n else None
+    stats["chunks_per_second"] = round(stats["chunks"] / generation_seconds, 2) if generation_seconds else None
+    return stats
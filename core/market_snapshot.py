@@ -0,0 +1,143 @@
+# core/market_snapshot.py
+"""
+🇫🇷 Snapshot en mémoire des données de marché (yahoo_gainers), indexé par symbole.
+🇩🇪 In-Memory-Snapshot der Marktdaten (yahoo_gainers), nach Symbol indiziert.
+🇬🇧 Process-level, read-only snapshot of the market data (yahoo_gainers) indexed by symbol.
+
+    The scrapers bump a version stamp in `snapshot_meta` after each batch
+    (core.database.bump_snapshot_version). Readers check that stamp at most every
+    $SNAPSHOT_CHECK_INTERVAL seconds and rebuild the snapshot only when it changed, so a request
+    does a dictionary lookup instead of aggregating the whole collection. When no stamp exists yet
+    the snapshot is rebuilt every $SNAPSHOT_MAX_AGE seconds instead.
+
+    A snapshot is never modified after it is built: a refresh builds a new one and swaps the
+    reference, so concurrent readers always see a consistent view.
+"""
+
+import os
+import time
+import threading
+from types import MappingProxyType
+from typing import NamedTuple, Optional
+
+import numpy as np
+from dotenv import load_dotenv
+
+from core import database
+
+load_dotenv()
+SNAPSHOT_CHECK_INTERVAL = float(os.getenv("SNAPSHOT_CHECK_INTERVAL", 5))
+SNAPSHOT_MAX_AGE = float(os.getenv("SNAPSHOT_MAX_AGE", 300))
+
+
+class Quote(NamedTuple):
+    price: Optional[float]
+    volume: Optional[float]
+    market_cap: Optional[float]
+    performance: float
+
+
+class MarketSnapshot(NamedTuple):
+    version: Optional[int]
+    built_at: float
+    quotes: MappingProxyType
+    # 🧮 Vue vectorielle pour les calculs en lot (core.batch_metrics) : symbole → colonne
+    index: MappingProxyType
+    performance: np.ndarray
+
+    def get(self, symbol: str) -> Optional[Quote]:
+        return self.quotes.get(symbol)
+
+    def __len__(self):
+        return len(self.quotes)
+
+
+_snapshot = None
+_checked_at = 0.0
+_lock = threading.Lock()
+_stats = {"checks": 0, "refreshes": 0, "check_failures": 0, "build_seconds": 0.0}
+
+
+def build_snapshot(docs: list, version=None) -> MarketSnapshot:
+    """
+    🇬🇧 Builds an immutable snapshot from `load_gainers_performance()` documents.
+    """
+    quotes = {
+        doc["_id"]: Quote(doc.get("price"), doc.get("volume"), doc.get("market_cap"), doc["performance"])
+        for doc in docs
+        if doc.get("performance") is not None
+    }
+    performance = np.array([quote.performance for quote in quotes.values()], dtype=np.float64)
+    performance.flags.writeable = False
+    index = MappingProxyType({symbol: i for i, symbol in enumerate(quotes)})
+    return MarketSnapshot(version, time.time(), MappingProxyType(quotes), index, performance)
+
+
+def _refresh(version) -> MarketSnapshot:
+    global _snapshot
+    start = time.perf_counter()
+    snapshot = build_snapshot(database.load_gainers_performance(), version)
+    _snapshot = snapshot
+    _stats["refreshes"] += 1
+    _stats["build_seconds"] = time.perf_counter() - start
+    print(f"[✅] Snapshot marché v{version} : {len(snapshot)} symboles chargés.")
+    return snapshot
+
+
+def get_snapshot() -> MarketSnapshot:
+    """
+    🇫🇷 Retourne le snapshot courant, rechargé seulement si les scrapers ont écrit un nouveau lot.
+    🇩🇪 Gibt den aktuellen Snapshot zurück; neu geladen nur nach einem neuen Scraper-Lauf.
+    🇬🇧 Returns the current snapshot, rebuilt only when the scrapers published a new version.
+        If MongoDB is unreachable during a check, the previous snapshot keeps being served.
+    """
+    global _checked_at
+    snapshot = _snapshot
+    if snapshot is not None and time.monotonic() - _checked_at < SNAPSHOT_CHECK_INTERVAL:
+        return snapshot
+
+    with _lock:
+        snapshot = _snapshot
+        if snapshot is not None and time.monotonic() - _checked_at < SNAPSHOT_CHECK_INTERVAL:
+            return snapshot
+        _stats["checks"] += 1
+        try:
+            version = database.get_snapshot_version("market")
+        except Exception as e:
+            if snapshot is None:
+                raise
+            _stats["check_failures"] += 1
+            print(f"[⚠️] Version du snapshot illisible, données précédentes conservées : {e}")
+            _checked_at = time.monotonic()
+            return snapshot
+
+        stale = (
+            snapshot is None
+            or version != snapshot.version
+            or (version is None and time.time() - snapshot.built_at > SNAPSHOT_MAX_AGE)
+        )
+        if stale:
+            snapshot = _refresh(version)
+        _checked_at = time.monotonic()
+        return snapshot
+
+
+def invalidate() -> None:
+    """
+    🇬🇧 Forces a version check on the next get_snapshot() call.
+    """
+    global _checked_at
+    _checked_at = 0.0
+
+
+def get_stats() -> dict:
+    snapshot = _snapshot
+    return {
+        "version": snapshot.version if snapshot else None,
+        "symbols": len(snapshot) if snapshot else 0,
+        "age_seconds": round(time.time() - snapshot.built_at, 1) if snapshot else None,
+        "checks": _stats["checks"],
+        "refreshes": _stats["refreshes"],
+        "check_failures": _stats["check_failures"],
+        "last_build_ms": round(_stats["build_seconds"] * 1000, 3),
+    }
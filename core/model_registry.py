@@ -0,0 +1,195 @@
+# core/model_registry.py
+"""
+🇫🇷 Registre de modèles partagé par processus : chaque modèle est chargé une seule fois, à la demande, de façon thread-safe.
+🇩🇪 Prozessweites Modell-Register: jedes Modell wird einmal, bei Bedarf und threadsicher geladen.
+🇬🇧 Process-wide model registry: each model is loaded once, lazily and thread-safely, and shared by
+    the Flask app, Otto (core.llm_advisor) and the batch scripts.
+"""
+
+import os
+import time
+import logging
+import threading
+from contextlib import contextmanager
+
+from dotenv import load_dotenv
+
+load_dotenv()
+HF_TOKEN = os.getenv("HF_TOKEN")
+
+SENTIMENT_MODEL = "mrm8488/distilroberta-finetuned-financial-news-sentiment-analysis"
+GENERATOR_MODEL = "gpt2"
+
+_loaders = {}
+_models = {}
+_stats = {}
+_locks = {}
+_registry_lock = threading.Lock()
+
+
+def _rss_mb() -> float:
+    """
+    🇬🇧 Current resident set size of the process in MB (0.0 if unavailable).
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+    except (OSError, ValueError, IndexError):
+        try:
+            import resource
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        except Exception:
+            return 0.0
+
+
+def register(name: str, loader) -> None:
+    """
+    🇫🇷 Déclare un modèle et la fonction qui le charge (appelée au premier accès seulement).
+    🇩🇪 Registriert ein Modell und seine Ladefunktion (nur beim ersten Zugriff aufgerufen).
+    🇬🇧 Registers a model name and the loader called on first access only.
+    """
+    with _registry_lock:
+        _loaders[name] = loader
+        _locks.setdefault(name, threading.Lock())
+        _stats.setdefault(name, {
+            "loaded": False,
+            "load_seconds": None,
+            "rss_delta_mb": None,
+            "calls": 0,
+            "total_seconds": 0.0,
+            "last_seconds": None,
+            "max_seconds": 0.0,
+        })
+
+
+def get_model(name: str):
+    """
+    🇫🇷 Retourne le modèle demandé, en le chargeant au premier appel.
+    🇩🇪 Gibt das Modell zurück und lädt es beim ersten Aufruf.
+    🇬🇧 Returns the named model, loading it on first call (double-checked locking).
+    """
+    model = _models.get(name)
+    if model is not None:
+        return model
+
+    if name not in _loaders:
+        raise KeyError(f"❌ Unknown model '{name}'")
+
+    with _locks[name]:
+        model = _models.get(name)
+        if model is None:
+            logging.info(f"[🤖] Loading model '{name}'…")
+            rss_before = _rss_mb()
+            start = time.perf_counter()
+            model = _loaders[name]()
+            _stats[name]["load_seconds"] = round(time.perf_counter() - start, 3)
+            _stats[name]["rss_delta_mb"] = round(_rss_mb() - rss_before, 1)
+            _stats[name]["loaded"] = True
+            _models[name] = model
+            logging.info(f"[✅] Model '{name}' loaded in {_stats[name]['load_seconds']}s")
+    return model
+
+
+def is_loaded(name: str) -> bool:
+    return name in _models
+
+
+def record_call(name: str, seconds: float) -> None:
+    """
+    🇬🇧 Adds one inference call of `seconds` to the latency counters of `name`.
+    """
+    with _registry_lock:
+        stats = _stats[name]
+        stats["calls"] += 1
+        stats["total_seconds"] += seconds
+        stats["last_seconds"] = round(seconds, 4)
+        stats["max_seconds"] = max(stats["max_seconds"], seconds)
+
+
+@contextmanager
+def timed(name: str):
+    """
+    🇫🇷 Mesure la durée d’un appel d’inférence.
+    🇩🇪 Misst die Dauer eines Inferenzaufrufs.
+    🇬🇧 Measures an inference call: `with timed("sentiment"): ...`
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_call(name, time.perf_counter() - start)
+
+
+def get_stats() -> dict:
+    """
+    🇫🇷 Compteurs mémoire/latence par modèle.
+    🇩🇪 Speicher-/Latenzzähler pro Modell.
+    🇬🇧 Per-model memory and latency counters.
+    """
+    with _registry_lock:
+        report = {}
+        for name, stats in _stats.items():
+            entry = dict(stats)
+            entry["avg_seconds"] = round(stats["total_seconds"] / stats["calls"], 4) if stats["calls"] else None
+            entry["total_seconds"] = round(stats["total_seconds"], 4)
+            entry["max_seconds"] = round(stats["max_seconds"], 4)
+            report[name] = entry
+        return {"pid": os.getpid(), "rss_mb": round(_rss_mb(), 1), "models": report}
+
+
+def default_warmup() -> str:
+    return os.getenv("WARMUP_MODELS", "sentiment_" + os.getenv("SENTIMENT_BACKEND", "fp32"))
+
+
+def warm_up(names=None) -> None:
+    """
+    🇫🇷 Précharge les modèles (au démarrage d’un worker gunicorn par exemple).
+    🇩🇪 Lädt Modelle vorab (z.B. beim Start eines Gunicorn-Workers).
+    🇬🇧 Preloads models, e.g. when a gunicorn worker boots. Defaults to $WARMUP_MODELS
+        (or the sentiment backend selected by $SENTIMENT_BACKEND).
+    """
+    # 🧩 Enregistre les chargeurs sentiment_fp32 / _int8 / _onnx (import local : core.sentiment_backends importe ce module)
+    import core.sentiment_backends  # noqa: F401
+
+    if names is None:
+        names = [n.strip() for n in default_warmup().split(",") if n.strip()]
+    for name in names:
+        try:
+            get_model(name)
+        except Exception as e:
+            logging.error(f"[❌] Warm-up failed for '{name}': {e}")
+
+
+# 🔎 Chargeurs des modèles Hugging Face
+def _load_sentiment():
+    from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+    tokenizer = AutoTokenizer.from_pretrained(SENTIMENT_MODEL, token=HF_TOKEN)
+    model = AutoModelForSequenceClassification.from_pretrained(SENTIMENT_MODEL, token=HF_TOKEN)
+    model.eval()
+    return tokenizer, model
+
+
+def _load_generator():
+    from transformers import pipeline
+
+    return pipeline("text-generation", model=GENERATOR_MODEL)
+
+
+register("sentiment", _load_sentiment)
+register("generator", _load_generator)
+
+
+def get_sentiment_model():
+    """
+    🇬🇧 Returns the shared (tokenizer, model) pair of the distilroberta sentiment classifier.
+    """
+    return get_model("sentiment")
+
+
+def get_text_generator():
+    """
+    🇬🇧 Returns the shared GPT-2 text-generation pipeline (Otto).
+    """
+    return get_model("generator")
@@ -0,0 +1,130 @@
+# core/news_extractors.py
+"""
+🇫🇷 Extraction des titres d’actualités des pages Yahoo Finance, avec plusieurs analyseurs HTML interchangeables.
+🇩🇪 Extraktion der Nachrichtentitel aus Yahoo-Finance-Seiten, mit austauschbaren HTML-Parsern.
+🇬🇧 News headline extraction from Yahoo Finance pages with interchangeable HTML parsers.
+
+    Every extractor returns the first `h3 a` link of each `li.js-stream-content` item as
+    (title, href) pairs, in document order, at most `limit` of them:
+
+    - "bs4"    : BeautifulSoup tree of the whole page (the historical path, slowest);
+    - "lxml"   : lxml C parser + one XPath query over the whole tree;
+    - "stream" : lxml HTMLPullParser fed in chunks, stopping as soon as `limit` links are found,
+                 so the rest of the page (scripts, footer, …) is never parsed.
+
+    $NEWS_EXTRACTOR selects the default (stream); benchmarks/html_extractors.py compares them.
+"""
+
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+NEWS_EXTRACTOR = os.getenv("NEWS_EXTRACTOR", "stream")
+STREAM_CHUNK_SIZE = 16 * 1024
+
+ITEM_CLASS = "js-stream-content"
+_XPATH = (
+    f"//li[contains(concat(' ', normalize-space(@class), ' '), ' {ITEM_CLASS} ')]"
+    "[.//h3//a][position() <= $limit]"
+)
+
+
+def _has_item_class(value) -> bool:
+    return bool(value) and ITEM_CLASS in value.split()
+
+
+def extract_bs4(html: str, limit: int = None) -> list:
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    links = []
+    for item in soup.select(f"li.{ITEM_CLASS}"):
+        title_tag = item.select_one("h3 a")
+        if not title_tag:
+            continue
+        links.append((title_tag.text.strip(), title_tag.get("href", "")))
+        if limit is not None and len(links) >= limit:
+            break
+    return links
+
+
+def extract_lxml(html: str, limit: int = None) -> list:
+    import lxml.html
+
+    root = lxml.html.fromstring(html)
+    links = []
+    for item in root.xpath(_XPATH, limit=limit if limit is not None else 2 ** 31):
+        title_tag = item.xpath(".//h3//a")[0]
+        links.append((title_tag.text_content().strip(), title_tag.get("href", "")))
+    return links
+
+
+def extract_stream(html: str, limit: int = None) -> list:
+    """
+    🇫🇷 Analyse incrémentale : s’arrête dès que `limit` liens ont été trouvés.
+    🇩🇪 Inkrementelles Parsen: stoppt, sobald `limit` Links gefunden wurden.
+    🇬🇧 Incremental parse that stops feeding the parser once `limit` links were found.
+    """
+    from lxml import etree
+
+    parser = etree.HTMLPullParser(events=("start", "end"))
+
+    def events():
+        for offset in range(0, len(html), STREAM_CHUNK_SIZE):
+            parser.feed(html[offset:offset + STREAM_CHUNK_SIZE])
+            yield from parser.read_events()
+        try:
+            parser.close()
+        except etree.XMLSyntaxError:
+            return
+        yield from parser.read_events()
+
+    links = []
+    item = None      # <li class="js-stream-content"> en cours
+    h3_depth = 0     # nombre de <h3> ouverts dans cet item
+    link = None      # premier <a> sous un <h3> de cet item
+    taken = False
+
+    for event, element in events():
+        tag = element.tag if isinstance(element.tag, str) else ""
+        if event == "start":
+            if tag == "li" and item is None and _has_item_class(element.get("class")):
+                item, h3_depth, link, taken = element, 0, None, False
+            elif item is not None and tag == "h3":
+                h3_depth += 1
+            elif item is not None and tag == "a" and h3_depth and link is None and not taken:
+                link = element
+            continue
+
+        if element is link:
+            links.append(("".join(element.itertext()).strip(), element.get("href", "")))
+            link, taken = None, True
+            if limit is not None and len(links) >= limit:
+                return links
+        elif element is item:
+            item = None
+        elif item is not None and tag == "h3":
+            h3_depth -= 1
+    return links
+
+
+EXTRACTORS = {
+    "bs4": extract_bs4,
+    "lxml": extract_lxml,
+    "stream": extract_stream,
+}
+
+
+def extract_links(html: str, limit: int = None, extractor: str = None) -> list:
+    """
+    🇫🇷 Liens (titre, href) des actualités de la page avec l’extracteur choisi.
+    🇩🇪 Nachrichten-Links (Titel, href) der Seite mit dem gewählten Extraktor.
+    🇬🇧 (title, href) news links of the page with the selected extractor ($NEWS_EXTRACTOR by default).
+    """
+    name = extractor or NEWS_EXTRACTOR
+    if name not in EXTRACTORS:
+        raise ValueError(f"❌ Unknown news extractor '{name}' (available: {', '.join(EXTRACTORS)})")
+    if not html or not html.strip() or (limit is not None and limit <= 0):
+        return []
+    return EXTRACTORS[name](html, limit)
@@ -0,0 +1,162 @@
+# core/pipeline.py
+"""
+🇫🇷 Exécution en processus d’un graphe d’étapes (DAG) : ordre des dépendances, parallélisme, durées.
+🇩🇪 In-Process-Ausführung eines Stufengraphen (DAG): Abhängigkeitsreihenfolge, Parallelität, Dauer.
+🇬🇧 In-process DAG runner for the scraping / analysis pipeline.
+
+    Each stage starts as soon as all the stages it depends on have succeeded, on a pool of
+    $PIPELINE_WORKERS threads, so independent branches run in parallel. When a stage fails,
+    the stages that depend on it are skipped and the others carry on. Only one run of a
+    pipeline is in progress at a time: a run triggered while the previous one is still going
+    is skipped, not queued. Every run returns its per-stage status and duration.
+"""
+
+import os
+import time
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+
+from dotenv import load_dotenv
+
+load_dotenv()
+PIPELINE_WORKERS = int(os.getenv("PIPELINE_WORKERS", 4))
+
+OK, FAILED, SKIPPED = "ok", "failed", "skipped"
+
+
+class Stage:
+    """
+    🇬🇧 One pipeline step: `func()` runs after every stage named in `after` has succeeded.
+    """
+
+    def __init__(self, name: str, func, after=()):
+        self.name = name
+        self.func = func
+        self.after = tuple(after)
+
+
+class Pipeline:
+    """
+    🇬🇧 Validated DAG of stages with an overlap guard and run statistics.
+    """
+
+    def __init__(self, name: str, stages: list, workers: int = PIPELINE_WORKERS):
+        self.name = name
+        self.stages = {stage.name: stage for stage in stages}
+        self.workers = workers
+        self._running = threading.Lock()
+        self._stats = {"runs": 0, "failed_runs": 0, "skipped_runs": 0, "last_run": None}
+        for stage in stages:
+            unknown = [dep for dep in stage.after if dep not in self.stages]
+            if unknown:
+                raise ValueError(f"❌ Stage '{stage.name}' depends on unknown stage(s) {unknown}")
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> list:
+        order, state = [], {}
+
+        def visit(name, path):
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise ValueError(f"❌ Dependency cycle: {' → '.join(path + [name])}")
+            state[name] = "visiting"
+            for dep in self.stages[name].after:
+                visit(dep, path + [name])
+            state[name] = "done"
+            order.append(name)
+
+        for name in self.stages:
+            visit(name, [])
+        return order
+
+    def select(self, targets=None) -> list:
+        """
+        🇬🇧 Stages needed to produce `targets` (all stages when None), in dependency order.
+        """
+        if not targets:
+            return list(self.order)
+        unknown = [t for t in targets if t not in self.stages]
+        if unknown:
+            raise ValueError(f"❌ Unknown stage(s) {unknown} (expected {', '.join(self.order)})")
+        needed, todo = set(), list(targets)
+        while todo:
+            name = todo.pop()
+            if name not in needed:
+                needed.add(name)
+                todo.extend(self.stages[name].after)
+        return [name for name in self.order if name in needed]
+
+    def is_running(self) -> bool:
+        return self._running.locked()
+
+    def run(self, targets=None):
+        """
+        🇫🇷 Exécute les étapes (ou seulement `targets` et leurs dépendances) ; None si un run est déjà en cours.
+        🇩🇪 Führt die Stufen aus (oder nur `targets` samt Abhängigkeiten); None, falls bereits ein Lauf aktiv ist.
+        🇬🇧 Runs every stage (or only `targets` and what they depend on). Returns the run record
+            {"pipeline", "status", "started_at", "seconds", "stages": {name: {"status", "seconds",
+            "error"}}}, or None when the previous run is still in progress.
+        """
+        names = self.select(targets)
+        if not self._running.acquire(blocking=False):
+            self._stats["skipped_runs"] += 1
+            print(f"[⏭️] Pipeline '{self.name}' déjà en cours, exécution ignorée.")
+            return None
+        try:
+            record = self._execute(names)
+        finally:
+            self._running.release()
+
+        self._stats["runs"] += 1
+        self._stats["failed_runs"] += record["status"] != OK
+        self._stats["last_run"] = record
+        return record
+
+    def _execute(self, names: list) -> dict:
+        started_at = datetime.now(timezone.utc)
+        start = time.perf_counter()
+        results, pending, running = {}, list(names), {}
+
+        def timed(stage):
+            began = time.perf_counter()
+            stage.func()
+            return time.perf_counter() - began
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=f"pipeline-{self.name}") as pool:
+            while pending or running:
+                for name in list(pending):
+                    deps = [results.get(dep, {}).get("status") for dep in self.stages[name].after if dep in names]
+                    if any(status in (FAILED, SKIPPED) for status in deps):
+                        pending.remove(name)
+                        results[name] = {"status": SKIPPED, "seconds": 0.0, "error": "dependency failed"}
+                    elif all(status == OK for status in deps):
+                        pending.remove(name)
+                        print(f"[▶️] {self.name}/{name}…")
+                        running[pool.submit(timed, self.stages[name])] = (name, time.perf_counter())
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, began = running.pop(future)
+                    try:
+                        results[name] = {"status": OK, "seconds": round(future.result(), 3), "error": None}
+                        print(f"[✅] {self.name}/{name} : {results[name]['seconds']:.1f}s")
+                    except Exception as e:
+                        results[name] = {"status": FAILED, "seconds": round(time.perf_counter() - began, 3),
+                                         "error": f"{type(e).__name__}: {e}"}
+                        print(f"[❌] {self.name}/{name} : {results[name]['error']}")
+
+        return {
+            "pipeline": self.name,
+            "status": OK if all(r["status"] == OK for r in results.values()) else FAILED,
+            "started_at": started_at,
+            "seconds": round(time.perf_counter() - start, 3),
+            "stages": {name: results[name] for name in names},
+        }
+
+    def get_stats(self) -> dict:
+        stats = dict(self._stats)
+        stats["running"] = self.is_running()
+        return stats
@@ -0,0 +1,136 @@
+# core/portfolio_ingest.py
+"""
+🇫🇷 Lecture en flux des portefeuilles importés (CSV / Excel) : colonnes utiles seulement, agrégation par paquets.
+🇩🇪 Streaming-Einlesen hochgeladener Portfolios (CSV / Excel): nur benötigte Spalten, paketweise Aggregation.
+🇬🇧 Streaming ingestion of uploaded portfolios.
+
+    Only the Symbol and Quantity columns are read, with explicit dtypes, $UPLOAD_CHUNK_ROWS rows
+    at a time (pandas chunked read_csv, openpyxl read-only mode for .xlsx), and each chunk is
+    folded into a running {symbol: quantity} total. Peak memory therefore depends on the chunk
+    size and the number of distinct symbols, not on the file size. Files above $UPLOAD_MAX_ROWS
+    rows or $UPLOAD_MAX_SYMBOLS symbols are rejected. Legacy .xls workbooks cannot be streamed:
+    they are still read whole by pandas.read_excel (xlrd engine), then aggregated the same way.
+"""
+
+import os
+import time
+from itertools import islice
+
+from dotenv import load_dotenv
+
+load_dotenv()
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", 50 * 1024 * 1024))
+UPLOAD_MAX_ROWS = int(os.getenv("UPLOAD_MAX_ROWS", 2_000_000))
+UPLOAD_MAX_SYMBOLS = int(os.getenv("UPLOAD_MAX_SYMBOLS", 20_000))
+UPLOAD_CHUNK_ROWS = int(os.getenv("UPLOAD_CHUNK_ROWS", 100_000))
+COLUMNS = ("Symbol", "Quantity")
+CSV_EXTENSIONS = {".csv", ".txt"}
+EXCEL_EXTENSIONS = {".xlsx", ".xlsm"}
+LEGACY_EXCEL_EXTENSIONS = {".xls"}
+
+
+class UploadLimitError(ValueError):
+    """
+    🇬🇧 Raised when an upload exceeds $UPLOAD_MAX_ROWS rows or $UPLOAD_MAX_SYMBOLS symbols.
+    """
+
+
+def _frame_chunks(frames):
+    import pandas as pd
+
+    for chunk in frames:
+        quantity = pd.to_numeric(chunk["Quantity"], errors="coerce").fillna(0).to_numpy(dtype="float64")
+        # 🧮 Pré-agrégation vectorisée du paquet avant le cumul Python
+        grouped = pd.Series(quantity, index=chunk["Symbol"].to_numpy(dtype=object)).groupby(level=0).sum()
+        yield len(chunk), grouped.index.tolist(), grouped.tolist()
+
+
+def _csv_chunks(stream, chunk_rows: int):
+    import pandas as pd
+
+    reader = pd.read_csv(stream, usecols=list(COLUMNS), dtype={"Symbol": "string", "Quantity": "string"},
+                         chunksize=chunk_rows)
+    return _frame_chunks(reader)
+
+
+def _legacy_excel_chunks(stream, chunk_rows: int):
+    import pandas as pd
+
+    # 🗃️ .xls (BIFF) : pas de lecture en flux possible, feuille lue en entier comme avant
+    frame = pd.read_excel(stream, usecols=list(COLUMNS), dtype={"Symbol": "string", "Quantity": "string"})
+    return _frame_chunks(frame.iloc[start:start + chunk_rows] for start in range(0, len(frame), chunk_rows))
+
+
+def _number(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _excel_chunks(stream, chunk_rows: int):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(stream, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(value).strip() if value is not None else "" for value in next(rows, ())]
+        missing = [column for column in COLUMNS if column not in header]
+        if missing:
+            raise ValueError(f"Usecols do not match columns, columns expected but not found: {missing}")
+        symbol_at, quantity_at = header.index("Symbol"), header.index("Quantity")
+        while True:
+            chunk = list(islice(rows, chunk_rows))
+            if not chunk:
+                return
+            # 📏 Lignes courtes (cellules vides en fin de ligne) : valeur absente
+            symbols = [str(row[symbol_at]) if len(row) > symbol_at and row[symbol_at] is not None else None
+                       for row in chunk]
+            yield len(chunk), symbols, [_number(row[quantity_at]) if len(row) > quantity_at else 0.0 for row in chunk]
+    finally:
+        workbook.close()
+
+
+def aggregate(stream, filename: str, chunk_rows: int = UPLOAD_CHUNK_ROWS,
+              max_rows: int = UPLOAD_MAX_ROWS, max_symbols: int = UPLOAD_MAX_SYMBOLS) -> dict:
+    """
+    🇫🇷 Quantités totales par symbole d’un fichier CSV / Excel, lu par paquets de `chunk_rows` lignes.
+    🇩🇪 Gesamtmengen pro Symbol einer CSV-/Excel-Datei, in Paketen von `chunk_rows` Zeilen gelesen.
+    🇬🇧 Total quantity per symbol of a CSV, .xlsx or .xls upload, read `chunk_rows` rows at a time.
+        Returns {"summary": {symbol: quantity}, "rows", "seconds", "rows_per_second"}.
+    """
+    ext = os.path.splitext(filename)[1].lower()
+    if ext in CSV_EXTENSIONS:
+        chunks = _csv_chunks(stream, chunk_rows)
+    elif ext in EXCEL_EXTENSIONS:
+        chunks = _excel_chunks(stream, chunk_rows)
+    elif ext in LEGACY_EXCEL_EXTENSIONS:
+        chunks = _legacy_excel_chunks(stream, chunk_rows)
+    else:
+        raise ValueError(f"❌ Unsupported file type '{ext}' (expected .csv, .xlsx or .xls)")
+
+    start = time.perf_counter()
+    totals, rows = {}, 0
+    for count, symbols, quantities in chunks:
+        rows += count
+        if rows > max_rows:
+            raise UploadLimitError(f"❌ Fichier trop volumineux : plus de {max_rows} lignes.")
+        for symbol, quantity in zip(symbols, quantities):
+            if symbol is None or symbol != symbol:   # cellule vide / NaN
+                continue
+            totals[symbol] = totals.get(symbol, 0.0) + quantity
+        if len(totals) > max_symbols:
+            raise UploadLimitError(f"❌ Trop de symboles distincts : plus de {max_symbols}.")
+    seconds = time.perf_counter() - start
+
+    summary = {symbol: _as_number(quantity) for symbol, quantity in sorted(totals.items())}
+    return {
+        "summary": summary,
+        "rows": rows,
+        "seconds": round(seconds, 4),
+        "rows_per_second": round(rows / seconds) if seconds > 0 else None,
+    }
+
+
+def _as_number(value: float):
+    return int(value) if float(value).is_integer() else value
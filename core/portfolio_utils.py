@@ -1,12 +1,7 @@
 # core/portfolio_utils.py
 
-import pandas as pd
-import os
-from dotenv import load_dotenv
-from pymongo import MongoClient
-
-load_dotenv()
-MONGO_URI = os.getenv("MONGO_URI")
+from core.database import load_gainers_performance
+from core.risk_engine import effective_volatility, portfolio_risk
 
 
 def load_cleaned_data():
@@ -15,38 +10,22 @@ def load_cleaned_data():
     🇩🇪 Lädt die bereinigten Daten aus MongoDB.
     🇬🇧 Loads cleaned data from MongoDB.
     """
-    print("[INFO] Chargement des données MongoDB nettoyées…")
-    client = MongoClient(MONGO_URI)
-    db = client["gainers_db"]
-    collection = db["yahoo_gainers"]
-
-    try:
-        pipeline = [
-            {"$match": {"change": {"$ne": None}}},
-            {"$project": {
-                "_id": 1,
-                "price": "$price",
-                "volume": "$volume",
-                "market_cap": "$market_cap",
-                "performance": "$change"
-            }}
-        ]
+    import pandas as pd
 
-        data = list(collection.aggregate(pipeline))
-        df = pd.DataFrame(data)
-
-        print(f"[✅] {len(df)} documents chargés depuis MongoDB.")
-        if not df.empty:
-            print("[✅] Exemple de données chargées :")
-            print(df.head(10))
+    print("[INFO] Chargement des données MongoDB nettoyées…")
+    # ♻️ Client partagé du processus (core.database) : plus de connexion/fermeture à chaque appel
+    data = load_gainers_performance()
+    df = pd.DataFrame(data)
 
-        return df
+    print(f"[✅] {len(df)} documents chargés depuis MongoDB.")
+    if not df.empty:
+        print("[✅] Exemple de données chargées :")
+        print(df.head(10))
 
-    finally:
-        client.close()  # ✅ Ferme proprement
+    return df
 
 
-def compute_sharpe_ratio(portfolio: dict, stock_data: dict, volatility: float = 0.2, risk_free_rate: float = 0.01) -> float:
+def compute_sharpe_ratio(portfolio: dict, stock_data: dict, volatility: float = None, risk_free_rate: float = 0.01) -> float:
     """
     🇫🇷 Calcule le Sharpe Ratio moyen à partir des performances des actions du portefeuille.
     🇩🇪 Berechnet das durchschnittliche Sharpe-Verhältnis basierend auf der Aktienperformance im Portfolio.
@@ -54,7 +33,8 @@ def compute_sharpe_ratio(portfolio: dict, stock_data: dict, volatility: float =
 
     :param portfolio: dict comme {'AAPL': 10, 'TSLA': 5}
     :param stock_data: dict comme {'AAPL': {'performance': 0.05}, ...}
-    :param volatility: volatilité fixée (ex: 0.2)
+    :param volatility: volatilité fixée (ex: 0.2) ; par défaut volatilité du portefeuille (core.risk_engine),
+                       DEFAULT_VOLATILITY si elle est nulle
     :param risk_free_rate: taux sans risque (ex: 0.01)
     :return: Sharpe Ratio du portefeuille
     """
@@ -69,5 +49,9 @@ def compute_sharpe_ratio(portfolio: dict, stock_data: dict, volatility: float =
         return 0.0
 
     avg_return = sum(returns) / len(returns)
+    if volatility is None:
+        volatility = portfolio_risk(portfolio, risk_free_rate)["volatility"]
+    # 📉 Historique plat / une seule barre : volatilité nulle → DEFAULT_VOLATILITY (core.risk_engine)
+    volatility, _ = effective_volatility(volatility)
     sharpe_ratio = (avg_return - risk_free_rate) / volatility
     return round(sharpe_ratio, 2)
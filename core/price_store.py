@@ -0,0 +1,272 @@
+# core/price_store.py
+"""
+🇫🇷 Historique local des prix : fichiers colonnes binaires par symbole, en ajout seul, lus par memory-map.
+🇩🇪 Lokale Preishistorie: binäre Spaltendateien pro Symbol, nur anhängend, per Memory-Map gelesen.
+🇬🇧 Local price-history store.
+
+    Layout: $PRICE_STORE_DIR/<SYMBOL>/{ts.i8, close.f8, volume.f8}: one raw little-endian column
+    per file (epoch seconds, close, volume), append-only and sorted by time. Readers map the files
+    with np.memmap, so loading a symbol costs no parsing and no copy.
+
+    Writers append the value columns before the timestamp column; a reader only uses the rows
+    present in every column, so a crash mid-append never exposes a partial bar. Bars older than
+    the last stored one (a backfill after the scrapers already appended today's quote) are merged
+    instead: the symbol's columns are rewritten, sorted and de-duplicated, into a new version
+    directory <SYMBOL>/v<ns>/, and the <SYMBOL>/current symlink is switched to it with one
+    os.replace. Readers open the directory `current` points to once and map every column relative
+    to it, so they see either the previous or the new version, never a mix or a missing symbol.
+    The previous version is kept until the next merge. After each batch, writers bump
+    $PRICE_STORE_DIR/VERSION so readers (core.risk_engine) know when to reload.
+    There is a single writer at a time (the scrapers / backfill_prices.py).
+"""
+
+import os
+import time
+import shutil
+import threading
+
+import numpy as np
+from dotenv import load_dotenv
+
+load_dotenv()
+PRICE_STORE_DIR = os.getenv("PRICE_STORE_DIR", "data/prices")
+DAY_SECONDS = 86400
+
+COLUMNS = {"ts": np.dtype("<i8"), "close": np.dtype("<f8"), "volume": np.dtype("<f8")}
+# ✍️ Ordre d’écriture : les valeurs d’abord, l’horodatage en dernier
+_WRITE_ORDER = ("close", "volume", "ts")
+_FILES = {name: f"{name}.{dtype.kind}{dtype.itemsize}" for name, dtype in COLUMNS.items()}
+CURRENT = "current"
+
+_write_lock = threading.Lock()
+
+
+def _symbol_dir(symbol: str, root: str = None) -> str:
+    name = symbol.strip().upper()
+    if not name or name in (".", "..") or "/" in name or "\\" in name or "\x00" in name:
+        raise ValueError(f"❌ Invalid symbol '{symbol}'")
+    return os.path.join(root or PRICE_STORE_DIR, name)
+
+
+def _data_dir(directory: str) -> str:
+    """
+    🇬🇧 Directory holding the columns: the version `current` points to once the symbol was
+        merged, the symbol directory itself before that.
+    """
+    current = os.path.join(directory, CURRENT)
+    return current if os.path.islink(current) else directory
+
+
+def _map(name: str, dtype: np.dtype, dir_fd: int):
+    try:
+        fd = os.open(name, os.O_RDONLY, dir_fd=dir_fd)
+    except FileNotFoundError:
+        return None
+    with os.fdopen(fd, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < dtype.itemsize:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(f, dtype=dtype, mode="r", shape=(size // dtype.itemsize,))
+
+
+def read_bars(symbol: str, root: str = None) -> dict:
+    """
+    🇫🇷 Colonnes {ts, close, volume} d’un symbole (vues memory-map en lecture seule).
+    🇩🇪 Spalten {ts, close, volume} eines Symbols (schreibgeschützte Memory-Map-Ansichten).
+    🇬🇧 Read-only memory-mapped {ts, close, volume} columns of a symbol, cut to the rows present
+        in every column. All columns are opened relative to one directory handle, so a merge
+        switching `current` meanwhile cannot mix two versions; if that version was pruned by a
+        later merge before all its columns were opened, the read starts again on `current`.
+    """
+    directory = _symbol_dir(symbol, root)
+    for _ in range(3):
+        try:
+            dir_fd = os.open(_data_dir(directory), os.O_RDONLY)
+        except FileNotFoundError:
+            break
+        try:
+            columns = {name: _map(_FILES[name], dtype, dir_fd) for name, dtype in COLUMNS.items()}
+            # 🧹 Une fois fusionné, chaque version a toutes ses colonnes : une colonne absente = version élaguée
+            pruned = os.fstat(dir_fd).st_nlink == 0 or (
+                any(column is None for column in columns.values()) and os.path.islink(os.path.join(directory, CURRENT)))
+        finally:
+            os.close(dir_fd)
+        if not pruned:
+            columns = {name: np.empty(0, dtype=COLUMNS[name]) if column is None else column
+                       for name, column in columns.items()}
+            rows = min(len(column) for column in columns.values())
+            return {name: column[:rows] for name, column in columns.items()}
+    return {name: np.empty(0, dtype=dtype) for name, dtype in COLUMNS.items()}
+
+
+def last_timestamp(symbol: str, root: str = None):
+    ts = read_bars(symbol, root)["ts"]
+    return int(ts[-1]) if len(ts) else None
+
+
+def _column_path(directory: str, name: str) -> str:
+    return os.path.join(directory, _FILES[name])
+
+
+def _merge(directory: str, stored: dict, values: dict) -> int:
+    """
+    🇬🇧 Writes the union of the stored bars and `values` (stored bars win on equal timestamps) to
+        a new version directory and points `current` at it atomically. Returns the bars added.
+    """
+    new = ~np.isin(values["ts"], stored["ts"])
+    if not new.any():
+        return 0
+    merged = {name: np.concatenate((np.asarray(stored[name]), values[name][new])) for name in COLUMNS}
+    order = np.argsort(merged["ts"], kind="stable")
+
+    version = f"v{time.time_ns()}"
+    os.makedirs(os.path.join(directory, version))
+    for column in _WRITE_ORDER:
+        with open(_column_path(os.path.join(directory, version), column), "wb") as f:
+            f.write(merged[column][order].astype(COLUMNS[column]).tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+
+    current, link = os.path.join(directory, CURRENT), os.path.join(directory, f".{CURRENT}.tmp")
+    previous = os.readlink(current) if os.path.islink(current) else None
+    if os.path.lexists(link):
+        os.remove(link)
+    os.symlink(version, link)
+    # 🔀 Bascule atomique du pointeur : le répertoire du symbole ne disparaît jamais
+    os.replace(link, current)
+
+    # 🧹 On garde la version précédente (colonnes à la racine avant la première fusion) pour les lecteurs en cours
+    keep = {CURRENT, version, previous} if previous else {CURRENT, version, *_FILES.values()}
+    for entry in os.listdir(directory):
+        if entry not in keep:
+            path = os.path.join(directory, entry)
+            shutil.rmtree(path) if os.path.isdir(path) and not os.path.islink(path) else os.remove(path)
+    return int(new.sum())
+
+
+def append_bars(symbol: str, ts, close, volume=None, root: str = None) -> int:
+    """
+    🇫🇷 Ajoute des barres (fusionnées si plus anciennes que la dernière, doublons ignorés) ; retourne le nombre ajouté.
+    🇩🇪 Fügt Bars hinzu (zusammengeführt, wenn älter als die letzte; Duplikate übersprungen); gibt die Anzahl zurück.
+    🇬🇧 Adds bars and returns how many were written. Bars newer than the last stored one are
+        appended; older ones are merged in (see _merge). Timestamps already stored are skipped,
+        so re-running a backfill is a no-op.
+    """
+    ts = np.asarray(ts, dtype=np.int64).ravel()
+    close = np.asarray(close, dtype=np.float64).ravel()
+    volume = np.full(ts.shape, np.nan) if volume is None else np.asarray(volume, dtype=np.float64).ravel()
+    if not (len(ts) == len(close) == len(volume)):
+        raise ValueError("❌ ts, close and volume must have the same length")
+
+    order = np.argsort(ts, kind="stable")
+    ts, close, volume = ts[order], close[order], volume[order]
+    keep = np.isfinite(close)
+    if len(ts):
+        keep &= np.concatenate(([True], np.diff(ts) > 0))
+    if not keep.any():
+        return 0
+    values = {"ts": ts[keep], "close": close[keep], "volume": volume[keep]}
+
+    directory = _symbol_dir(symbol, root)
+    with _write_lock:
+        os.makedirs(directory, exist_ok=True)
+        stored = read_bars(symbol, root)
+        rows = len(stored["ts"])
+        if rows and values["ts"][0] <= stored["ts"][-1]:
+            return _merge(directory, stored, values)
+        data_dir = _data_dir(directory)
+        for name in _WRITE_ORDER:
+            dtype = COLUMNS[name]
+            path = _column_path(data_dir, name)
+            with open(path, "r+b" if os.path.exists(path) else "wb") as f:
+                # ✂️ Tronque une éventuelle ligne partielle laissée par un crash
+                f.truncate(rows * dtype.itemsize)
+                f.seek(rows * dtype.itemsize)
+                f.write(values[name].astype(dtype).tobytes())
+    return len(values["ts"])
+
+
+def append_quotes(docs: list, ts: int = None, root: str = None) -> int:
+    """
+    🇬🇧 Appends one bar per scraped quote document ({_id, price, volume}) at time `ts`.
+    """
+    ts = int(ts if ts is not None else time.time())
+    written = 0
+    for doc in docs:
+        if doc.get("price") is None:
+            continue
+        try:
+            written += append_bars(doc["_id"], [ts], [doc["price"]], [doc.get("volume") or np.nan], root=root)
+        except ValueError as e:
+            print(f"[⚠️] Historique non enregistré pour {doc.get('_id')} : {e}")
+    bump_version(root)
+    return written
+
+
+def list_symbols(root: str = None) -> list:
+    root = root or PRICE_STORE_DIR
+    if not os.path.isdir(root):
+        return []
+    return sorted(name for name in os.listdir(root)
+                  if not name.startswith(".") and os.path.isdir(os.path.join(root, name)))
+
+
+def bump_version(root: str = None) -> None:
+    root = root or PRICE_STORE_DIR
+    os.makedirs(root, exist_ok=True)
+    with open(os.path.join(root, "VERSION"), "w") as f:
+        f.write(str(time.time_ns()))
+
+
+def get_version(root: str = None):
+    """
+    🇬🇧 Version stamp of the store (None when it was never written).
+    """
+    try:
+        with open(os.path.join(root or PRICE_STORE_DIR, "VERSION")) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def daily_closes(symbol: str, root: str = None):
+    """
+    🇫🇷 Dernier prix de chaque jour (les barres intraday des scrapers sont regroupées par jour UTC).
+    🇩🇪 Letzter Preis jedes Tages (Intraday-Bars der Scraper werden pro UTC-Tag zusammengefasst).
+    🇬🇧 Last close of each UTC day: (days since epoch, closes).
+    """
+    bars = read_bars(symbol, root)
+    if not len(bars["ts"]):
+        return np.empty(0, dtype=np.int64), np.empty(0)
+    days = bars["ts"] // DAY_SECONDS
+    last_of_day = np.flatnonzero(np.append(np.diff(days) != 0, True))
+    return np.asarray(days[last_of_day]), np.asarray(bars["close"][last_of_day])
+
+
+def return_matrix(symbols: list, days: int = 252, root: str = None):
+    """
+    🇫🇷 Matrice des rendements journaliers (jours x symboles) alignée sur un calendrier commun, NaN si absent.
+    🇩🇪 Matrix der Tagesrenditen (Tage x Symbole) auf einem gemeinsamen Kalender, NaN wenn fehlend.
+    🇬🇧 Daily simple returns (T x N) over the last `days` trading days, aligned on the union of
+        the symbols' dates. A day without a close carries the previous close forward; returns
+        are NaN before a symbol's first close.
+        Returns (dates as datetime64[D], returns).
+    """
+    series = [daily_closes(symbol, root) for symbol in symbols]
+    all_days = [d for d, _ in series if len(d)]
+    if not all_days:
+        return np.empty(0, dtype="datetime64[D]"), np.empty((0, len(symbols)))
+    grid = np.unique(np.concatenate(all_days))[-(days + 1):]
+
+    closes = np.full((len(grid), len(symbols)), np.nan)
+    for j, (d, c) in enumerate(series):
+        inside = d >= grid[0]
+        closes[np.searchsorted(grid, d[inside]), j] = c[inside]
+    # ⏩ Jours sans cotation : dernier prix connu (report en avant, vectorisé)
+    last_seen = np.where(~np.isnan(closes), np.arange(len(grid))[:, None], 0)
+    np.maximum.accumulate(last_seen, axis=0, out=last_seen)
+    closes = closes[last_seen, np.arange(len(symbols))]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = closes[1:] / closes[:-1] - 1
+    returns[~np.isfinite(returns)] = np.nan
+    return grid[1:].astype("datetime64[D]"), returns
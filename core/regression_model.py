@@ -1,10 +1,139 @@
 # core/regression_model.py
+"""
+🇫🇷 Régression linéaire performance ~ prix + sentiment, entraînée par statistiques suffisantes et persistée sur disque.
+🇩🇪 Lineare Regression Performance ~ Preis + Sentiment, über suffiziente Statistiken trainiert und auf Platte gespeichert.
+🇬🇧 Linear regression performance ~ price + avg_sentiment.
+
+    The target is a performance in percent (the unit simulate_performance.py writes). The
+    avg_sentiment feature is per row: the market sentiment average in force when the row was
+    observed, so it varies across the folded batches. Within one batch it is constant and the
+    centred solve gives it a zero coefficient instead of splitting the intercept with it.
+
+    The model only keeps the sufficient statistics of ordinary least squares (n, Σx, Σxxᵀ, Σy,
+    Σxy), so a new scraped batch is folded in with one matrix product instead of a refit over the
+    whole collection. The statistics are saved to $REGRESSION_MODEL_PATH (.npz) together with a
+    fingerprint of the data they were fitted on; processes reload the artifact when its file
+    changes, and a full retrain on unchanged data is skipped.
+"""
 
-from pymongo import MongoClient
-from sklearn.linear_model import LinearRegression
-import numpy as np
 import os
+import hashlib
 import logging
+import threading
+
+import numpy as np
+from dotenv import load_dotenv
+
+from core.database import find_stocks_with_performance, get_avg_sentiment_score, load_gainers_performance
+
+load_dotenv()
+REGRESSION_MODEL_PATH = os.getenv("REGRESSION_MODEL_PATH", "models/regression_model.npz")
+FEATURES = ("price", "avg_sentiment")
+TARGET = "performance_pct"
+
+_model = None
+_model_mtime = None
+_lock = threading.Lock()
+
+
+class RegressionModel:
+    """
+    🇬🇧 Ordinary least squares held as sufficient statistics; `partial_fit` adds observations.
+    """
+
+    def __init__(self, n_features: int = len(FEATURES)):
+        self.n = 0
+        self.x_sum = np.zeros(n_features)
+        self.xx_sum = np.zeros((n_features, n_features))
+        self.y_sum = 0.0
+        self.xy_sum = np.zeros(n_features)
+        self.fingerprint = ""
+        self.last_batch = ""
+        self._coef = None
+
+    def partial_fit(self, X: np.ndarray, y: np.ndarray) -> "RegressionModel":
+        X = np.asarray(X, dtype=np.float64).reshape(len(y), -1)
+        y = np.asarray(y, dtype=np.float64)
+        self.n += len(y)
+        self.x_sum += X.sum(axis=0)
+        self.xx_sum += X.T @ X
+        self.y_sum += y.sum()
+        self.xy_sum += X.T @ y
+        self._coef = None
+        return self
+
+    def _solve(self):
+        # 🧮 Équations normales centrées : même solution (norme minimale) que sklearn LinearRegression
+        x_mean = self.x_sum / self.n
+        y_mean = self.y_sum / self.n
+        cov_xx = self.xx_sum / self.n - np.outer(x_mean, x_mean)
+        cov_xy = self.xy_sum / self.n - x_mean * y_mean
+        coef = np.linalg.lstsq(cov_xx, cov_xy, rcond=1e-10)[0]
+        return coef, y_mean - x_mean @ coef
+
+    @property
+    def coef_(self) -> np.ndarray:
+        if self._coef is None:
+            self._coef = self._solve()
+        return self._coef[0]
+
+    @property
+    def intercept_(self) -> float:
+        self.coef_
+        return float(self._coef[1])
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        if not self.n:
+            raise ValueError("❌ Le modèle de régression n’a pas encore été entraîné.")
+        return np.asarray(X, dtype=np.float64) @ self.coef_ + self.intercept_
+
+    def save(self, path: str = None) -> str:
+        """
+        🇬🇧 Writes the statistics atomically (temp file + rename) so readers never see a partial file.
+        """
+        path = path or REGRESSION_MODEL_PATH
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            np.savez(f, features=np.array(FEATURES), target=TARGET, n=self.n, x_sum=self.x_sum, xx_sum=self.xx_sum,
+                     y_sum=self.y_sum, xy_sum=self.xy_sum, fingerprint=self.fingerprint, last_batch=self.last_batch)
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def load(cls, path: str = None):
+        """
+        🇬🇧 Reads an artifact written by `save`; returns None if it is missing or has other features
+            or another target unit.
+        """
+        path = path or REGRESSION_MODEL_PATH
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            if tuple(data["features"]) != FEATURES:
+                logging.warning(f"⚠️ {path} ignoré : variables {tuple(data['features'])} ≠ {FEATURES}.")
+                return None
+            target = str(data["target"]) if "target" in data.files else None
+            if target != TARGET:
+                logging.warning(f"⚠️ {path} ignoré : cible {target} ≠ {TARGET}.")
+                return None
+            model = cls()
+            model.n = int(data["n"])
+            model.x_sum, model.xx_sum = data["x_sum"], data["xx_sum"]
+            model.y_sum, model.xy_sum = float(data["y_sum"]), data["xy_sum"]
+            model.fingerprint = str(data["fingerprint"])
+            model.last_batch = str(data["last_batch"])
+        return model
+
+
+def fingerprint(X: np.ndarray, y: np.ndarray) -> str:
+    """
+    🇬🇧 Hash of the training matrix, used as the data version of a fitted model.
+    """
+    digest = hashlib.sha1(np.ascontiguousarray(X, dtype=np.float64).tobytes())
+    digest.update(np.ascontiguousarray(y, dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
 
 # 🇫🇷 Connexion à MongoDB pour charger les données financières nettoyées
 def load_cleaned_data():
@@ -12,70 +141,211 @@ def load_cleaned_data():
     if not mongo_uri:
         raise ValueError("❌ MONGO_URI not set in environment variables")
 
-    client = MongoClient(mongo_uri)
-    db = client["gainers_db"]
-    collection = db["yahoo_all_stocks"]  # ✅ On utilise désormais la collection enrichie
-
-    documents = list(collection.find({
-        "price": {"$exists": True},
-        "performance": {"$exists": True}
-    }))
+    documents = find_stocks_with_performance()  # ✅ On utilise désormais la collection enrichie
 
     logging.info(f"✅ {len(documents)} documents loaded from MongoDB.")
-    client.close()
     return documents
 
 # 🇫🇷 Chargement du score de sentiment moyen stocké dans MongoDB
 def load_avg_sentiment_score():
-    mongo_uri = os.getenv("MONGO_URI")
-    client = MongoClient(mongo_uri)
-    db = client["gainers_db"]
-    collection = db["avg_sentiment"]
+    score = get_avg_sentiment_score()
 
-    doc = collection.find_one()
-    client.close()
-
-    if doc and "avg_sentiment_score" in doc:
-        return doc["avg_sentiment_score"]
+    if score is not None:
+        return score
     else:
         logging.warning("⚠️ avg_sentiment_score not found in MongoDB. Using 0.0 as fallback.")
         return 0.0
 
-# 🇫🇷 Entraîne un modèle de régression linéaire sur les données + sentiment
-def train_regression_model():
-    data = load_cleaned_data()
-    avg_sentiment_score = load_avg_sentiment_score()
-
-    X = []
-    y = []
 
-    for doc in data:
+def build_features(docs: list, avg_sentiment_score: float):
+    """
+    🇫🇷 Matrice des variables [prix, sentiment] et vecteur cible des performances ; lignes invalides écartées.
+    🇩🇪 Merkmalsmatrix [Preis, Sentiment] und Zielvektor der Performance; ungültige Zeilen werden verworfen.
+    🇬🇧 Feature matrix [price, avg_sentiment] and performance target; non-numeric rows are dropped.
+        A document's own avg_sentiment (sentiment when it was observed) is used when present,
+        `avg_sentiment_score` otherwise.
+    """
+    def number(value):
         try:
-            price = float(doc["price"])
-            sentiment = float(avg_sentiment_score)
-            X.append([price, sentiment])
-            y.append(float(doc["performance"]))
-        except Exception as e:
-            logging.error(f"Erreur en traitant le document {doc}: {e}")
-
-    if not X or not y:
+            return float(value)
+        except (TypeError, ValueError):
+            return np.nan
+
+    price = np.fromiter((number(doc.get("price")) for doc in docs), dtype=np.float64, count=len(docs))
+    y = np.fromiter((number(doc.get("performance")) for doc in docs), dtype=np.float64, count=len(docs))
+    sentiment = np.fromiter((number(doc.get("avg_sentiment", avg_sentiment_score)) for doc in docs),
+                            dtype=np.float64, count=len(docs))
+    valid = np.isfinite(price) & np.isfinite(y) & np.isfinite(sentiment)
+    if not valid.all():
+        logging.error(f"Erreur : {int((~valid).sum())} documents sans prix/performance numériques ignorés.")
+    X = np.column_stack([price[valid], sentiment[valid]])
+    return X, y[valid]
+
+
+def percent_performance(docs: list) -> list:
+    """
+    🇫🇷 Documents yahoo_gainers convertis en {price, performance} avec la variation du jour en pourcentage.
+    🇩🇪 yahoo_gainers-Dokumente als {price, performance} mit der Tagesveränderung in Prozent.
+    🇬🇧 yahoo_gainers documents as {price, performance} rows whose performance is the day's change
+        in percent, the training unit: percent_change, else change / (price - change) · 100.
+    """
+    rows = []
+    for doc in docs:
+        performance = doc.get("percent_change")
+        if performance is None:
+            try:
+                performance = doc["performance"] / (doc["price"] - doc["performance"]) * 100
+            except (KeyError, TypeError, ZeroDivisionError):
+                performance = None
+        rows.append({"price": doc.get("price"), "performance": performance})
+    return rows
+
+
+def _publish(model: RegressionModel, path: str = None) -> None:
+    global _model, _model_mtime
+    path = model.save(path)
+    if path == REGRESSION_MODEL_PATH:
+        with _lock:
+            _model, _model_mtime = model, os.stat(path).st_mtime_ns
+
+
+# 🇫🇷 Entraîne un modèle de régression linéaire sur les données + sentiment
+def train_regression_model(force: bool = False, path: str = None) -> RegressionModel:
+    """
+    🇫🇷 Réentraîne sur toute la collection, sauf si le modèle persisté a déjà été ajusté sur ces données.
+    🇩🇪 Trainiert auf der ganzen Collection neu, außer das gespeicherte Modell kennt diese Daten bereits.
+    🇬🇧 Full retrain on yahoo_all_stocks; skipped when the persisted model has the same data fingerprint.
+    """
+    X, y = build_features(load_cleaned_data(), load_avg_sentiment_score())
+    if not len(y):
         raise ValueError("❌ Aucune donnée suffisante pour entraîner le modèle.")
 
-    model = LinearRegression()
-    model.fit(X, y)
+    version = fingerprint(X, y)
+    current = RegressionModel.load(path)
+    if not force and current is not None and current.fingerprint == version:
+        logging.info("✅ Modèle de régression déjà à jour, réentraînement ignoré.")
+        return current
 
-    logging.info("✅ Modèle de régression entraîné avec succès.")
+    model = RegressionModel().partial_fit(X, y)
+    model.fingerprint = version
+    _publish(model, path)
+    logging.info(f"✅ Modèle de régression entraîné avec succès ({model.n} observations).")
     return model
 
-# 🇫🇷 Fonction pour prédire la performance avec prix et sentiment
-# core/regression_model.py
 
-def predict_performance(price: float, sentiment_score: float = 0.0) -> float:
+def update_regression_model(docs: list, avg_sentiment_score: float = None, path: str = None) -> RegressionModel:
+    """
+    🇫🇷 Ajoute un nouveau lot d’observations au modèle persisté (sans repasser sur l’historique).
+    🇩🇪 Fügt dem gespeicherten Modell einen neuen Beobachtungsstapel hinzu (ohne die Historie erneut zu lesen).
+    🇬🇧 Folds a new batch of {price, performance} documents into the persisted statistics.
+        The fingerprint is chained, so the same batch applied twice in a row is ignored.
+    """
+    if avg_sentiment_score is None:
+        avg_sentiment_score = load_avg_sentiment_score()
+    X, y = build_features(docs, avg_sentiment_score)
+    model = RegressionModel.load(path) or RegressionModel()
+    if not len(y):
+        return model
+
+    batch = fingerprint(X, y)
+    if batch == model.last_batch:
+        return model
+    model.partial_fit(X, y)
+    model.fingerprint = hashlib.sha1(f"{model.fingerprint}:{batch}".encode()).hexdigest()
+    model.last_batch = batch
+    _publish(model, path)
+    logging.info(f"✅ Modèle de régression mis à jour : +{len(y)} observations ({model.n} au total).")
+    return model
+
+
+def update_from_gainers(path: str = None) -> RegressionModel:
+    """
+    🇫🇷 Ajoute au modèle le dernier instantané yahoo_gainers (étape "regression" de auto_schedule.py).
+    🇩🇪 Fügt dem Modell den letzten yahoo_gainers-Snapshot hinzu (Stufe "regression" von auto_schedule.py).
+    🇬🇧 Folds the current yahoo_gainers snapshot into the persisted model, as percent changes
+        (percent_performance) tagged with the current sentiment average. Only this new snapshot
+        is read; an unchanged snapshot is the same batch and is skipped.
+    """
+    return update_regression_model(percent_performance(load_gainers_performance()), path=path)
+
+
+def get_model():
+    """
+    🇫🇷 Modèle persisté du processus, relu seulement quand le fichier a changé (None s’il n’existe pas).
+    🇩🇪 Gespeichertes Modell des Prozesses, nur neu gelesen wenn sich die Datei geändert hat (None falls keins).
+    🇬🇧 The process-wide persisted model, reloaded only when the artifact file changed.
+    """
+    global _model, _model_mtime
+    try:
+        mtime = os.stat(REGRESSION_MODEL_PATH).st_mtime_ns
+    except OSError:
+        return _model
+    if mtime == _model_mtime:
+        return _model
+    with _lock:
+        if mtime != _model_mtime:
+            try:
+                model = RegressionModel.load(REGRESSION_MODEL_PATH)
+            except (OSError, ValueError, KeyError) as e:
+                logging.error(f"❌ Modèle de régression illisible : {e}")
+                return _model
+            _model, _model_mtime = (model if model is not None and model.n else None), mtime
+        return _model
+
+
+def _predict(price, sentiment_score):
+    model = get_model()
+    price, sentiment_score = np.broadcast_arrays(np.asarray(price, dtype=np.float64),
+                                                 np.asarray(sentiment_score, dtype=np.float64))
+    if model is None:
+        return price, sentiment_score, None
+    X = np.column_stack([price.ravel(), sentiment_score.ravel()])
+    return price, sentiment_score, model.predict(X).reshape(price.shape)
+
+
+def _output(values: np.ndarray, scalar: bool):
+    values = np.round(values, 2)
+    return float(values) if scalar else values
+
+
+# 🇫🇷 Fonction pour prédire la performance avec prix et sentiment
+def predict_performance(price, sentiment_score=0.0):
     """
     Prédit une performance future basée sur le prix actuel et le score de sentiment (optionnel).
-    🇬🇧 Predicts future performance based on price and sentiment.
+    🇬🇧 Predicts future performance based on price and sentiment. Scalars return a float, arrays
+        are predicted in one batch. Without a trained model the former linear weighting is used.
     🇩🇪 Sagt zukünftige Performance basierend auf Preis und Sentiment voraus.
     """
-    # Exemple très simple : pondération linéaire
-    predicted = price * (1 + 0.01 * sentiment_score)
-    return round(predicted, 2)
+    scalar = np.ndim(price) == 0 and np.ndim(sentiment_score) == 0
+    price, sentiment_score, performance = _predict(price, sentiment_score)
+    if performance is None:
+        # Exemple très simple : pondération linéaire
+        performance = price * (1 + 0.01 * sentiment_score)
+    return _output(performance, scalar)
+
+
+def predict_price(df):
+    """
+    🇫🇷 Prix futurs prédits pour un DataFrame (colonnes price, avg_sentiment optionnelle), en un seul lot.
+    🇩🇪 Vorhergesagte Preise für einen DataFrame (Spalten price, optional avg_sentiment), in einem Stapel.
+    🇬🇧 Predicted prices price·(1 + performance/100) for every row of `df` in one batch, or None
+        while no regression model has been trained.
+    """
+    if "avg_sentiment" in df:
+        sentiment = df["avg_sentiment"].to_numpy(dtype=np.float64)
+    else:
+        sentiment = load_avg_sentiment_score()
+    price, sentiment, performance = _predict(df["price"].to_numpy(dtype=np.float64), sentiment)
+    if performance is None:
+        return None
+    return np.round(price * (1 + performance / 100), 2)
+
+
+def get_stats() -> dict:
+    model = _model
+    return {
+        "trained": model is not None,
+        "observations": model.n if model else 0,
+        "fingerprint": model.fingerprint[:12] if model else None,
+        "coefficients": dict(zip(FEATURES, np.round(model.coef_, 6).tolist())) if model else None,
+    }
@@ -0,0 +1,228 @@
+# core/risk_engine.py
+"""
+🇫🇷 Moteur de risque vectorisé : volatilité, Sharpe et contribution au risque à partir d’une matrice de rendements locale.
+🇩🇪 Vektorisierte Risiko-Engine: Volatilität, Sharpe und Risikobeitrag aus einer lokalen Renditematrix.
+🇬🇧 Vectorised portfolio risk engine.
+
+    Daily returns (T x N) come from the local price store (core.price_store), the annualised mean
+    vector and the shrunk covariance matrix are computed once and cached per process (rebuilt when
+    the store's version stamp changes).
+    Portfolio volatility sqrt(w'Σw), Sharpe ratio and risk contributions are then pure NumPy on
+    a weight vector or on a (K x N) matrix of K portfolios, without any network access.
+"""
+
+import os
+import threading
+
+import numpy as np
+from dotenv import load_dotenv
+
+from core import price_store
+
+load_dotenv()
+RISK_LOOKBACK_DAYS = int(os.getenv("RISK_LOOKBACK_DAYS", 252))
+MARKET_INDEX = os.getenv("MARKET_INDEX", "^GSPC")
+RISK_SHRINKAGE = float(os.getenv("RISK_SHRINKAGE", 0.1))
+TRADING_DAYS = 252
+DEFAULT_VOLATILITY = 0.2
+
+_model = None
+_model_version = None
+_lock = threading.Lock()
+
+
+def covariance(returns: np.ndarray, shrinkage: float = RISK_SHRINKAGE) -> np.ndarray:
+    """
+    🇫🇷 Covariance annualisée (observations manquantes = NaN, calcul par paires) rétrécie vers la diagonale.
+    🇩🇪 Annualisierte Kovarianz (fehlende Werte = NaN, paarweise) mit Shrinkage zur Diagonale.
+    🇬🇧 Annualised pairwise covariance of daily returns (NaN = missing observation), shrunk towards
+        its diagonal: (1 - δ)·S + δ·diag(S). Shrinkage keeps the matrix well conditioned when
+        symbols have short or non-overlapping histories.
+    """
+    mask = ~np.isnan(returns)
+    counts = mask.sum(axis=0)
+    means = np.divide(np.nansum(returns, axis=0), counts, out=np.zeros(returns.shape[1]), where=counts > 0)
+    centred = np.where(mask, returns - means, 0.0)
+    overlap = mask.T.astype(np.float64) @ mask.astype(np.float64)
+    cov = np.divide(centred.T @ centred, overlap - 1, out=np.zeros_like(overlap), where=overlap > 1)
+    cov *= TRADING_DAYS
+    return (1 - shrinkage) * cov + shrinkage * np.diag(np.diag(cov))
+
+
+class RiskModel:
+    """
+    🇬🇧 Annualised expected returns and covariance of a fixed symbol universe.
+    """
+
+    def __init__(self, symbols, returns: np.ndarray, shrinkage: float = RISK_SHRINKAGE):
+        self.symbols = [str(s) for s in symbols]
+        self.index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        returns = np.asarray(returns, dtype=np.float64)
+        self.observations = (~np.isnan(returns)).sum(axis=0)
+        daily_mean = np.divide(np.nansum(returns, axis=0), self.observations,
+                               out=np.zeros(returns.shape[1]), where=self.observations > 0)
+        self.mean = daily_mean * TRADING_DAYS
+        self.cov = covariance(returns, shrinkage)
+
+    def weights(self, portfolio: dict):
+        """
+        🇫🇷 Vecteur de poids normalisé sur l’univers du modèle + symboles sans historique.
+        🇩🇪 Normalisierter Gewichtsvektor über das Modelluniversum + Symbole ohne Historie.
+        🇬🇧 Normalised weight vector over the model universe, and the symbols without history.
+        """
+        w = np.zeros(len(self.symbols))
+        missing = []
+        for symbol, amount in portfolio.items():
+            i = self.index.get(symbol)
+            if i is None or self.observations[i] < 2:
+                missing.append(symbol)
+            else:
+                w[i] += float(amount)
+        total = w.sum()
+        return (w / total if total else w), missing
+
+    def volatility(self, weights: np.ndarray) -> np.ndarray:
+        """
+        🇬🇧 Annualised volatility sqrt(w'Σw) of one (N,) or K (K x N) portfolios.
+        """
+        w = np.atleast_2d(weights)
+        variance = np.einsum("kn,kn->k", w @ self.cov, w)
+        vol = np.sqrt(np.maximum(variance, 0.0))
+        return vol if np.ndim(weights) == 2 else vol[0]
+
+    def expected_return(self, weights: np.ndarray) -> np.ndarray:
+        return np.asarray(weights) @ self.mean
+
+    def sharpe(self, weights: np.ndarray, risk_free_rate: float = 0.02, expected=None) -> np.ndarray:
+        """
+        🇬🇧 (E[r] - r_f) / σ for one or K portfolios; `expected` overrides the historical mean.
+        """
+        expected = self.expected_return(weights) if expected is None else expected
+        vol = self.volatility(weights)
+        return np.divide(expected - risk_free_rate, vol, out=np.full(np.shape(vol), np.nan), where=vol > 0)
+
+    def risk_contributions(self, weights: np.ndarray) -> np.ndarray:
+        """
+        🇫🇷 Part de chaque actif dans la volatilité du portefeuille (somme = 1).
+        🇩🇪 Anteil jedes Titels an der Portfoliovolatilität (Summe = 1).
+        🇬🇧 Share of each asset in portfolio volatility, w_i·(Σw)_i / w'Σw (sums to 1).
+        """
+        w = np.atleast_2d(weights)
+        marginal = w @ self.cov
+        variance = np.einsum("kn,kn->k", marginal, w)[:, None]
+        contributions = np.divide(w * marginal, variance, out=np.zeros_like(w), where=variance > 0)
+        return contributions if np.ndim(weights) == 2 else contributions[0]
+
+
+def market_betas(returns: np.ndarray, market: np.ndarray):
+    """
+    🇫🇷 Régression de chaque colonne de rendements sur le marché, toutes à la fois (NaN ignorés par paire).
+    🇩🇪 Regression jeder Renditespalte auf den Markt, alle gleichzeitig (NaN paarweise ignoriert).
+    🇬🇧 OLS of every return column on the market return in one matrix pass, r = α + β·m,
+        using for each column only the days where both are present.
+        Returns (annualised alpha, beta, observations); NaN when fewer than 2 days overlap.
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    market = np.asarray(market, dtype=np.float64)
+    both = ~np.isnan(returns) & ~np.isnan(market)[:, None]
+    m = np.where(both, market[:, None], 0.0)
+    r = np.where(both, returns, 0.0)
+    n = both.sum(axis=0).astype(np.float64)
+    sum_m, sum_r = m.sum(axis=0), r.sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov_mr = (m * r).sum(axis=0) - sum_m * sum_r / n
+        var_m = (m * m).sum(axis=0) - sum_m ** 2 / n
+        beta = np.where((n >= 2) & (var_m > 0), cov_mr / var_m, np.nan)
+        alpha = (sum_r - beta * sum_m) / n * TRADING_DAYS
+    return alpha, beta, n.astype(np.int64)
+
+
+def symbol_betas(symbols: list, days: int = RISK_LOOKBACK_DAYS) -> dict:
+    """
+    🇫🇷 Alpha et bêta de chaque symbole contre l’indice de marché de l’historique local.
+    🇩🇪 Alpha und Beta jedes Symbols gegenüber dem Marktindex aus der lokalen Historie.
+    🇬🇧 Alpha and beta of each symbol against $MARKET_INDEX from the price store. When the index
+        has no history, an equal-weighted average of the symbols' returns is used as the market.
+    """
+    _, returns = price_store.return_matrix(list(symbols) + [MARKET_INDEX], days)
+    if not len(returns):
+        nan = np.full(len(symbols), np.nan)
+        return {"alpha": nan, "beta": nan.copy(), "observations": np.zeros(len(symbols), dtype=np.int64), "market": None}
+    market, market_name = returns[:, -1], MARKET_INDEX
+    returns = returns[:, :-1]
+    if np.isnan(market).all():
+        # ⚖️ Pas d’indice stocké : proxy équipondéré de l’univers
+        counts = (~np.isnan(returns)).sum(axis=1)
+        market = np.divide(np.nansum(returns, axis=1), counts, out=np.full(len(counts), np.nan), where=counts > 0)
+        market_name = "equal_weight"
+    alpha, beta, observations = market_betas(returns, market)
+    return {"alpha": alpha, "beta": beta, "observations": observations, "market": market_name}
+
+
+def get_risk_model():
+    """
+    🇫🇷 Modèle de risque du processus, recalculé seulement si l’historique des prix a changé.
+    🇩🇪 Risikomodell des Prozesses, nur neu berechnet, wenn sich die Preishistorie geändert hat.
+    🇬🇧 Cached risk model of this process, rebuilt only when the price store changed.
+        Returns None when the store is still empty.
+    """
+    global _model, _model_version
+    version = price_store.get_version()
+    if version is None or (_model is not None and version == _model_version):
+        return _model
+    with _lock:
+        if _model is None or version != _model_version:
+            symbols = price_store.list_symbols()
+            _, returns = price_store.return_matrix(symbols, RISK_LOOKBACK_DAYS)
+            _model = RiskModel(symbols, returns)
+            _model_version = version
+            print(f"[✅] Modèle de risque : {len(_model.symbols)} symboles, {returns.shape[0]} jours.")
+    return _model
+
+
+def effective_volatility(volatility):
+    """
+    🇫🇷 Volatilité retenue pour le Sharpe : DEFAULT_VOLATILITY si elle est inconnue (NaN) ou nulle.
+    🇩🇪 Für Sharpe verwendete Volatilität: DEFAULT_VOLATILITY, wenn sie unbekannt (NaN) oder null ist.
+    🇬🇧 Volatility used in Sharpe ratios, and its source, for one value or an array. Unknown (NaN)
+        and non-positive volatilities (no, flat or single-bar history) become DEFAULT_VOLATILITY
+        with source "default"; the others keep source "covariance".
+    """
+    vol = np.asarray(volatility, dtype=np.float64)
+    default = ~(vol > 0)
+    vol = np.where(default, DEFAULT_VOLATILITY, vol)
+    source = np.where(default, "default", "covariance")
+    if vol.ndim == 0:
+        return float(vol), str(source)
+    return vol, source
+
+
+def portfolio_risk(portfolio: dict, risk_free_rate: float = 0.02) -> dict:
+    """
+    🇫🇷 Volatilité, Sharpe et contributions au risque d’un portefeuille {symbole: quantité}.
+    🇩🇪 Volatilität, Sharpe und Risikobeiträge eines Portfolios {Symbol: Menge}.
+    🇬🇧 Volatility, Sharpe ratio and risk contributions of a {symbol: amount} portfolio.
+        The Sharpe ratio is (annualised expected return - r_f) / annualised volatility, both from
+        the risk model; it is None when none of the symbols has history. The volatility goes
+        through effective_volatility (DEFAULT_VOLATILITY without history or with a flat one).
+    """
+    model = get_risk_model()
+    weights, missing = model.weights(portfolio) if model is not None else (None, list(portfolio))
+    if weights is None or not weights.any():
+        volatility, source = effective_volatility(np.nan)
+        return {"volatility": volatility, "expected_return": None, "sharpe_ratio": None,
+                "risk_contributions": {}, "missing_symbols": missing, "source": source}
+
+    volatility, source = effective_volatility(model.volatility(weights))
+    expected = float(model.expected_return(weights))
+    sharpe = (expected - risk_free_rate) / volatility
+    contributions = model.risk_contributions(weights)
+    held = np.flatnonzero(weights)
+    return {
+        "volatility": volatility,
+        "expected_return": expected,
+        "sharpe_ratio": sharpe,
+        "risk_contributions": {model.symbols[i]: round(float(contributions[i]), 4) for i in held},
+        "missing_symbols": missing,
+        "source": source,
+    }
@@ -0,0 +1,152 @@
+# core/sentiment_backends.py
+"""
+🇫🇷 Backends d’inférence CPU interchangeables pour le classifieur distilroberta (fp32, int8, ONNX).
+🇩🇪 Austauschbare CPU-Inferenz-Backends für den distilroberta-Klassifikator (fp32, int8, ONNX).
+🇬🇧 Selectable CPU inference backends for the distilroberta sentiment classifier:
+    - "fp32": the original PyTorch model
+    - "int8": PyTorch dynamic int8 quantization of the Linear layers
+    - "onnx": exported ONNX graph run by ONNX Runtime (optional dependency `onnxruntime`)
+    All backends expose the same interface: `tokenizer`, `id2label` and `logits(batch) -> np.ndarray`.
+    The production backend is chosen with $SENTIMENT_BACKEND (default fp32).
+"""
+
+import os
+import inspect
+import logging
+
+import numpy as np
+
+from core.model_registry import HF_TOKEN, SENTIMENT_MODEL, get_model, get_sentiment_model, register
+
+BACKENDS = ("fp32", "int8", "onnx")
+SENTIMENT_BACKEND = os.getenv("SENTIMENT_BACKEND", "fp32")
+ONNX_DIR = os.getenv("SENTIMENT_ONNX_DIR", "models/sentiment_onnx")
+
+
+class TorchBackend:
+    """
+    🇬🇧 PyTorch backend (fp32 or dynamically quantized int8).
+    """
+
+    def __init__(self, name, tokenizer, model):
+        self.name = name
+        self.tokenizer = tokenizer
+        self.model = model
+        self.id2label = model.config.id2label
+
+    def logits(self, batch) -> np.ndarray:
+        import torch
+
+        with torch.inference_mode():
+            inputs = {k: torch.as_tensor(v) for k, v in batch.items()}
+            return self.model(**inputs).logits.numpy()
+
+
+class OnnxBackend:
+    """
+    🇬🇧 ONNX Runtime backend over the exported graph in $SENTIMENT_ONNX_DIR.
+    """
+
+    def __init__(self, tokenizer, session, id2label):
+        self.name = "onnx"
+        self.tokenizer = tokenizer
+        self.session = session
+        self.id2label = id2label
+        self._inputs = [i.name for i in session.get_inputs()]
+
+    def logits(self, batch) -> np.ndarray:
+        feed = {k: np.asarray(batch[k], dtype=np.int64) for k in self._inputs}
+        return self.session.run(None, feed)[0]
+
+
+def _load_fp32():
+    tokenizer, model = get_sentiment_model()
+    return TorchBackend("fp32", tokenizer, model)
+
+
+def _load_int8():
+    import torch
+    from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+    # ♻️ Modèle chargé à part puis quantifié sur place (pas de copie fp32 gardée en mémoire)
+    tokenizer = AutoTokenizer.from_pretrained(SENTIMENT_MODEL, token=HF_TOKEN)
+    model = AutoModelForSequenceClassification.from_pretrained(SENTIMENT_MODEL, token=HF_TOKEN)
+    model.eval()
+    model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+    return TorchBackend("int8", tokenizer, model)
+
+
+def export_onnx(output_dir: str = None) -> str:
+    """
+    🇫🇷 Exporte le modèle fp32 au format ONNX (axes batch et séquence dynamiques).
+    🇩🇪 Exportiert das fp32-Modell nach ONNX (dynamische Batch- und Sequenzachsen).
+    🇬🇧 Exports the fp32 model to ONNX with dynamic batch/sequence axes and returns the file path.
+    """
+    import torch
+    from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+    output_dir = output_dir or ONNX_DIR
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, "model.onnx")
+
+    tokenizer = AutoTokenizer.from_pretrained(SENTIMENT_MODEL, token=HF_TOKEN)
+    model = AutoModelForSequenceClassification.from_pretrained(SENTIMENT_MODEL, token=HF_TOKEN)
+    model.eval()
+    # 🇬🇧 return_dict=False makes the traced graph return a plain logits tuple
+    model.config.return_dict = False
+
+    sample = tokenizer(["Stocks rally after earnings"], return_tensors="pt")
+    axes = {0: "batch", 1: "sequence"}
+    kwargs = {"dynamo": False} if "dynamo" in inspect.signature(torch.onnx.export).parameters else {}
+    torch.onnx.export(
+        model,
+        (sample["input_ids"], sample["attention_mask"]),
+        path,
+        input_names=["input_ids", "attention_mask"],
+        output_names=["logits"],
+        dynamic_axes={"input_ids": axes, "attention_mask": axes, "logits": {0: "batch"}},
+        opset_version=17,
+        **kwargs,
+    )
+    tokenizer.save_pretrained(output_dir)
+    model.config.save_pretrained(output_dir)
+    logging.info(f"[📦] ONNX sentiment model exported to {path}")
+    return path
+
+
+def _load_onnx():
+    import torch
+
+    try:
+        import onnxruntime as ort
+    except ImportError as e:
+        raise RuntimeError("❌ SENTIMENT_BACKEND=onnx requires the 'onnxruntime' package") from e
+    from transformers import AutoConfig, AutoTokenizer
+
+    path = os.path.join(ONNX_DIR, "model.onnx")
+    if not os.path.exists(path):
+        export_onnx(ONNX_DIR)
+
+    options = ort.SessionOptions()
+    options.intra_op_num_threads = torch.get_num_threads()
+    session = ort.InferenceSession(path, sess_options=options, providers=["CPUExecutionProvider"])
+    tokenizer = AutoTokenizer.from_pretrained(ONNX_DIR)
+    id2label = AutoConfig.from_pretrained(ONNX_DIR).id2label
+    return OnnxBackend(tokenizer, session, id2label)
+
+
+register("sentiment_fp32", _load_fp32)
+register("sentiment_int8", _load_int8)
+register("sentiment_onnx", _load_onnx)
+
+
+def get_backend(name: str = None):
+    """
+    🇫🇷 Retourne le backend demandé (ou celui de $SENTIMENT_BACKEND), chargé une seule fois.
+    🇩🇪 Gibt das gewünschte Backend zurück (Standard: $SENTIMENT_BACKEND).
+    🇬🇧 Returns the named backend (default $SENTIMENT_BACKEND), loaded once via the model registry.
+    """
+    name = name or SENTIMENT_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"❌ Unknown sentiment backend '{name}' (expected one of {BACKENDS})")
+    return get_model(f"sentiment_{name}")
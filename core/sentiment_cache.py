@@ -0,0 +1,125 @@
+# core/sentiment_cache.py
+"""
+🇫🇷 Cache persistant des scores de sentiment (clé = modèle + hash du titre normalisé).
+🇩🇪 Persistenter Cache für Sentiment-Scores (Schlüssel = Modell + Hash des normalisierten Titels).
+🇬🇧 Persistent sentiment cache keyed on (model name, normalised title hash), backed by diskcache
+    so that it is shared by every gunicorn worker and the batch scripts. Eviction is LRU and
+    bounded by $SENTIMENT_CACHE_SIZE_MB.
+"""
+
+import os
+import hashlib
+import logging
+import threading
+import unicodedata
+
+from dotenv import load_dotenv
+
+load_dotenv()
+CACHE_DIR = os.getenv("SENTIMENT_CACHE_DIR", "cache/sentiment")
+CACHE_SIZE_MB = int(os.getenv("SENTIMENT_CACHE_SIZE_MB", 256))
+CACHE_ENABLED = os.getenv("SENTIMENT_CACHE", "1") != "0"
+
+_cache = None
+_cache_pid = None
+_lock = threading.Lock()
+_counters = {"hits": 0, "misses": 0, "writes": 0}
+
+
+def normalise_title(text) -> str:
+    """
+    🇫🇷 Normalise un titre (Unicode NFKC + espaces) pour que deux variantes identiques partagent la même entrée.
+    🇩🇪 Normalisiert einen Titel (Unicode NFKC + Leerzeichen).
+    🇬🇧 Normalises a title (Unicode NFKC, collapsed whitespace) so trivially different copies share an entry.
+    """
+    if not isinstance(text, str):
+        return ""
+    return " ".join(unicodedata.normalize("NFKC", text).split())
+
+
+def cache_key(model_name: str, text: str) -> str:
+    digest = hashlib.sha256(normalise_title(text).encode("utf-8")).hexdigest()
+    return f"{model_name}:{digest}"
+
+
+def _get_cache():
+    """
+    🇬🇧 Opens the diskcache lazily, once per process (re-opened after a fork).
+    """
+    global _cache, _cache_pid
+    if _cache is None or _cache_pid != os.getpid():
+        with _lock:
+            if _cache is None or _cache_pid != os.getpid():
+                from diskcache import Cache
+
+                _cache = Cache(
+                    CACHE_DIR,
+                    size_limit=CACHE_SIZE_MB * 1024 ** 2,
+                    eviction_policy="least-recently-used",
+                )
+                _cache_pid = os.getpid()
+    return _cache
+
+
+def get_many(model_name: str, texts: list) -> dict:
+    """
+    🇫🇷 Retourne {texte: résultat} pour les textes déjà présents dans le cache.
+    🇩🇪 Gibt {Text: Ergebnis} für bereits gecachte Texte zurück.
+    🇬🇧 Returns {text: cached result} for the texts already in the cache.
+    """
+    if not CACHE_ENABLED or not texts:
+        return {}
+    found = {}
+    try:
+        cache = _get_cache()
+        for text in texts:
+            result = cache.get(cache_key(model_name, text))
+            if result is not None:
+                found[text] = result
+    except Exception as e:
+        logging.warning(f"⚠️ Sentiment cache unavailable: {e}")
+        return {}
+    with _lock:
+        _counters["hits"] += len(found)
+        _counters["misses"] += len(texts) - len(found)
+    return found
+
+
+def set_many(model_name: str, results: dict) -> None:
+    """
+    🇬🇧 Stores {text: result} in a single diskcache transaction.
+    """
+    if not CACHE_ENABLED or not results:
+        return
+    try:
+        cache = _get_cache()
+        with cache.transact():
+            for text, result in results.items():
+                cache.set(cache_key(model_name, text), result)
+    except Exception as e:
+        logging.warning(f"⚠️ Sentiment cache write failed: {e}")
+        return
+    with _lock:
+        _counters["writes"] += len(results)
+
+
+def get_stats() -> dict:
+    """
+    🇫🇷 Compteurs hits/misses du processus et taille du cache sur disque.
+    🇩🇪 Hit/Miss-Zähler des Prozesses und Cachegröße auf der Festplatte.
+    🇬🇧 Hit/miss counters of this process plus the on-disk size of the cache.
+    """
+    with _lock:
+        stats = dict(_counters)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else None
+    stats["enabled"] = CACHE_ENABLED
+    if CACHE_ENABLED:
+        try:
+            cache = _get_cache()
+            stats["entries"] = len(cache)
+            stats["volume_mb"] = round(cache.volume() / 1024 ** 2, 2)
+            stats["size_limit_mb"] = CACHE_SIZE_MB
+        except Exception as e:
+            stats["error"] = str(e)
+    return stats
@@ -0,0 +1,109 @@
+# core/sentiment_engine.py
+"""
+🇫🇷 Moteur d’inférence par lots pour le modèle de sentiment (tri par longueur + padding dynamique).
+🇩🇪 Batch-Inferenz für das Sentiment-Modell (Sortierung nach Länge + dynamisches Padding).
+🇬🇧 Batched sentiment inference engine: texts are sorted by token length and run through the
+    shared distilroberta model in micro-batches padded only to the longest text of each batch.
+"""
+
+import os
+import logging
+
+import numpy as np
+
+from core import sentiment_cache
+from core.model_registry import SENTIMENT_MODEL, timed
+from core.sentiment_backends import BACKENDS, SENTIMENT_BACKEND, get_backend
+
+DEFAULT_BATCH_SIZE = int(os.getenv("SENTIMENT_BATCH_SIZE", 32))
+MAX_LENGTH = 512
+
+
+def set_num_threads(num_threads: int) -> None:
+    """
+    🇫🇷 Fixe le nombre de threads CPU utilisés par PyTorch.
+    🇩🇪 Setzt die Anzahl der CPU-Threads für PyTorch.
+    🇬🇧 Sets the number of CPU threads used by PyTorch for intra-op parallelism.
+    """
+    if num_threads and num_threads > 0:
+        import torch
+
+        torch.set_num_threads(num_threads)
+        logging.info(f"[⚙️] torch threads = {num_threads}")
+
+
+def _cache_namespace(backend: str) -> str:
+    # 🇬🇧 fp32 keeps the plain model name; other backends get their own entries so labels never mix
+    return SENTIMENT_MODEL if backend == "fp32" else f"{SENTIMENT_MODEL}@{backend}"
+
+
+def score_texts(texts: list, batch_size: int = DEFAULT_BATCH_SIZE, use_cache: bool = True,
+                backend: str = None) -> list:
+    """
+    🇫🇷 Analyse une liste de textes et retourne, dans le même ordre, label, score et probabilités.
+    🇩🇪 Analysiert eine Liste von Texten und gibt Label, Score und Wahrscheinlichkeiten zurück.
+    🇬🇧 Scores a list of texts and returns, in input order, one dict per text:
+        {"label": "positive", "score": 0.93, "probs": [p_negative, p_neutral, p_positive]}
+        Titles already scored (same normalised text) are served from core.sentiment_cache.
+
+    :param texts: titres / phrases à analyser
+    :param batch_size: taille des micro-lots envoyés au modèle
+    :param use_cache: consulter / alimenter le cache persistant
+    :param backend: "fp32", "int8" ou "onnx" (défaut: $SENTIMENT_BACKEND)
+    :return: liste de résultats alignée sur `texts`
+    """
+    if not texts:
+        return []
+
+    backend = backend or SENTIMENT_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"❌ Unknown sentiment backend '{backend}' (expected one of {BACKENDS})")
+    namespace = _cache_namespace(backend)
+
+    normalised = [sentiment_cache.normalise_title(t) for t in texts]
+    unique = list(dict.fromkeys(normalised))
+    known = sentiment_cache.get_many(namespace, unique) if use_cache else {}
+    missing = [t for t in unique if t not in known]
+
+    if missing:
+        scored = dict(zip(missing, _run_model(missing, batch_size, get_backend(backend))))
+        if use_cache:
+            sentiment_cache.set_many(namespace, scored)
+        known.update(scored)
+
+    return [known[t] for t in normalised]
+
+
+def _run_model(texts: list, batch_size: int, backend) -> list:
+    """
+    🇬🇧 Runs `backend` over `texts` (no cache) and returns results in input order.
+    """
+    tokenizer = backend.tokenizer
+
+    # ✂️ Tokenisation sans padding pour connaître la longueur réelle de chaque texte
+    encodings = tokenizer(texts, truncation=True, max_length=MAX_LENGTH)
+    input_ids = encodings["input_ids"]
+    order = sorted(range(len(texts)), key=lambda i: len(input_ids[i]))
+
+    results = [None] * len(texts)
+    for start in range(0, len(order), batch_size):
+        idx = order[start:start + batch_size]
+        batch = tokenizer.pad(
+            {"input_ids": [input_ids[i] for i in idx],
+             "attention_mask": [encodings["attention_mask"][i] for i in idx]},
+            return_tensors="np",
+        )
+        with timed(f"sentiment_{backend.name}"):
+            logits = backend.logits(batch)
+        logits = logits - logits.max(axis=-1, keepdims=True)
+        probs = np.exp(logits)
+        probs /= probs.sum(axis=-1, keepdims=True)
+        best = probs.argmax(axis=-1)
+        for row, i in enumerate(idx):
+            k = int(best[row])
+            results[i] = {
+                "label": backend.id2label[k],
+                "score": float(probs[row, k]),
+                "probs": [float(p) for p in probs[row]],
+            }
+    return results
@@ -0,0 +1,222 @@
+# core/symbol_index.py
+"""
+🇫🇷 Index en mémoire des symboles et noms de sociétés (yahoo_all_stocks) pour la recherche et l’autocomplétion.
+🇩🇪 In-Memory-Index der Symbole und Firmennamen (yahoo_all_stocks) für Suche und Autovervollständigung.
+🇬🇧 In-process search index over the tickers and company names of yahoo_all_stocks.
+
+    Results are ranked in four tiers: exact ticker > ticker prefix > prefix of a word of the name
+    > fuzzy (trigram similarity of the name). Tickers and name words are kept in sorted arrays
+    (prefix = one bisect), trigrams in posting lists scored with one np.bincount, so a lookup is
+    pure in-memory work instead of an unanchored $regex collection scan, and user input is never
+    interpreted as a pattern.
+
+    Like core.market_snapshot, the index is immutable: the scrapers bump the "all_stocks" stamp
+    (core.database.replace_all_stocks), readers check it at most every $SNAPSHOT_CHECK_INTERVAL
+    seconds and swap in a rebuilt index when it changed.
+"""
+
+import re
+import time
+import heapq
+import threading
+from bisect import bisect_left
+
+import numpy as np
+
+from core import database
+from core.market_snapshot import SNAPSHOT_CHECK_INTERVAL, SNAPSHOT_MAX_AGE
+
+FUZZY_MIN_SIMILARITY = 0.4
+_WORD = re.compile(r"[0-9a-z]+")
+
+_index = None
+_checked_at = 0.0
+_lock = threading.Lock()
+_stats = {"checks": 0, "rebuilds": 0, "check_failures": 0, "build_seconds": 0.0}
+
+
+def _normalise(text: str) -> str:
+    return " ".join(_WORD.findall(str(text).lower()))
+
+
+def trigrams(text: str) -> set:
+    padded = f" {_normalise(text)} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _prefix_range(keys: list, prefix: str):
+    start = bisect_left(keys, prefix)
+    end = bisect_left(keys, prefix + "\uffff", lo=start)
+    return start, end
+
+
+class SymbolIndex:
+    """
+    🇬🇧 Immutable ticker / name index of one yahoo_all_stocks snapshot.
+    """
+
+    def __init__(self, docs: list, version=None):
+        self.version = version
+        self.built_at = time.time()
+        self.docs = [doc for doc in docs if doc.get("_id")]
+        self.symbols = [str(doc["_id"]).upper() for doc in self.docs]
+        self.names = [str(doc.get("name") or "") for doc in self.docs]
+        self.normalised = [_normalise(name) for name in self.names]
+        self.by_ticker = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.tickers = sorted(self.by_ticker)
+
+        # 🔤 (mot, position du mot dans le nom, ligne) triés pour la recherche par préfixe
+        words = sorted((word, position, i)
+                       for i, name in enumerate(self.normalised)
+                       for position, word in enumerate(name.split()))
+        self.words = [w for w, _, _ in words]
+        self.word_rows = [(position, i) for _, position, i in words]
+
+        postings = {}
+        self.trigram_counts = np.zeros(len(self.docs), dtype=np.float64)
+        for i, name in enumerate(self.normalised):
+            grams = trigrams(name)
+            self.trigram_counts[i] = len(grams)
+            for gram in grams:
+                postings.setdefault(gram, []).append(i)
+        self.postings = {gram: np.array(rows, dtype=np.int32) for gram, rows in postings.items()}
+
+    def __len__(self):
+        return len(self.docs)
+
+    def search(self, query: str, limit: int = 5) -> list:
+        """
+        🇫🇷 Lignes (indices de `docs`) les mieux classées pour `query`.
+        🇩🇪 Bestplatzierte Zeilen (Indizes in `docs`) für `query`.
+        🇬🇧 Best-ranked row numbers of `docs` for `query`, at most `limit`.
+        """
+        ticker = str(query).strip().upper()
+        text = _normalise(query)
+        if not ticker or limit <= 0:
+            return []
+        rows, seen = [], set()
+
+        def take(candidates):
+            for i in candidates:
+                if i not in seen:
+                    seen.add(i)
+                    rows.append(i)
+                    if len(rows) >= limit:
+                        return True
+            return False
+
+        # 1️⃣ Ticker exact
+        if ticker in self.by_ticker and take([self.by_ticker[ticker]]):
+            return rows
+        # 2️⃣ Préfixe du ticker (les plus courts d’abord)
+        start, end = _prefix_range(self.tickers, ticker)
+        prefixed = heapq.nsmallest(limit, self.tickers[start:end], key=lambda s: (len(s), s))
+        if take(self.by_ticker[s] for s in prefixed):
+            return rows
+        if not text:
+            return rows
+        # 3️⃣ Préfixe d’un mot du nom (mot le plus tôt dans le nom, puis nom le plus court)
+        first, *rest = text.split()
+        start, end = _prefix_range(self.words, first)
+        matches = {}
+        for position, i in self.word_rows[start:end]:
+            if i not in matches or position < matches[i]:
+                matches[i] = position
+        if rest:
+            matches = {i: p for i, p in matches.items() if text in self.normalised[i]}
+        ranked = heapq.nsmallest(limit + len(seen), matches, key=lambda i: (matches[i], len(self.names[i]), i))
+        if take(ranked):
+            return rows
+        # 4️⃣ Approximatif : part des trigrammes de la requête présents dans le nom
+        take(self._fuzzy(text, limit + len(seen)))
+        return rows
+
+    def _fuzzy(self, text: str, limit: int) -> list:
+        """
+        🇬🇧 Rows whose name contains at least FUZZY_MIN_SIMILARITY of the query trigrams, ranked by
+            that share then by Jaccard similarity (shorter names first on ties).
+        """
+        query = trigrams(text)
+        grams = [self.postings[g] for g in query if g in self.postings]
+        if not grams:
+            return []
+        shared = np.bincount(np.concatenate(grams), minlength=len(self.docs)).astype(np.float64)
+        coverage = shared / len(query)
+        jaccard = shared / (len(query) + self.trigram_counts - shared)
+        candidates = np.flatnonzero(coverage >= FUZZY_MIN_SIMILARITY)
+        score = coverage[candidates] + jaccard[candidates] / 2
+        if len(candidates) > limit:
+            top = np.argpartition(-score, limit - 1)[:limit]
+            candidates, score = candidates[top], score[top]
+        return candidates[np.lexsort((candidates, -score))].tolist()
+
+    def lookup(self, query: str, limit: int = 5) -> list:
+        """
+        🇬🇧 Ranked stock documents (copies) for `query`.
+        """
+        return [dict(self.docs[i]) for i in self.search(query, limit)]
+
+
+def _rebuild(version) -> SymbolIndex:
+    global _index
+    start = time.perf_counter()
+    index = SymbolIndex(database.load_all_stocks(), version)
+    _index = index
+    _stats["rebuilds"] += 1
+    _stats["build_seconds"] = time.perf_counter() - start
+    print(f"[✅] Index des symboles v{version} : {len(index)} actions indexées.")
+    return index
+
+
+def get_index() -> SymbolIndex:
+    """
+    🇫🇷 Index courant, reconstruit seulement quand yahoo_all_stocks a été remplacée.
+    🇩🇪 Aktueller Index, nur neu aufgebaut wenn yahoo_all_stocks ersetzt wurde.
+    🇬🇧 Returns the current index, rebuilt only when the "all_stocks" version stamp changed.
+        If MongoDB is unreachable during a check, the previous index keeps being served.
+    """
+    global _checked_at
+    index = _index
+    if index is not None and time.monotonic() - _checked_at < SNAPSHOT_CHECK_INTERVAL:
+        return index
+
+    with _lock:
+        index = _index
+        if index is not None and time.monotonic() - _checked_at < SNAPSHOT_CHECK_INTERVAL:
+            return index
+        _stats["checks"] += 1
+        try:
+            version = database.get_snapshot_version("all_stocks")
+        except Exception as e:
+            if index is None:
+                raise
+            _stats["check_failures"] += 1
+            print(f"[⚠️] Version de yahoo_all_stocks illisible, index précédent conservé : {e}")
+            _checked_at = time.monotonic()
+            return index
+
+        stale = (
+            index is None
+            or version != index.version
+            or (version is None and time.time() - index.built_at > SNAPSHOT_MAX_AGE)
+        )
+        if stale:
+            index = _rebuild(version)
+        _checked_at = time.monotonic()
+        return index
+
+
+def search(query: str, limit: int = 5) -> list:
+    return get_index().lookup(query, limit)
+
+
+def get_stats() -> dict:
+    index = _index
+    return {
+        "version": index.version if index else None,
+        "symbols": len(index) if index else 0,
+        "checks": _stats["checks"],
+        "rebuilds": _stats["rebuilds"],
+        "check_failures": _stats["check_failures"],
+        "last_build_ms": round(_stats["build_seconds"] * 1000, 3),
+    }
@@ -0,0 +1,31 @@
+# gunicorn.conf.py
+# 🇫🇷 Chargé automatiquement par gunicorn depuis le répertoire courant.
+# 🇩🇪 Wird von Gunicorn automatisch aus dem Arbeitsverzeichnis geladen.
+# 🇬🇧 Picked up automatically by gunicorn from the working directory.
+#
+# GUNICORN_PRELOAD=1 : l’app et les modèles de WARMUP_MODELS sont chargés une fois dans le master,
+#                      puis partagés par fork (copy-on-write) avec tous les workers.
+# sinon              : chaque worker démarre immédiatement et charge ses modèles en arrière-plan.
+
+import os
+import threading
+
+preload_app = os.getenv("GUNICORN_PRELOAD", "0") == "1"
+
+
+def when_ready(server):
+    # 🧊 Master : chargement des poids avant le fork des workers
+    if preload_app:
+        from core.model_registry import warm_up
+
+        warm_up()
+        server.log.info("Models preloaded in master")
+
+
+def post_worker_init(worker):
+    # 🔥 Préchargement des modèles en arrière-plan : le worker accepte déjà des requêtes
+    from core.model_registry import default_warmup, warm_up
+
+    if default_warmup().strip():
+        threading.Thread(target=warm_up, name="model-warmup", daemon=True).start()
+        worker.log.info("Model warm-up started (%s)", default_warmup())
@@ -28,36 +28,16 @@ case $option in
     docker run -p 5000:5000 -v $(pwd)/models:/app/models --env-file .env portfolio-optimizer
     ;;
   3)
-    echo "🔁 Starting all scrapers..."
-
-    echo "[1/4] 🔍 Scraping top gainers via API..."
-    python update_gainers.py || echo "❌ Failed to scrape gainers"
-
-    echo "[2/4] 📈 Scraping all stocks..."
-    python update_all_stocks.py || echo "❌ Failed to scrape all stocks"
-
-    echo "[3/4] 📰 Scraping financial news..."
-    python update_news.py || echo "❌ Failed to scrape news"
-
-    echo "[4/4] 🧠 Running sentiment analysis..."
-    curl http://127.0.0.1:5000/analyze-news-local || echo "❌ Sentiment analysis failed (check if Flask is running)"
+    echo "🔁 Running the scraping pipeline once (gainers → news → sentiment → averages, + all stocks)..."
+    python auto_schedule.py --once || echo "❌ Pipeline finished with failed stages (see logs/auto.log)"
 
     echo "✅ All scrapers and analysis completed!"
     ;;
   4)
     echo "🔁 Starting full automation pipeline..."
 
-    echo "🔍 Scraping top gainers..."
-    python update_gainers.py || echo "❌ Failed to scrape gainers"
-
-    echo "📈 Scraping all stocks..."
-    python update_all_stocks.py || echo "❌ Failed to scrape all stocks"
-
-    echo "📰 Scraping financial news..."
-    python update_news.py || echo "❌ Failed to scrape news"
-
-    echo "🧠 Running local sentiment analysis..."
-    curl http://127.0.0.1:5000/analyze-news-local || echo "❌ Sentiment analysis failed (check if Flask is running)"
+    echo "🔍 Scraping + sentiment pipeline..."
+    python auto_schedule.py --once || echo "❌ Pipeline finished with failed stages (see logs/auto.log)"
 
     echo "🐳 Building and running Docker container..."
     docker build -t portfolio-optimizer .
@@ -1,44 +1,84 @@
 import os
+import sys
+import argparse
 from dotenv import load_dotenv
-from pymongo import MongoClient
-from transformers import pipeline
+from pymongo import UpdateOne
 from datetime import datetime
 
-print("[🤖] Chargement du modèle de sentiment local...")
-sentiment_model = pipeline("sentiment-analysis", model="mrm8488/distilroberta-finetuned-financial-news-sentiment-analysis")
-
-# Chargement des variables d'environnement
-load_dotenv()
-MONGO_URI = os.getenv("MONGO_URI")
-client = MongoClient(MONGO_URI)
-db = client["gainers_db"]
-news_col = db["news_articles"]
-
-# 🇫🇷 On filtre toutes les news sans sentiment (vide ou null) et avec sentiment_score 1 ou -1
-target_articles = list(news_col.find({ "$or": [{"sentiment": ""}, {"sentiment": None}, {"sentiment_score": None}, {"sentiment_score": {"$in": [1, -1]}}]}))
-print(f"[📄] {len(target_articles)} articles à analyser et à normaliser...")
-
-updated_count = 0
-for article in target_articles:
-    try:
-        if isinstance(article.get("sentiment_score"), (int, float)) and article["sentiment_score"] in [1, -1]:
-            # Si le sentiment est 1 ou -1, nous le normalisons
+# 🇬🇧 Make the repository root importable (core/) when run as a script
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from core import sentiment_cache
+from core.database import BULK_CHUNK_SIZE, bulk_write_chunks, close_client, iter_chunks, news_articles_collection
+from core.sentiment_engine import DEFAULT_BATCH_SIZE, score_texts, set_num_threads
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Analyse de sentiment des news_articles par lots")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help="Taille des micro-lots envoyés au modèle (défaut: %(default)s)")
+    parser.add_argument("--threads", type=int, default=0,
+                        help="Nombre de threads CPU pour PyTorch (0 = défaut de torch)")
+    parser.add_argument("--chunk-size", type=int, default=BULK_CHUNK_SIZE,
+                        help="Articles lus, analysés et écrits par paquet (défaut: %(default)s)")
+    return parser.parse_args(argv)
+
+
+def update_ops(articles, batch_size, analyzed_at):
+    """
+    🇫🇷 Opérations UpdateOne d’un paquet d’articles (titres analysés par le modèle ou scores ±1 normalisés).
+    🇩🇪 UpdateOne-Operationen eines Artikelpakets (Titel vom Modell bewertet oder ±1-Scores normalisiert).
+    🇬🇧 UpdateOne operations for one chunk of articles.
+    """
+    # Si le sentiment est 1 ou -1, nous le normalisons ; sinon analyse du titre par le modèle
+    to_score = [a for a in articles
+                if not (isinstance(a.get("sentiment_score"), (int, float)) and a["sentiment_score"] in [1, -1])]
+    results = score_texts([a.get("title") for a in to_score], batch_size=batch_size) if to_score else []
+    model_results = {a["_id"]: r for a, r in zip(to_score, results)}
+
+    for article in articles:
+        result = model_results.get(article["_id"])
+        if result is None:
             sentiment = "positive" if article["sentiment_score"] == 1 else "negative"
             sentiment_score = 1 if sentiment == "positive" else -1
         else:
-            # Sinon, on fait une analyse classique
-            result = sentiment_model(article["title"])[0]  # 🔍 Analyse du titre uniquement
-            sentiment = result["label"]  # POSITIVE, NEGATIVE, NEUTRAL (prévu par le modèle)
+            sentiment = result["label"]  # positive, negative, neutral (prévu par le modèle)
             sentiment_score = result["score"]  # Score numérique (probabilité du modèle)
 
         # Mise à jour de l'article avec le sentiment et sentiment_score normalisé
-        news_col.update_one(
+        yield UpdateOne(
             {"_id": article["_id"]},
-            {"$set": {"sentiment": sentiment, "sentiment_score": sentiment_score, "analyzed_at": datetime.utcnow().isoformat()}}
+            {"$set": {"sentiment": sentiment, "sentiment_score": sentiment_score, "analyzed_at": analyzed_at}}
         )
-        updated_count += 1
-    except Exception as e:
-        print(f"[⚠️] Erreur sur l'article {article.get('_id')}: {e}")
 
-print(f"[📌] {updated_count} articles mis à jour avec un sentiment et un score normalisé.")
-client.close()
+
+def main(argv=None):
+    args = parse_args(argv)
+    set_num_threads(args.threads)
+
+    # Chargement des variables d'environnement
+    load_dotenv()
+    news_col = news_articles_collection()
+
+    # 🇫🇷 On filtre toutes les news sans sentiment (vide ou null) et avec sentiment_score 1 ou -1
+    query = {"$or": [{"sentiment": ""}, {"sentiment": None}, {"sentiment_score": None}, {"sentiment_score": {"$in": [1, -1]}}]}
+    print(f"[📄] {news_col.count_documents(query)} articles à analyser et à normaliser "
+          f"(paquets de {args.chunk_size}, lots modèle de {args.batch_size})...")
+
+    # 🌊 Curseur lu par paquets (ordre _id stable) : mémoire client constante quelle que soit la collection
+    cursor = news_col.find(query, {"_id": 1, "title": 1, "sentiment_score": 1}, batch_size=args.chunk_size).sort("_id", 1)
+    analyzed_at = datetime.utcnow().isoformat()
+    updated_count = 0
+    for chunk in iter_chunks(cursor, args.chunk_size):
+        totals = bulk_write_chunks(news_col, update_ops(chunk, args.batch_size, analyzed_at), args.chunk_size)
+        updated_count += totals["matched"]
+        print(f"[📦] {updated_count} articles traités…")
+
+    cache_stats = sentiment_cache.get_stats()
+    print(f"[🗃️] Cache sentiment : {cache_stats['hits']} hits / {cache_stats['misses']} misses")
+    print(f"[📌] {updated_count} articles mis à jour avec un sentiment et un score normalisé.")
+    return updated_count
+
+
+if __name__ == "__main__":
+    main()
+    close_client()
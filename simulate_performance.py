@@ -2,24 +2,28 @@
 # 🇩🇪 Fügt jedem Dokument ein zufälliges Performance-Feld hinzu
 # 🇬🇧 Adds a random performance field to each stock document
 
-from pymongo import MongoClient
-import os
 import random
 from dotenv import load_dotenv
 
+from core.database import close_client, get_db
+from core.regression_model import update_regression_model
+
 load_dotenv()
-mongo_uri = os.getenv("MONGO_URI")
 
-client = MongoClient(mongo_uri)
-db = client["gainers_db"]
-collection = db["yahoo_all_stocks"]
+collection = get_db()["yahoo_all_stocks"]
 
 updated_count = 0
+batch = []
 for doc in collection.find():
     performance = round(random.uniform(-5, 10), 2)  # simulate performance between -5% and +10%
     result = collection.update_one({"_id": doc["_id"]}, {"$set": {"performance": performance}})
     if result.modified_count > 0:
         updated_count += 1
+    batch.append({"price": doc.get("price"), "performance": performance})
+
+# 📈 Nouveau lot d’observations ajouté au modèle de régression persisté (sans réentraînement complet)
+model = update_regression_model(batch)
 
-client.close()
+close_client()
 print(f"[✅] {updated_count} documents mis à jour avec un champ 'performance'")
+print(f"[📈] Modèle de régression : {model.n} observations au total.")
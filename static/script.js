@@ -96,7 +96,8 @@ document.getElementById("uploadPortfolio").addEventListener("click", async () =>
   const formData = new FormData();
   formData.append("file", file);
 
-  const response = await fetch("/upload", {
+  // 📊 Le camembert est dessiné ici (Chart.js) : seules les données du graphique sont demandées
+  const response = await fetch("/upload?chart=json", {
     method: "POST",
     body: formData
   });
@@ -205,7 +206,12 @@ document.getElementById("aiForm").addEventListener("submit", async function (e)
   const gainers_list = allGainers.map(g => g._id);
   const transactions = "No recent transactions";
 
-  const response = await fetch("/ask-llm", {
+  const answerBox = document.getElementById("ottoAnswer");
+  answerBox.innerHTML = `<strong>Answer:</strong> <span id="ottoText"></span><br><span id="ottoMeta"></span>`;
+  document.getElementById("aiResponse").style.display = "block";
+
+  // 📡 Réponse diffusée token par token (Server-Sent Events)
+  const response = await fetch("/ask-llm-stream", {
     method: "POST",
     headers: { 'Content-Type': 'application/json' },
     body: JSON.stringify({
@@ -219,16 +225,34 @@ document.getElementById("aiForm").addEventListener("submit", async function (e)
     })
   });
 
-  const data = await response.json();
-  if (data.status === "success") {
-    document.getElementById("ottoAnswer").innerHTML = `
-      <strong>Answer:</strong> ${data.answer}<br>
-      <strong>Sharpe Classification:</strong> ${data.classification}
-    `;
-  } else {
-    document.getElementById("ottoAnswer").innerHTML = `<span class="text-danger">❌ ${data.message}</span>`;
+  if (!response.ok || !response.body) {
+    const data = await response.json().catch(() => ({ message: response.statusText }));
+    answerBox.innerHTML = `<span class="text-danger">❌ ${data.message}</span>`;
+    return;
+  }
+
+  const textBox = document.getElementById("ottoText");
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    const events = buffer.split("\n\n");
+    buffer = events.pop();
+    events.forEach(raw => {
+      const event = (raw.match(/^event: (.*)$/m) || [])[1];
+      const payload = JSON.parse((raw.match(/^data: (.*)$/m) || [])[1] || "{}");
+      if (event === "token") {
+        textBox.textContent += payload.text;
+      } else if (event === "meta") {
+        document.getElementById("ottoMeta").innerHTML = `<strong>Sharpe Classification:</strong> ${payload.classification}`;
+      } else if (event === "error") {
+        answerBox.innerHTML += `<br><span class="text-danger">❌ ${payload.message}</span>`;
+      }
+    });
   }
-  document.getElementById("aiResponse").style.display = "block";
 });
 
 // 📰 Sentiment buttons
@@ -0,0 +1,107 @@
+# test_advice_cache.py
+
+import threading
+import time
+import unittest
+
+from core import advice_cache
+
+
+class TestAdviceCache(unittest.TestCase):
+    def test_key_normalisation_and_version(self):
+        """
+        🇫🇷 Vérifie que la clé ignore casse/espaces mais dépend de la version des données.
+        🇩🇪 Prüft, dass der Schlüssel Groß-/Kleinschreibung ignoriert, aber von der Datenversion abhängt.
+        🇬🇧 Checks that the key ignores case/whitespace but depends on the data version.
+        """
+        self.assertEqual(advice_cache.make_key("Should I  buy?", "v1"), advice_cache.make_key("should i buy?", "v1"))
+        self.assertNotEqual(advice_cache.make_key("Should I buy?", "v1"), advice_cache.make_key("Should I buy?", "v2"))
+
+    def test_concurrent_identical_requests_generate_once(self):
+        """
+        🇬🇧 Checks that concurrent identical requests are coalesced into a single generation.
+        """
+        key = advice_cache.make_key("coalesce me", time.time())
+        calls = []
+
+        def slow_stream():
+            calls.append(1)
+            time.sleep(0.1)
+            yield "Stay "
+            yield "diversified."
+
+        answers = []
+        threads = [threading.Thread(target=lambda: answers.append("".join(advice_cache.cached_stream(key, slow_stream))))
+                   for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(answers, ["Stay diversified."] * 5)
+        self.assertEqual(list(advice_cache.cached_stream(key, slow_stream)), ["Stay diversified."])
+        self.assertEqual(len(calls), 1)
+
+    def test_failed_generation_is_not_cached(self):
+        """
+        🇬🇧 Checks that errors propagate and are not cached.
+        """
+        key = advice_cache.make_key("failing prompt", time.time())
+
+        def broken_stream():
+            raise RuntimeError("model crashed")
+            yield
+
+        with self.assertRaises(RuntimeError):
+            "".join(advice_cache.cached_stream(key, broken_stream))
+        self.assertIsNone(advice_cache.get(key))
+        self.assertEqual("".join(advice_cache.cached_stream(key, lambda: iter(["ok"]))), "ok")
+
+    def test_leader_failure_elects_one_new_leader(self):
+        """
+        🇬🇧 Checks that when the leader fails, a single waiter regenerates and the others wait on it.
+        """
+        key = advice_cache.make_key("flaky prompt", time.time())
+        calls, active, peak = [], [0], [0]
+        lock = threading.Lock()
+
+        def flaky_stream():
+            with lock:
+                calls.append(1)
+                first = len(calls) == 1
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            try:
+                time.sleep(0.2)
+                if first:
+                    raise RuntimeError("transient LLM error")
+                yield "Recovered."
+            finally:
+                with lock:
+                    active[0] -= 1
+
+        results = []
+
+        def ask():
+            try:
+                results.append("".join(advice_cache.cached_stream(key, flaky_stream)))
+            except RuntimeError as e:
+                results.append(str(e))
+
+        leader = threading.Thread(target=ask)
+        leader.start()
+        time.sleep(0.05)
+        waiters = [threading.Thread(target=ask) for _ in range(4)]
+        for t in waiters:
+            t.start()
+        for t in [leader] + waiters:
+            t.join()
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(peak[0], 1)
+        self.assertEqual(sorted(results), ["Recovered."] * 4 + ["transient LLM error"])
+
+
+if __name__ == "__main__":
+    unittest.main()
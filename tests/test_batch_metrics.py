@@ -0,0 +1,90 @@
+# test_batch_metrics.py
+
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from core import batch_metrics, market_snapshot, portfolio_utils, risk_engine
+from core.risk_engine import RiskModel
+
+DOCS = [
+    {"_id": "AAPL", "price": 190.0, "volume": 1e6, "market_cap": 3e12, "performance": 0.05},
+    {"_id": "TSLA", "price": 250.0, "volume": 2e6, "market_cap": 8e11, "performance": 0.12},
+    {"_id": "NVDA", "price": 900.0, "volume": 3e6, "market_cap": 2e12, "performance": 0.08},
+]
+
+
+class TestBatchMetrics(unittest.TestCase):
+    def setUp(self):
+        returns = np.random.default_rng(0).normal(0.001, 0.02, size=(250, 3))
+        self.model = RiskModel(["AAPL", "NVDA", "TSLA"], returns)
+        self.patches = [
+            mock.patch.object(market_snapshot, "get_snapshot", return_value=market_snapshot.build_snapshot(DOCS, 1)),
+            mock.patch.object(risk_engine, "get_risk_model", return_value=self.model),
+        ]
+        for patch in self.patches:
+            patch.start()
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+
+    def test_batch_matches_single_portfolio_path(self):
+        """
+        🇫🇷 Vérifie que le calcul en lot donne les mêmes métriques que le calcul portefeuille par portefeuille.
+        🇩🇪 Prüft, dass die Stapelberechnung dieselben Kennzahlen liefert wie die Einzelberechnung.
+        🇬🇧 Checks that batch results equal the per-portfolio risk engine results.
+        """
+        portfolios = [{"AAPL": 10, "TSLA": 5}, {"NVDA": 1, "XYZ": 3}, {"TSLA": 2, "AAPL": 1, "NVDA": 7}]
+        results = batch_metrics.evaluate(portfolios)
+        for portfolio, result in zip(portfolios, results):
+            risk = risk_engine.portfolio_risk(portfolio, 0.02)
+            self.assertAlmostEqual(result["volatility_used"], round(risk["volatility"], 4))
+            self.assertAlmostEqual(result["expected_return"], round(risk["expected_return"], 4))
+            self.assertAlmostEqual(result["sharpe_ratio"], round(risk["sharpe_ratio"], 4))
+            self.assertEqual(result["risk_contributions"], risk["risk_contributions"])
+            self.assertEqual(result["missing_symbols"], risk["missing_symbols"])
+        self.assertAlmostEqual(results[0]["average_performance"], round((0.05 * 10 + 0.12 * 5) / 15, 4))
+        # 📏 Numérateur du Sharpe : rendement annualisé du modèle de risque, pas la variation du jour
+        weights, _ = self.model.weights(portfolios[0])
+        self.assertAlmostEqual(results[0]["expected_return"], round(float(self.model.expected_return(weights)), 4))
+
+    def test_zero_volatility_uses_default_everywhere(self):
+        """
+        🇬🇧 Checks that a flat price history gives the same DEFAULT_VOLATILITY Sharpe in the batch,
+            single-portfolio and portfolio_utils paths.
+        """
+        returns = np.zeros((250, 3))
+        with mock.patch.object(risk_engine, "get_risk_model",
+                               return_value=RiskModel(["AAPL", "NVDA", "TSLA"], returns)):
+            result = batch_metrics.evaluate([{"AAPL": 10}])[0]
+            risk = risk_engine.portfolio_risk({"AAPL": 10}, 0.02)
+            legacy = portfolio_utils.compute_sharpe_ratio({"AAPL": 10}, {"AAPL": {"performance": 0.05}},
+                                                          risk_free_rate=0.02)
+
+        expected = (0.0 - 0.02) / risk_engine.DEFAULT_VOLATILITY
+        self.assertEqual((result["volatility_used"], result["volatility_source"]),
+                         (risk_engine.DEFAULT_VOLATILITY, "default"))
+        self.assertAlmostEqual(result["sharpe_ratio"], round(expected, 4))
+        self.assertIsNotNone(result["classification"])
+        self.assertEqual((risk["volatility"], risk["source"]), (risk_engine.DEFAULT_VOLATILITY, "default"))
+        self.assertAlmostEqual(risk["sharpe_ratio"], expected)
+        self.assertEqual(legacy, round((0.05 - 0.02) / risk_engine.DEFAULT_VOLATILITY, 2))
+
+    def test_streamed_chunks_keep_ids_and_errors(self):
+        """
+        🇬🇧 Checks that chunked streaming keeps ids in order and reports invalid items inline.
+        """
+        items = [{"id": f"client-{i}", "portfolio": {"AAPL": i + 1}} for i in range(5)]
+        items.insert(2, {"id": "broken", "portfolio": {}})
+        items.append({"portfolio": {"ZZZ": 1}})
+        results = list(batch_metrics.iter_evaluate(items, chunk_size=2))
+        self.assertEqual([r["id"] for r in results], [item.get("id", 6) for item in items])
+        self.assertEqual(results[2]["status"], "error")
+        self.assertEqual(results[-1]["status"], "error")
+        self.assertEqual(sum(r["status"] == "success" for r in results), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+# test_chart_service.py
+
+import base64
+import unittest
+from unittest import mock
+
+from core import chart_service
+
+
+class TestChartService(unittest.TestCase):
+    def setUp(self):
+        chart_service._cache.clear()
+
+    def test_formats_and_cache(self):
+        """
+        🇫🇷 Vérifie les trois formats et qu’un même résumé d’allocation est servi depuis le cache.
+        🇩🇪 Prüft die drei Formate und dass dieselbe Allokation aus dem Cache geliefert wird.
+        🇬🇧 Checks the three output formats and that an identical allocation is served from the cache.
+        """
+        summary = {"AAPL": 12, "MSFT": 5, "CASH": 0}
+        data = chart_service.render_allocation(summary, "json")
+        self.assertEqual(data["labels"], ["AAPL", "MSFT"])
+        self.assertEqual(data["percentages"], [70.59, 29.41])
+
+        png = chart_service.render_allocation(summary, "png")
+        self.assertTrue(base64.b64decode(png).startswith(b"\x89PNG"))
+        self.assertIn("<svg", chart_service.render_allocation(summary, "svg"))
+
+        hits = chart_service.get_stats()["cache_hits"]
+        with mock.patch.object(chart_service, "_render") as render:
+            self.assertEqual(chart_service.render_allocation({"MSFT": 5.0, "CASH": 0, "AAPL": 12}, "png"), png)
+            render.assert_not_called()
+        self.assertEqual(chart_service.get_stats()["cache_hits"], hits + 1)
+        with self.assertRaises(ValueError):
+            chart_service.render_allocation(summary, "gif")
+
+    def test_worker_reuses_one_figure(self):
+        """
+        🇬🇧 Checks that renders run on the pool, reuse one Figure per thread and never touch pyplot.
+        """
+        for i in range(1, 4):
+            chart_service.render_allocation({"AAPL": i, "MSFT": 1}, "svg")
+        figures = {chart_service._pool().submit(lambda: id(getattr(chart_service._local, "figure", None))).result()
+                   for _ in range(20)} - {id(None)}
+        self.assertTrue(1 <= len(figures) <= chart_service.CHART_WORKERS)
+        self.assertFalse(hasattr(chart_service._local, "figure"))
+
+        import matplotlib.pyplot as plt
+        self.assertEqual(plt.get_fignums(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
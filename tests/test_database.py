@@ -0,0 +1,83 @@
+# test_database.py
+
+import unittest
+from unittest import mock
+
+from core import database
+
+
+class TestDatabaseClient(unittest.TestCase):
+    def tearDown(self):
+        database.close_client()
+
+    def test_client_is_shared_within_process(self):
+        """
+        🇫🇷 Vérifie qu’un seul client (pool) est créé par processus.
+        🇩🇪 Prüft, dass pro Prozess nur ein Client (Pool) erstellt wird.
+        🇬🇧 Checks that a single pooled client is reused within a process (MongoClient connects lazily).
+        """
+        self.assertIs(database.get_client(), database.get_client())
+        self.assertEqual(database.get_db().name, database.DB_NAME)
+
+    def test_client_recreated_after_fork(self):
+        """
+        🇬🇧 Checks that a client inherited from another pid (fork) is not reused.
+        """
+        client = database.get_client()
+        database._client_pid = -1
+        self.assertIsNot(database.get_client(), client)
+        client.close()
+
+
+class TestSnapshotSwap(unittest.TestCase):
+    def test_swap_writes_staging_then_renames_and_prunes(self):
+        """
+        🇫🇷 Vérifie l’ordre staging → historique → rename atomique, et la purge des anciens snapshots.
+        🇩🇪 Prüft die Reihenfolge Staging → Historie → atomares Umbenennen und das Löschen alter Snapshots.
+        🇬🇧 Checks the staging → history → atomic rename order and the pruning of old snapshots.
+        """
+        db = mock.MagicMock()
+        db.list_collection_names.return_value = ["yahoo_gainers", "yahoo_gainers__v3", "yahoo_gainers__v12",
+                                                 "yahoo_gainers__v7", "yahoo_gainers__staging"]
+        staging = db.__getitem__.return_value
+        staging.name = "yahoo_gainers__staging"
+        docs = [{"_id": "AAPL", "price": 1.0}, {"_id": "MSFT", "price": 2.0}]
+
+        with mock.patch.object(database, "get_db", return_value=db):
+            snapshot = database.swap_collection("yahoo_gainers", docs, keep=2)
+
+        self.assertEqual(snapshot, "yahoo_gainers__v13")
+        db.__getitem__.assert_called_with("yahoo_gainers__staging")
+        self.assertEqual([c[0] for c in staging.method_calls], ["drop", "insert_many", "aggregate", "rename"])
+        staging.insert_many.assert_called_once_with(docs, ordered=False)
+        staging.aggregate.assert_called_once_with([{"$out": "yahoo_gainers__v13"}])
+        staging.rename.assert_called_once_with("yahoo_gainers", dropTarget=True)
+        self.assertEqual([c.args[0] for c in db.drop_collection.call_args_list],
+                         ["yahoo_gainers__v3", "yahoo_gainers__v7"])
+
+
+class TestBulkWrites(unittest.TestCase):
+    def test_bulk_write_chunks_and_pipeline_update(self):
+        """
+        🇬🇧 Checks unordered chunking of a streamed op iterator and the $switch pipeline update.
+        """
+        collection = mock.MagicMock()
+        collection.bulk_write.return_value = mock.Mock(matched_count=2, modified_count=1, upserted_count=0)
+        ops = (f"op{i}" for i in range(5))
+        totals = database.bulk_write_chunks(collection, ops, chunk_size=2)
+        self.assertEqual([c.args[0] for c in collection.bulk_write.call_args_list], [["op0", "op1"], ["op2", "op3"], ["op4"]])
+        self.assertTrue(all(c.kwargs == {"ordered": False} for c in collection.bulk_write.call_args_list))
+        self.assertEqual(totals, {"matched": 6, "modified": 3, "upserted": 0})
+
+        news = mock.MagicMock()
+        news.update_many.return_value.modified_count = 7
+        with mock.patch.object(database, "news_articles_collection", return_value=news):
+            self.assertEqual(database.apply_sentiment_scores({"positive": 1, "negative": -1}), 7)
+        query, pipeline = news.update_many.call_args.args
+        self.assertEqual(query["sentiment"], {"$in": ["positive", "negative"]})
+        branches = pipeline[0]["$set"]["sentiment_score"]["$switch"]["branches"]
+        self.assertEqual(branches[1], {"case": {"$eq": ["$sentiment", "negative"]}, "then": -1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+# test_http_fetcher.py
+
+import time
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import update_news
+from core.http_fetcher import ConditionalCache, Fetcher, TokenBucket
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """
+    🇬🇧 /page/<n> answers after a short delay; /flaky fails twice with 503 before answering;
+        /etag honours If-None-Match.
+    """
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.hits[self.path] = server.hits.get(self.path, 0) + 1
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+            hits = server.hits[self.path]
+        try:
+            time.sleep(0.05)
+            if self.path == "/flaky" and hits <= 2:
+                self.send_response(503)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            if self.path == "/etag" and self.headers.get("If-None-Match") == '"v1"':
+                self.send_response(304)
+                self.end_headers()
+                return
+            body = f"<p>{self.path}</p>".encode()
+            self.send_response(200)
+            if self.path == "/etag":
+                self.send_header("ETag", '"v1"')
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+class TestHttpFetcher(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+        self.server.lock = threading.Lock()
+        self.server.hits, self.server.active, self.server.peak = {}, 0, 0
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base = f"http://127.0.0.1:{self.server.server_port}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_concurrent_fetch_respects_host_cap_and_retries(self):
+        """
+        🇫🇷 Vérifie l’ordre des résultats, le plafond de connexions par hôte et les reprises après 503.
+        🇩🇪 Prüft die Ergebnisreihenfolge, die Verbindungsgrenze pro Host und Wiederholungen nach 503.
+        🇬🇧 Checks result order, the per-host concurrency cap and retry with backoff after 503s.
+        """
+        urls = [f"{self.base}/page/{i}" for i in range(12)] + [f"{self.base}/flaky"]
+        with Fetcher(workers=8, rate=1000, burst=100, per_host=3, retries=3, backoff=0.01) as fetcher:
+            start = time.perf_counter()
+            pages = fetcher.fetch_all(urls)
+            elapsed = time.perf_counter() - start
+            stats = fetcher.get_stats()
+
+        self.assertEqual([p.text for p in pages[:12]], [f"<p>/page/{i}</p>" for i in range(12)])
+        self.assertEqual(pages[-1].status_code, 200)
+        self.assertEqual(self.server.hits["/flaky"], 3)
+        self.assertEqual(stats["retries"], 2)
+        self.assertEqual(stats["failures"], 0)
+        self.assertLessEqual(self.server.peak, 3)
+        self.assertGreater(self.server.peak, 1)
+        # 13 pages de 50 ms, 3 en parallèle : bien moins que le temps séquentiel
+        self.assertLess(elapsed, 13 * 0.05)
+
+    def test_conditional_cache_short_circuits(self):
+        """
+        🇬🇧 Checks that a 304 and an identical body are reported unchanged once a page was processed.
+        """
+        urls = [f"{self.base}/etag", f"{self.base}/page/1"]
+        cache = ConditionalCache(urls, state={})
+        with Fetcher(rate=1000, burst=100) as fetcher, \
+                mock.patch("core.database.save_fetch_state", return_value=2) as save:
+            for url, resp in zip(urls, fetcher.fetch_all(urls, headers=cache.headers)):
+                self.assertFalse(cache.is_unchanged(url, resp))
+                cache.mark_processed(url, resp)
+            self.assertEqual(cache.save(), 2)
+            self.assertEqual(set(save.call_args[0][0]), set(urls))
+
+            self.assertEqual(cache.headers(urls[0]), {"If-None-Match": '"v1"'})
+            pages = fetcher.fetch_all(urls, headers=cache.headers)
+        self.assertEqual(pages[0].status_code, 304)
+        self.assertTrue(all(cache.is_unchanged(url, resp) for url, resp in zip(urls, pages)))
+        self.assertEqual(cache.short_circuited, 2)
+        self.assertEqual((cache.stats["not_modified"], cache.stats["unchanged"]), (1, 1))
+
+    def test_unchanged_pages_skip_general_news_fallback(self):
+        """
+        🇬🇧 Checks that unchanged quote pages do not trigger the general-news fallback, failed ones do.
+        """
+        not_modified = mock.Mock(status_code=304, ok=True)
+        fetcher = mock.Mock()
+        fetcher.fetch_all.return_value = [not_modified, not_modified]
+        self.assertEqual(update_news.scrape_news(["AAPL", "MSFT"], fetcher, ConditionalCache([], state={})), [])
+        fetcher.fetch.assert_not_called()
+
+        fetcher.fetch_all.return_value = [None, not_modified]
+        fetcher.fetch.return_value = not_modified
+        update_news.scrape_news(["AAPL", "MSFT"], fetcher, ConditionalCache([], state={}))
+        self.assertEqual(fetcher.fetch.call_args.args[0], update_news.GENERAL_NEWS_URL)
+
+    def test_retry_after_is_capped_and_parses_dates(self):
+        """
+        🇬🇧 Checks that Retry-After (seconds or HTTP date) is honoured but never beyond max_backoff.
+        """
+        from email.utils import formatdate
+
+        def throttled(value):
+            return mock.Mock(headers={"Retry-After": value})
+
+        with Fetcher(backoff=0.01, max_backoff=5) as fetcher:
+            self.assertEqual(fetcher._delay(0, throttled("2")), 2.0)
+            self.assertEqual(fetcher._delay(0, throttled("3600")), 5.0)
+            self.assertAlmostEqual(fetcher._delay(0, throttled(formatdate(time.time() + 3, usegmt=True))), 3, delta=1.1)
+            self.assertEqual(fetcher._delay(0, throttled(formatdate(time.time() + 7200, usegmt=True))), 5.0)
+            self.assertEqual(fetcher._delay(0, throttled(formatdate(time.time() - 60, usegmt=True))), 0.0)
+            self.assertLessEqual(fetcher._delay(0, throttled("soon")), 0.01)
+            self.assertEqual(fetcher._delay(20), 5.0)
+
+    def test_token_bucket_rate(self):
+        """
+        🇬🇧 Checks that after the burst, tokens are handed out at the configured rate.
+        """
+        bucket = TokenBucket(rate=50, burst=5)
+        start = time.perf_counter()
+        for _ in range(15):
+            bucket.acquire()
+        self.assertGreaterEqual(time.perf_counter() - start, 10 / 50 * 0.9)
+
+
+if __name__ == "__main__":
+    unittest.main()
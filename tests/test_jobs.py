@@ -0,0 +1,82 @@
+# test_jobs.py
+
+import os
+import time
+import tempfile
+import unittest
+
+from core import jobs
+
+
+def add(a, b):
+    return {"sum": a + b}
+
+
+def fail():
+    raise RuntimeError("boom")
+
+
+def nap(seconds):
+    time.sleep(seconds)
+    return {"slept": seconds}
+
+
+def wait_for(queue, job_id, statuses=jobs.FINISHED, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.status(job_id)
+        if job["status"] in statuses:
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"job {job_id} still {job['status']}")
+
+
+class TestJobQueue(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.queue = jobs.JobQueue(os.path.join(cls.tmp.name, "jobs.sqlite3"), workers=1,
+                                  tasks={"add": add, "fail": fail, "nap": nap})
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.queue.shutdown()
+        cls.tmp.cleanup()
+
+    def test_submit_status_result(self):
+        """
+        🇫🇷 Vérifie qu’une tâche est exécutée dans un processus worker et que son résultat est lisible.
+        🇩🇪 Prüft, dass ein Job in einem Worker-Prozess läuft und sein Ergebnis lesbar ist.
+        🇬🇧 Checks that a job runs in a worker process and that its JSON result can be read back.
+        """
+        job_id = self.queue.submit("add", {"a": 2, "b": 3})
+        job = wait_for(self.queue, job_id)
+        self.assertEqual(job["status"], jobs.DONE)
+        self.assertNotEqual(job["worker_pid"], os.getpid())
+        self.assertEqual(self.queue.result(job_id)[1], {"sum": 5})
+
+        failed = wait_for(self.queue, self.queue.submit("fail"))
+        self.assertEqual(failed["status"], jobs.FAILED)
+        self.assertIn("boom", failed["error"])
+        self.assertIsNone(self.queue.status("missing"))
+        with self.assertRaises(KeyError):
+            self.queue.submit("unknown")
+
+    def test_cancel(self):
+        """
+        🇬🇧 A queued job behind a busy worker never runs; a running job keeps its cancelled status.
+        """
+        running = self.queue.submit("nap", {"seconds": 1.0})
+        queued = self.queue.submit("add", {"a": 1, "b": 1})
+        wait_for(self.queue, running, statuses=(jobs.RUNNING,))
+
+        self.assertEqual(self.queue.cancel(queued)["status"], jobs.CANCELLED)
+        self.assertEqual(self.queue.cancel(running)["status"], jobs.CANCELLED)
+        time.sleep(1.5)
+        self.assertEqual(self.queue.status(running)["status"], jobs.CANCELLED)
+        self.assertEqual(self.queue.result(running)[1], None)
+        self.assertIsNone(self.queue.status(queued)["started_at"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+# test_market_snapshot.py
+
+import unittest
+from unittest import mock
+
+from core import market_snapshot
+
+DOCS = [
+    {"_id": "AAPL", "price": 190.0, "volume": 1e6, "market_cap": 3e12, "performance": 0.05},
+    {"_id": "TSLA", "price": 250.0, "volume": 2e6, "market_cap": 8e11, "performance": 0.12},
+]
+
+
+class TestMarketSnapshot(unittest.TestCase):
+    def setUp(self):
+        market_snapshot._snapshot = None
+        market_snapshot.invalidate()
+
+    def test_snapshot_is_read_only(self):
+        """
+        🇫🇷 Vérifie que le snapshot est indexé par symbole et non modifiable.
+        🇩🇪 Prüft, dass der Snapshot nach Symbol indiziert und unveränderlich ist.
+        🇬🇧 Checks that the snapshot is indexed by symbol and cannot be modified.
+        """
+        snapshot = market_snapshot.build_snapshot(DOCS, version=1)
+        self.assertEqual(snapshot.get("TSLA").performance, 0.12)
+        self.assertIsNone(snapshot.get("MSFT"))
+        with self.assertRaises(TypeError):
+            snapshot.quotes["MSFT"] = snapshot.get("AAPL")
+
+    def test_rebuilt_only_when_version_changes(self):
+        """
+        🇬🇧 Checks that the collection is reloaded only after the scrapers bump the version stamp.
+        """
+        versions = iter([1, 1, 2])
+        with mock.patch.object(market_snapshot.database, "get_snapshot_version", side_effect=lambda name: next(versions)), \
+                mock.patch.object(market_snapshot.database, "load_gainers_performance", return_value=DOCS) as load:
+            first = market_snapshot.get_snapshot()
+            market_snapshot.invalidate()
+            self.assertIs(market_snapshot.get_snapshot(), first)
+            market_snapshot.invalidate()
+            self.assertEqual(market_snapshot.get_snapshot().version, 2)
+        self.assertEqual(load.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+# test_model_registry.py
+
+import os
+import subprocess
+import sys
+import threading
+import time
+import unittest
+
+from core import model_registry
+
+
+class TestModelRegistry(unittest.TestCase):
+    def test_model_loaded_once_across_threads(self):
+        """
+        🇫🇷 Vérifie qu’un modèle n’est chargé qu’une seule fois même avec des accès concurrents.
+        🇩🇪 Prüft, dass ein Modell auch bei parallelen Zugriffen nur einmal geladen wird.
+        🇬🇧 Checks that a model is loaded only once under concurrent access.
+        """
+        calls = []
+
+        def loader():
+            calls.append(1)
+            time.sleep(0.05)
+            return object()
+
+        model_registry.register("test_once", loader)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(model_registry.get_model("test_once")))
+                   for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(r is results[0] for r in results))
+        self.assertTrue(model_registry.is_loaded("test_once"))
+
+    def test_latency_counters(self):
+        """
+        🇬🇧 Checks that timed() feeds the per-model call counters.
+        """
+        model_registry.register("test_timed", lambda: "model")
+        model_registry.get_model("test_timed")
+        for _ in range(3):
+            with model_registry.timed("test_timed"):
+                pass
+
+        stats = model_registry.get_stats()["models"]["test_timed"]
+        self.assertTrue(stats["loaded"])
+        self.assertEqual(stats["calls"], 3)
+        self.assertIsNotNone(stats["avg_seconds"])
+
+    def test_unknown_model(self):
+        with self.assertRaises(KeyError):
+            model_registry.get_model("does_not_exist")
+
+    def test_warm_up_registers_sentiment_backends(self):
+        """
+        🇬🇧 Checks, in a fresh interpreter (as in gunicorn's master), that warm_up registers the
+            sentiment_* loaders itself instead of relying on another module having imported them.
+        """
+        code = ("from core import model_registry as r; r.warm_up([]); "
+                "print(sorted(n for n in r._loaders if n.startswith('sentiment_')))")
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        out = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True)
+        self.assertEqual(out.stdout.strip(), "['sentiment_fp32', 'sentiment_int8', 'sentiment_onnx']")
+
+
+if __name__ == "__main__":
+    unittest.main()
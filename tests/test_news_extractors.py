@@ -0,0 +1,47 @@
+# test_news_extractors.py
+
+import os
+import unittest
+
+from core.news_extractors import EXTRACTORS, extract_links
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "..", "benchmarks", "fixtures", "yahoo_quote_AAPL.html")
+
+SNIPPET = (
+    '<ul><li class="x js-stream-content"><h3><a href="/a">A <b>1</b></a><a href="/z">Z</a></h3></li>'
+    '<li class="js-stream-content"><p><a href="/ad">Sponsored</a></p></li>'
+    '<li class="js-stream-contentish"><h3><a href="/no">No</a></h3></li>'
+    '<li class="js-stream-content"><div><h3>t</h3><h3><span><a href="/b">B &amp; C</a></span></h3></div></li></ul>'
+)
+
+
+class TestNewsExtractors(unittest.TestCase):
+    def test_extractors_agree_with_beautifulsoup(self):
+        """
+        🇫🇷 Vérifie que lxml et l’analyse incrémentale donnent exactement les liens de BeautifulSoup.
+        🇩🇪 Prüft, dass lxml und das inkrementelle Parsen genau die Links von BeautifulSoup liefern.
+        🇬🇧 Checks that the lxml and streaming extractors return exactly the BeautifulSoup links.
+        """
+        with open(FIXTURE, encoding="utf-8") as f:
+            page = f.read()
+        self.assertEqual(extract_links(SNIPPET, extractor="bs4"), [("A 1", "/a"), ("B & C", "/b")])
+        for html in (SNIPPET, page):
+            for limit in (None, 1, 3):
+                expected = extract_links(html, limit, "bs4")
+                for name in EXTRACTORS:
+                    self.assertEqual(extract_links(html, limit, name), expected, f"{name} limit={limit}")
+
+    def test_empty_pages_and_unknown_extractor(self):
+        """
+        🇬🇧 Checks empty input, a zero limit and the error for an unknown extractor name.
+        """
+        for name in EXTRACTORS:
+            self.assertEqual(extract_links("", extractor=name), [])
+            self.assertEqual(extract_links("<p>no news", extractor=name), [])
+            self.assertEqual(extract_links(SNIPPET, 0, name), [])
+        with self.assertRaises(ValueError):
+            extract_links(SNIPPET, extractor="regex")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+# test_optimizer.py
+
+import unittest
+
+import numpy as np
+
+from core import optimizer
+from core.risk_engine import RiskModel
+
+
+class TestOptimizer(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        returns = rng.normal(0.0008, 0.02, size=(252, 40)) + rng.normal(0, 0.01, size=(252, 1))
+        model = RiskModel([f"S{i}" for i in range(40)], returns)
+        self.mu, self.cov = model.mean, model.cov
+
+    def test_projection_onto_capped_simplex(self):
+        """
+        🇫🇷 Vérifie la projection exacte (somme 1, bornes respectées) contre une dichotomie de référence.
+        🇩🇪 Prüft die exakte Projektion (Summe 1, Grenzen eingehalten) gegen eine Referenz-Bisektion.
+        🇬🇧 Checks the exact projection (sums to 1, within bounds) against a reference bisection.
+        """
+        rng = np.random.default_rng(1)
+        for _ in range(200):
+            v, cap = rng.normal(size=12) * 3, 0.25
+            lo, hi = v.min() - cap - 1, v.max() + 1
+            for _ in range(200):
+                mid = (lo + hi) / 2
+                lo, hi = (mid, hi) if np.clip(v - mid, 0, cap).sum() >= 1 else (lo, mid)
+            np.testing.assert_allclose(optimizer.project_capped_simplex(v, cap), np.clip(v - lo, 0, cap), atol=1e-9)
+        with self.assertRaises(ValueError):
+            optimizer.project_capped_simplex(np.zeros(3), 0.2)
+
+    def test_min_variance_two_uncorrelated_assets(self):
+        """
+        🇬🇧 Checks the closed form w_i ∝ 1/σ_i² for two uncorrelated assets.
+        """
+        cov = np.diag([0.04, 0.01])
+        result = optimizer.min_variance(np.array([0.1, 0.05]), cov)
+        np.testing.assert_allclose(result["weights"], [0.2, 0.8], atol=1e-7)
+
+    def test_caps_target_and_max_sharpe(self):
+        """
+        🇬🇧 Checks long-only caps, the target return, and that max Sharpe beats every frontier point.
+        """
+        cap = 0.1
+        low = optimizer.min_variance(self.mu, self.cov, cap)
+        high = float(optimizer.max_return_weights(self.mu, cap) @ self.mu)
+        target = (low["expected_return"] + high) / 2
+        result = optimizer.target_return(self.mu, self.cov, target, cap)
+        self.assertGreaterEqual(result["expected_return"], target - 1e-6)
+        self.assertAlmostEqual(result["weights"].sum(), 1.0)
+        self.assertLessEqual(result["weights"].max(), cap + 1e-9)
+        self.assertGreaterEqual(result["weights"].min(), 0.0)
+        with self.assertRaises(ValueError):
+            optimizer.target_return(self.mu, self.cov, high + 1, cap)
+
+        best = optimizer.max_sharpe(self.mu, self.cov, cap)
+        frontier = optimizer.efficient_frontier(self.mu, self.cov, 30, cap)
+        self.assertGreaterEqual(best["sharpe_ratio"], max(p["sharpe_ratio"] for p in frontier) - 1e-3)
+        self.assertTrue(all(a["volatility"] <= b["volatility"] + 1e-9 for a, b in zip(frontier, frontier[1:])))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+# test_pipeline.py
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from collections import defaultdict
+from unittest import mock
+
+import auto_schedule
+import update_gainers
+import update_news
+from core import database, regression_model
+from core.pipeline import FAILED, OK, SKIPPED, Pipeline, Stage
+
+
+class FakeCollection:
+    def __init__(self, docs=()):
+        self.docs = list(docs)
+
+    def find(self, query=None, projection=None, **kwargs):
+        return list(self.docs)
+
+    def find_one(self, query=None, sort=None):
+        return self.docs[-1] if self.docs else None
+
+    def insert_one(self, doc):
+        self.docs.append({"_id": len(self.docs), **doc})
+
+
+class TestPipeline(unittest.TestCase):
+    def test_order_parallelism_and_failures(self):
+        """
+        🇫🇷 Vérifie l’ordre des dépendances, l’exécution parallèle des branches et le saut des étapes dépendantes d’un échec.
+        🇩🇪 Prüft Abhängigkeitsreihenfolge, parallele Zweige und das Überspringen von Stufen nach einem Fehler.
+        🇬🇧 Checks dependency order, parallel branches and skipping of the stages downstream of a failure.
+        """
+        events, lock = [], threading.Lock()
+
+        def step(name, seconds=0.0, fail=False):
+            def run():
+                with lock:
+                    events.append(("start", name))
+                time.sleep(seconds)
+                if fail:
+                    raise RuntimeError(f"{name} failed")
+                with lock:
+                    events.append(("end", name))
+            return run
+
+        pipeline = Pipeline("test", [
+            Stage("gainers", step("gainers", 0.2)),
+            Stage("news", step("news"), after=["gainers"]),
+            Stage("sentiment", step("sentiment", fail=True), after=["news"]),
+            Stage("averages", step("averages"), after=["sentiment"]),
+            Stage("all_stocks", step("all_stocks", 0.2)),
+        ])
+        record = pipeline.run()
+
+        self.assertEqual(record["status"], FAILED)
+        self.assertEqual({name: r["status"] for name, r in record["stages"].items()},
+                         {"gainers": OK, "news": OK, "sentiment": FAILED, "averages": SKIPPED, "all_stocks": OK})
+        self.assertIn("sentiment failed", record["stages"]["sentiment"]["error"])
+        self.assertLess(events.index(("end", "gainers")), events.index(("start", "news")))
+        # 🔀 all_stocks démarre avant la fin de gainers (branches indépendantes)
+        self.assertLess(events.index(("start", "all_stocks")), events.index(("end", "gainers")))
+        self.assertGreaterEqual(record["stages"]["gainers"]["seconds"], 0.2)
+
+        self.assertEqual(pipeline.select(["news"]), ["gainers", "news"])
+
+    def test_overlap_is_skipped(self):
+        """
+        🇬🇧 A run triggered while the previous one is in progress is skipped, not queued.
+        """
+        release = threading.Event()
+        pipeline = Pipeline("slow", [Stage("wait", lambda: release.wait(5))])
+        first = threading.Thread(target=pipeline.run)
+        first.start()
+        while not pipeline.is_running():
+            time.sleep(0.01)
+
+        self.assertIsNone(pipeline.run())
+        release.set()
+        first.join()
+        stats = pipeline.get_stats()
+        self.assertEqual((stats["runs"], stats["skipped_runs"], stats["running"]), (1, 1, False))
+
+    def test_invalid_graphs(self):
+        """
+        🇬🇧 Unknown dependencies and cycles are rejected when the pipeline is built.
+        """
+        with self.assertRaises(ValueError):
+            Pipeline("bad", [Stage("a", print, after=["missing"])])
+        with self.assertRaises(ValueError):
+            Pipeline("cycle", [Stage("a", print, after=["b"]), Stage("b", print, after=["a"])])
+
+    def test_failed_scrape_fails_the_stage(self):
+        """
+        🇬🇧 Checks that a real scraper stage whose request fails is recorded as failed and its dependents skipped.
+        """
+        news = mock.Mock()
+        pipeline = Pipeline("market", [
+            Stage("gainers", update_gainers.fetch_yahoo_gainers),
+            Stage("news", news, after=["gainers"]),
+        ])
+        fetcher = mock.MagicMock()
+        fetcher.__enter__.return_value.fetch.return_value = mock.Mock(ok=False, status_code=503)
+        with mock.patch.object(update_gainers, "ConditionalCache"), \
+                mock.patch.object(update_gainers, "Fetcher", return_value=fetcher), \
+                mock.patch.object(update_gainers, "replace_gainers") as replace:
+            record = pipeline.run()
+
+        self.assertEqual(record["stages"]["gainers"]["status"], FAILED)
+        self.assertIn("HTTP 503", record["stages"]["gainers"]["error"])
+        self.assertEqual(record["stages"]["news"]["status"], SKIPPED)
+        news.assert_not_called()
+        replace.assert_not_called()
+
+        # 📰 Aucune page de cotation téléchargée : l’étape news échoue aussi
+        offline = mock.Mock()
+        offline.fetch_all.return_value = [None, None]
+        with self.assertRaises(RuntimeError):
+            update_news.scrape_news(["AAPL", "MSFT"], offline, mock.Mock())
+
+    def test_averages_stage_feeds_the_regression_stage(self):
+        """
+        🇬🇧 Checks that the average written by the "averages" stage is the one the "regression" stage reads.
+        """
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root, ignore_errors=True)
+        path = os.path.join(root, "regression_model.npz")
+        db = defaultdict(FakeCollection)
+        db["avg_sentiment"] = FakeCollection([{"_id": 0, "avg_sentiment_score": -0.5}])
+        db["news_articles"] = FakeCollection([{"sentiment_score": 0.2}, {"sentiment_score": 0.6}])
+        pipeline = Pipeline("market", [
+            Stage("averages", auto_schedule.compute_avg_sentiment.main),
+            Stage("regression", lambda: regression_model.update_from_gainers(path=path), after=["averages"]),
+        ])
+        gainers = [{"_id": "A", "price": 10.0, "performance": 1.0}, {"_id": "B", "price": 20.0, "performance": 2.0}]
+        with mock.patch.object(database, "get_db", return_value=db), \
+                mock.patch.object(regression_model, "load_gainers_performance", return_value=gainers):
+            record = pipeline.run()
+            # 🔖 Nouveau document = nouvelle version des données d’Otto (app.market_data_version)
+            latest = database.latest_avg_sentiment()
+
+        self.assertEqual(record["status"], OK)
+        self.assertEqual((latest["_id"], latest["avg_sentiment_score"]), (1, 0.4))
+        model = regression_model.RegressionModel.load(path)
+        self.assertAlmostEqual(model.x_sum[1] / model.n, 0.4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+# test_portfolio_ingest.py
+
+import io
+import unittest
+from unittest import mock
+
+import pandas as pd
+from openpyxl import Workbook
+
+from core import portfolio_ingest
+
+CSV = (b"Date,Symbol,Quantity,Note\n"
+       b"2024-01-02,AAPL,10,buy\n"
+       b"2024-01-03,MSFT,abc,typo\n"
+       b"2024-01-04,AAPL,2.5,buy\n"
+       b"2024-01-05,,3,no symbol\n"
+       b"2024-01-06,TSLA,4,buy\n")
+
+
+class TestPortfolioIngest(unittest.TestCase):
+    def test_csv_chunks_match_single_pass(self):
+        """
+        🇫🇷 Vérifie l’agrégation CSV (colonnes en trop, quantité invalide, symbole vide) quelle que soit la taille des paquets.
+        🇩🇪 Prüft die CSV-Aggregation (zusätzliche Spalten, ungültige Menge, leeres Symbol) unabhängig von der Paketgröße.
+        🇬🇧 Checks CSV aggregation (extra columns, invalid quantity, empty symbol) for any chunk size.
+        """
+        single = portfolio_ingest.aggregate(io.BytesIO(CSV), "p.csv")
+        self.assertEqual(single["summary"], {"AAPL": 12.5, "MSFT": 0, "TSLA": 4})
+        self.assertEqual(single["rows"], 5)
+        chunked = portfolio_ingest.aggregate(io.BytesIO(CSV), "p.csv", chunk_rows=2)
+        self.assertEqual(chunked["summary"], single["summary"])
+
+    def test_excel(self):
+        """
+        🇬🇧 Reads only the Symbol / Quantity columns of an .xlsx upload, in chunks.
+        """
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.append(["Note", "Symbol", "Quantity"])
+        for row in (["a", "AAPL", 10], ["b", "TSLA", "7"], ["c", None, 3], ["d", "AAPL", 1]):
+            sheet.append(row)
+        body = io.BytesIO()
+        workbook.save(body)
+        body.seek(0)
+
+        result = portfolio_ingest.aggregate(body, "p.xlsx", chunk_rows=3)
+        self.assertEqual(result["summary"], {"AAPL": 11, "TSLA": 7})
+        self.assertEqual(result["rows"], 4)
+
+    def test_ragged_excel_rows(self):
+        """
+        🇬🇧 Rows shorter than the header (trailing empty cells dropped by the writer) are read as missing values.
+        """
+        workbook = mock.MagicMock()
+        workbook.active.iter_rows.return_value = iter([("Note", "Symbol", "Quantity"), ("a", "AAPL", 5), ("b",),
+                                                       ("c", "MSFT"), ("d", "AAPL", 1)])
+        with mock.patch("openpyxl.load_workbook", return_value=workbook):
+            result = portfolio_ingest.aggregate(io.BytesIO(b""), "p.xlsx", chunk_rows=2)
+        self.assertEqual(result["summary"], {"AAPL": 6, "MSFT": 0})
+        self.assertEqual(result["rows"], 4)
+        workbook.close.assert_called_once()
+
+    def test_legacy_xls_falls_back_to_pandas(self):
+        """
+        🇬🇧 .xls uploads are still accepted: read by pandas.read_excel, then aggregated in chunks.
+        """
+        frame = pd.DataFrame({"Symbol": ["AAPL", "TSLA", None, "AAPL"], "Quantity": ["10", "7", "3", "x"]},
+                             dtype="string")
+        with mock.patch.object(pd, "read_excel", return_value=frame) as read_excel:
+            result = portfolio_ingest.aggregate(io.BytesIO(b""), "legacy.XLS", chunk_rows=3)
+        self.assertEqual(read_excel.call_args.kwargs["usecols"], ["Symbol", "Quantity"])
+        self.assertEqual(result["summary"], {"AAPL": 10, "TSLA": 7})
+        self.assertEqual(result["rows"], 4)
+
+    def test_limits_and_errors(self):
+        """
+        🇬🇧 Oversized uploads raise UploadLimitError; unknown types or missing columns raise ValueError.
+        """
+        with self.assertRaises(portfolio_ingest.UploadLimitError):
+            portfolio_ingest.aggregate(io.BytesIO(CSV), "p.csv", chunk_rows=2, max_rows=3)
+        with self.assertRaises(portfolio_ingest.UploadLimitError):
+            portfolio_ingest.aggregate(io.BytesIO(CSV), "p.csv", max_symbols=2)
+        with self.assertRaises(ValueError):
+            portfolio_ingest.aggregate(io.BytesIO(CSV), "p.pdf")
+        with self.assertRaises(ValueError):
+            portfolio_ingest.aggregate(io.BytesIO(b"A,B\n1,2\n"), "p.csv")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+# test_price_store.py
+
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+import numpy as np
+
+from core import price_store
+
+DAY = price_store.DAY_SECONDS
+
+
+class TestPriceStore(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_append_only_and_idempotent(self):
+        """
+        🇫🇷 Vérifie que les barres déjà enregistrées sont ignorées et que la lecture est en lecture seule.
+        🇩🇪 Prüft, dass bereits gespeicherte Bars übersprungen werden und das Lesen schreibgeschützt ist.
+        🇬🇧 Checks that already stored bars are skipped and that reads are read-only memory maps.
+        """
+        ts = np.arange(5) * DAY
+        self.assertEqual(price_store.append_bars("aapl", ts, [1, 2, 3, 4, 5], root=self.root), 5)
+        self.assertEqual(price_store.append_bars("AAPL", ts, [1, 2, 3, 4, 5], root=self.root), 0)
+        self.assertEqual(price_store.append_bars("AAPL", [4 * DAY, 5 * DAY], [9, 6], root=self.root), 1)
+        bars = price_store.read_bars("AAPL", root=self.root)
+        np.testing.assert_array_equal(bars["close"], [1, 2, 3, 4, 5, 6])
+        with self.assertRaises(ValueError):
+            bars["close"][0] = 0.0
+        with self.assertRaises(ValueError):
+            price_store.append_bars("../etc", [0], [1.0], root=self.root)
+
+    def test_backfill_merges_older_bars(self):
+        """
+        🇬🇧 Checks that a backfill of older daily bars is merged into a symbol that already holds a newer scraped quote.
+        """
+        price_store.append_quotes([{"_id": "NVDA", "price": 130.0, "volume": 5.0}], ts=10 * DAY + 3600, root=self.root)
+        ts = np.arange(7, 11) * DAY
+        self.assertEqual(price_store.append_bars("NVDA", ts, [100, 110, 120, 125], [1, 2, 3, 4], root=self.root), 4)
+        self.assertEqual(price_store.append_bars("NVDA", ts, [100, 110, 120, 125], [1, 2, 3, 4], root=self.root), 0)
+
+        bars = price_store.read_bars("NVDA", root=self.root)
+        np.testing.assert_array_equal(bars["ts"], list(ts) + [10 * DAY + 3600])
+        np.testing.assert_array_equal(bars["close"], [100, 110, 120, 125, 130])
+        np.testing.assert_array_equal(bars["volume"], [1, 2, 3, 4, 5])
+        self.assertEqual(price_store.list_symbols(root=self.root), ["NVDA"])
+        self.assertEqual(len(price_store.daily_closes("NVDA", root=self.root)[0]), 4)
+
+    def test_merge_swap_is_atomic_for_readers(self):
+        """
+        🇬🇧 Checks that readers running during repeated merges never see a missing symbol or columns
+            from two different versions, and that appends after a merge go to the current version.
+        """
+        price_store.append_bars("AMD", [100 * DAY], [100.0], root=self.root)
+
+        def backfill():
+            for day in range(99, 59, -1):
+                price_store.append_bars("AMD", [day * DAY], [float(day)], root=self.root)
+
+        writer = threading.Thread(target=backfill)
+        writer.start()
+        seen = []
+        while writer.is_alive() or not seen:
+            bars = price_store.read_bars("AMD", root=self.root)
+            seen.append(len(bars["ts"]) > 0 and bool(np.array_equal(bars["close"], bars["ts"] // DAY)))
+        writer.join()
+
+        self.assertTrue(all(seen))
+        self.assertEqual(price_store.append_bars("AMD", [101 * DAY], [101.0], root=self.root), 1)
+        bars = price_store.read_bars("AMD", root=self.root)
+        np.testing.assert_array_equal(bars["close"], np.arange(60, 102))
+        self.assertEqual(sorted(e for e in os.listdir(os.path.join(self.root, "AMD")) if e != "current")[-1],
+                         os.readlink(os.path.join(self.root, "AMD", "current")))
+        self.assertEqual(len(os.listdir(os.path.join(self.root, "AMD"))), 3)
+
+    def test_partial_append_is_invisible(self):
+        """
+        🇬🇧 Checks that a crash after writing the value columns (ts not yet written) leaves no partial bar.
+        """
+        price_store.append_bars("MSFT", [0, DAY], [10.0, 11.0], [1.0, 2.0], root=self.root)
+        with open(os.path.join(self.root, "MSFT", "close.f8"), "ab") as f:
+            f.write(np.array([99.0]).tobytes())
+        self.assertEqual(len(price_store.read_bars("MSFT", root=self.root)["ts"]), 2)
+        price_store.append_bars("MSFT", [2 * DAY], [12.0], [3.0], root=self.root)
+        np.testing.assert_array_equal(price_store.read_bars("MSFT", root=self.root)["close"], [10, 11, 12])
+
+    def test_return_matrix_alignment(self):
+        """
+        🇬🇧 Checks daily-close aggregation of intraday bars, forward-filled gaps and NaN without history.
+        """
+        price_store.append_bars("A", [0, DAY, DAY + 60, 2 * DAY], [100, 101, 110, 121], root=self.root)
+        price_store.append_bars("B", [0, 2 * DAY], [50, 55], root=self.root)
+        dates, returns = price_store.return_matrix(["A", "B", "C"], root=self.root)
+        self.assertEqual(returns.shape, (2, 3))
+        np.testing.assert_allclose(returns[:, 0], [0.1, 0.1])
+        np.testing.assert_allclose(returns[:, 1], [0.0, 0.1])
+        self.assertTrue(np.isnan(returns[:, 2]).all())
+        self.assertEqual(str(dates[-1]), "1970-01-03")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+# test_regression_model.py
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from core import regression_model
+from core.regression_model import RegressionModel
+
+
+class TestRegressionModel(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.path = os.path.join(self.root, "regression_model.npz")
+        rng = np.random.default_rng(0)
+        self.X = np.column_stack([rng.uniform(5, 500, 300), rng.choice([-0.4, 0.1, 0.6], 300)])
+        self.y = 2.0 - 0.01 * self.X[:, 0] + 3.0 * self.X[:, 1] + rng.normal(0, 0.5, 300)
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_incremental_fit_matches_sklearn(self):
+        """
+        🇫🇷 Vérifie que l’ajout par lots donne les mêmes coefficients que sklearn LinearRegression sur tout l’échantillon.
+        🇩🇪 Prüft, dass das stapelweise Anpassen dieselben Koeffizienten wie sklearn LinearRegression liefert.
+        🇬🇧 Checks that batch-by-batch accumulation gives sklearn's LinearRegression coefficients,
+            including the degenerate case of a constant sentiment column.
+        """
+        from sklearn.linear_model import LinearRegression
+
+        model = RegressionModel()
+        for rows in np.array_split(np.arange(300), 7):
+            model.partial_fit(self.X[rows], self.y[rows])
+        reference = LinearRegression().fit(self.X, self.y)
+        np.testing.assert_allclose(model.coef_, reference.coef_, atol=1e-8)
+        self.assertAlmostEqual(model.intercept_, reference.intercept_, places=8)
+
+        constant = self.X.copy()
+        constant[:, 1] = 0.3
+        model = RegressionModel().partial_fit(constant, self.y)
+        reference = LinearRegression().fit(constant, self.y)
+        np.testing.assert_allclose(model.predict(constant), reference.predict(constant), atol=1e-8)
+
+    def test_persistence_and_batched_predictions(self):
+        """
+        🇬🇧 Checks the save/load round trip, the skipped duplicate batch and scalar vs batched predictions.
+        """
+        docs = [{"price": p, "performance": y} for p, y in zip(self.X[:, 0], self.y)]
+        first = regression_model.update_regression_model(docs[:150], 0.2, path=self.path)
+        again = regression_model.update_regression_model(docs[:150], 0.2, path=self.path)
+        self.assertEqual(again.n, 150)
+        self.assertEqual(again.fingerprint, first.fingerprint)
+        second = regression_model.update_regression_model(docs[150:] + [{"price": "n/a"}], -0.1, path=self.path)
+        self.assertEqual(second.n, 300)
+
+        loaded = RegressionModel.load(self.path)
+        np.testing.assert_allclose(loaded.coef_, second.coef_)
+        self.assertEqual(loaded.fingerprint, second.fingerprint)
+
+        with mock.patch.object(regression_model, "REGRESSION_MODEL_PATH", self.path), \
+                mock.patch.object(regression_model, "_model", None), \
+                mock.patch.object(regression_model, "_model_mtime", None):
+            prices, sentiment = np.array([10.0, 100.0, 250.0]), np.array([0.0, 0.5, -0.2])
+            batched = regression_model.predict_performance(prices, sentiment)
+            single = [regression_model.predict_performance(float(p), float(s)) for p, s in zip(prices, sentiment)]
+            self.assertIsInstance(single[0], float)
+            np.testing.assert_allclose(batched, single)
+            np.testing.assert_allclose(batched, np.round(loaded.predict(np.column_stack([prices, sentiment])), 2))
+
+    def test_scheduled_update_folds_only_new_snapshots(self):
+        """
+        🇬🇧 Checks that the scheduler stage folds each new gainers snapshot once, without re-reading older data.
+        """
+        snapshots = [
+            [{"_id": "A", "price": 10.0, "performance": 1.0}, {"_id": "B", "price": 20.0, "performance": 2.5}],
+            [{"_id": "A", "price": 11.0, "performance": 0.5}],
+        ]
+        with mock.patch.object(regression_model, "get_avg_sentiment_score", return_value=0.1), \
+                mock.patch.object(regression_model, "find_stocks_with_performance") as full_scan, \
+                mock.patch.object(regression_model, "load_gainers_performance", side_effect=[
+                    snapshots[0], snapshots[0], snapshots[1]]):
+            counts = [regression_model.update_from_gainers(path=self.path).n for _ in snapshots + [None]]
+        self.assertEqual(counts, [2, 2, 3])
+        full_scan.assert_not_called()
+
+    def test_gainers_fold_in_percent_with_per_row_sentiment(self):
+        """
+        🇬🇧 Checks that gainers are folded as percent changes, that a batch-constant sentiment gets no
+            weight (instead of being split with the intercept) and that predict_price has no fallback.
+        """
+        gainers = [{"_id": "A", "price": 110.0, "performance": 10.0, "percent_change": 10.0},
+                   {"_id": "B", "price": 52.0, "performance": 2.0}]
+        self.assertEqual([row["performance"] for row in regression_model.percent_performance(gainers)], [10.0, 4.0])
+
+        docs = [{"price": p, "performance": y} for p, y in zip(self.X[:, 0], self.y)]
+        model = regression_model.update_regression_model(docs[:150], 0.2, path=self.path)
+        self.assertAlmostEqual(model.coef_[1], 0.0, places=12)
+        price_only = np.polyfit(self.X[:150, 0], self.y[:150], 1)
+        self.assertAlmostEqual(model.coef_[0], price_only[0], places=8)
+        self.assertAlmostEqual(model.intercept_, price_only[1], places=8)
+        later = [dict(doc, avg_sentiment=-0.4) for doc in docs[150:]]
+        self.assertNotEqual(regression_model.update_regression_model(later, 0.2, path=self.path).coef_[1], 0.0)
+
+        import pandas as pd
+        with mock.patch.object(regression_model, "REGRESSION_MODEL_PATH", os.path.join(self.root, "missing.npz")), \
+                mock.patch.object(regression_model, "_model", None):
+            self.assertIsNone(regression_model.predict_price(pd.DataFrame({"price": [10.0], "avg_sentiment": [0.5]})))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+# test_risk_engine.py
+
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from core import portfolio_utils
+from core.risk_engine import DEFAULT_VOLATILITY, TRADING_DAYS, RiskModel
+
+
+class TestRiskEngine(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.returns = rng.normal(0.001, 0.02, size=(250, 4))
+        self.model = RiskModel(["AAPL", "MSFT", "NVDA", "TSLA"], self.returns, shrinkage=0.0)
+
+    def test_volatility_matches_portfolio_return_series(self):
+        """
+        🇫🇷 Vérifie que sqrt(w'Σw) correspond à l’écart-type annualisé des rendements du portefeuille.
+        🇩🇪 Prüft, dass sqrt(w'Σw) der annualisierten Standardabweichung der Portfoliorenditen entspricht.
+        🇬🇧 Checks that sqrt(w'Σw) equals the annualised std of the portfolio return series.
+        """
+        weights, missing = self.model.weights({"AAPL": 10, "TSLA": 30, "XYZ": 5})
+        expected = np.std(self.returns @ weights, ddof=1) * np.sqrt(TRADING_DAYS)
+        self.assertAlmostEqual(float(self.model.volatility(weights)), expected, places=10)
+        self.assertEqual(missing, ["XYZ"])
+
+    def test_batch_and_risk_contributions(self):
+        """
+        🇬🇧 Checks that K portfolios at once give the per-portfolio results and contributions sum to 1.
+        """
+        batch = np.random.default_rng(1).dirichlet(np.ones(4), size=100)
+        vols = self.model.volatility(batch)
+        self.assertAlmostEqual(float(vols[7]), float(self.model.volatility(batch[7])), places=12)
+        np.testing.assert_allclose(self.model.risk_contributions(batch).sum(axis=1), 1.0)
+
+    def test_missing_history_is_ignored_pairwise(self):
+        """
+        🇬🇧 Checks that NaN gaps (short histories) do not propagate into the covariance.
+        """
+        returns = self.returns.copy()
+        returns[:100, 2] = np.nan
+        model = RiskModel(["AAPL", "MSFT", "NVDA", "TSLA"], returns)
+        self.assertTrue(np.isfinite(model.cov).all())
+        self.assertAlmostEqual(model.cov[2, 2], np.var(returns[100:, 2], ddof=1) * TRADING_DAYS)
+
+    def test_sharpe_with_zero_volatility_uses_default(self):
+        """
+        🇬🇧 Checks that a flat history (zero volatility) falls back to DEFAULT_VOLATILITY instead of dividing by zero.
+        """
+        flat = {"volatility": 0.0, "sharpe_ratio": None}
+        with mock.patch.object(portfolio_utils, "portfolio_risk", return_value=flat):
+            sharpe = portfolio_utils.compute_sharpe_ratio({"AAPL": 10}, {"AAPL": {"performance": 0.05}})
+        self.assertEqual(sharpe, round((0.05 - 0.01) / DEFAULT_VOLATILITY, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+# test_scoring.py
+
+import unittest
+
+import numpy as np
+
+from core.classifier import classify_sharpe, classify_sharpe_array
+from core.risk_engine import TRADING_DAYS, market_betas
+
+
+class TestVectorisedScoring(unittest.TestCase):
+    def test_classify_array_matches_scalar(self):
+        """
+        🇫🇷 Vérifie que la classification vectorisée donne les mêmes étiquettes que la version scalaire, bornes incluses.
+        🇩🇪 Prüft, dass die vektorisierte Klassifizierung dieselben Labels wie die skalare liefert, inkl. Grenzen.
+        🇬🇧 Checks that the vectorised labels equal the scalar ones, including thresholds and NaN.
+        """
+        ratios = [-0.5, 0.0, 0.3, 0.5, 0.9, 1.0, 1.2, 1.5, 1.8, float("nan")]
+        labels = classify_sharpe_array(ratios)
+        self.assertEqual(list(labels), [classify_sharpe(r) for r in ratios])
+        self.assertEqual(classify_sharpe(0.0), "🔴 Faible — Retour insuffisant pour le niveau de risque")
+        self.assertEqual(labels[-1], "🟣 Excellent — Portefeuille très performant")
+
+    def test_market_betas_match_ols(self):
+        """
+        🇬🇧 Checks the one-pass betas against np.polyfit, with missing days ignored pairwise.
+        """
+        rng = np.random.default_rng(0)
+        market = rng.normal(0.0005, 0.01, 300)
+        true_beta = np.array([0.5, 1.0, 1.8])
+        returns = market[:, None] * true_beta + rng.normal(0, 0.005, (300, 3))
+        returns[:120, 2] = np.nan
+        alpha, beta, observations = market_betas(returns, market)
+        for j in range(3):
+            rows = ~np.isnan(returns[:, j])
+            slope, intercept = np.polyfit(market[rows], returns[rows, j], 1)
+            self.assertAlmostEqual(beta[j], slope, places=10)
+            self.assertAlmostEqual(alpha[j], intercept * TRADING_DAYS, places=10)
+        self.assertEqual(list(observations), [300, 300, 180])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+# test_sentiment_cache.py
+
+import tempfile
+import unittest
+
+from core import sentiment_cache
+
+
+class TestSentimentCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self._saved = (sentiment_cache.CACHE_DIR, sentiment_cache._cache, sentiment_cache.CACHE_ENABLED)
+        sentiment_cache.CACHE_DIR = self.tmp.name
+        sentiment_cache.CACHE_ENABLED = True
+        sentiment_cache._cache = None
+
+    def tearDown(self):
+        if sentiment_cache._cache is not None:
+            sentiment_cache._cache.close()
+        sentiment_cache.CACHE_DIR, sentiment_cache._cache, sentiment_cache.CACHE_ENABLED = self._saved
+        self.tmp.cleanup()
+
+    def test_normalise_title(self):
+        """
+        🇫🇷 Vérifie que les espaces et variantes Unicode sont normalisés.
+        🇩🇪 Prüft die Normalisierung von Leerzeichen und Unicode-Varianten.
+        🇬🇧 Checks whitespace and Unicode normalisation of titles.
+        """
+        self.assertEqual(sentiment_cache.normalise_title("  Apple beats   estimates \n"), "Apple beats estimates")
+        self.assertEqual(sentiment_cache.normalise_title(None), "")
+        self.assertEqual(sentiment_cache.cache_key("m", "a  b"), sentiment_cache.cache_key("m", "a b"))
+        self.assertNotEqual(sentiment_cache.cache_key("m1", "a b"), sentiment_cache.cache_key("m2", "a b"))
+
+    def test_hits_and_misses(self):
+        """
+        🇬🇧 Checks that stored results are returned and counted as hits.
+        """
+        result = {"label": "positive", "score": 0.9, "probs": [0.05, 0.05, 0.9]}
+        before = sentiment_cache.get_stats()
+        self.assertEqual(sentiment_cache.get_many("m", ["Stocks rally"]), {})
+        sentiment_cache.set_many("m", {"Stocks rally": result})
+        self.assertEqual(sentiment_cache.get_many("m", ["Stocks rally", "Other"]), {"Stocks rally": result})
+
+        stats = sentiment_cache.get_stats()
+        self.assertEqual(stats["hits"] - before["hits"], 1)
+        self.assertEqual(stats["misses"] - before["misses"], 2)
+        self.assertEqual(stats["entries"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
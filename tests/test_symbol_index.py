@@ -0,0 +1,63 @@
+# test_symbol_index.py
+
+import unittest
+from unittest import mock
+
+from core import symbol_index
+from core.symbol_index import SymbolIndex
+
+DOCS = [
+    {"_id": "AAPL", "name": "Apple Inc."},
+    {"_id": "AAP", "name": "Advance Auto Parts, Inc."},
+    {"_id": "AA", "name": "Alcoa Corporation"},
+    {"_id": "APLE", "name": "Apple Hospitality REIT, Inc."},
+    {"_id": "MSFT", "name": "Microsoft Corporation"},
+    {"_id": "PINE", "name": "Alpine Income Property Trust"},
+]
+
+
+class TestSymbolIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = SymbolIndex(DOCS, version=1)
+
+    def symbols(self, query, limit=5):
+        return [doc["_id"] for doc in self.index.lookup(query, limit)]
+
+    def test_ranking_tiers(self):
+        """
+        🇫🇷 Vérifie l’ordre : ticker exact > préfixe du ticker > préfixe d’un mot du nom > approximatif.
+        🇩🇪 Prüft die Reihenfolge: exakter Ticker > Ticker-Präfix > Wortpräfix im Namen > unscharf.
+        🇬🇧 Checks the ranking: exact ticker > ticker prefix > name word prefix > fuzzy.
+        """
+        self.assertEqual(self.symbols("aa"), ["AA", "AAP", "AAPL"])
+        self.assertEqual(self.symbols("apple"), ["AAPL", "APLE"])
+        self.assertEqual(self.symbols("apple hosp"), ["APLE", "AAPL"])
+        self.assertEqual(self.symbols("corp"), ["AA", "MSFT"])
+        self.assertEqual(self.symbols("microsfot"), ["MSFT"])
+        self.assertEqual(self.symbols("aa", limit=2), ["AA", "AAP"])
+
+    def test_user_input_is_not_a_pattern(self):
+        """
+        🇬🇧 Checks that regex metacharacters are plain text and never match everything.
+        """
+        for query in (".*", "(", "[]", "^$", "   "):
+            self.assertEqual(self.symbols(query), [], query)
+        self.assertEqual(self.symbols("micro(*"), ["MSFT"])
+
+    def test_rebuilt_only_when_version_changes(self):
+        """
+        🇬🇧 Checks that the index is rebuilt when the all_stocks stamp changes, and only then.
+        """
+        versions = iter([1, 1, 2])
+        with mock.patch.object(symbol_index, "_index", None), \
+                mock.patch.object(symbol_index, "SNAPSHOT_CHECK_INTERVAL", 0), \
+                mock.patch.object(symbol_index.database, "get_snapshot_version", side_effect=lambda name: next(versions)), \
+                mock.patch.object(symbol_index.database, "load_all_stocks", return_value=DOCS) as load:
+            first = symbol_index.get_index()
+            self.assertIs(symbol_index.get_index(), first)
+            self.assertEqual(symbol_index.get_index().version, 2)
+            self.assertEqual(load.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
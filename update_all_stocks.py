@@ -1,16 +1,13 @@
-import requests
-from pymongo import MongoClient
+import sys
 from datetime import datetime
-import os
+from urllib.parse import urlencode
 from dotenv import load_dotenv
 
-load_dotenv()
+from core import price_store
+from core.database import close_client, replace_all_stocks
+from core.http_fetcher import ConditionalCache, Fetcher
 
-# 🌐 Paramètres MongoDB
-MONGO_URI = os.getenv("MONGO_URI")
-client = MongoClient(MONGO_URI)
-db = client["gainers_db"]
-collection = db["yahoo_all_stocks"]
+load_dotenv()
 
 # 📡 API Yahoo Finance (most active)
 API_URL = "https://query1.finance.yahoo.com/v1/finance/screener/predefined/saved"
@@ -56,27 +53,46 @@ def transform_quote(quote):
         return None
 
 def main():
+    """
+    🇫🇷 Remplace yahoo_all_stocks par les actions les plus actives ; lève une exception en cas d’échec.
+    🇩🇪 Ersetzt yahoo_all_stocks durch die aktivsten Aktien; löst bei einem Fehler eine Ausnahme aus.
+    🇬🇧 Replaces yahoo_all_stocks with the most active stocks. Raises on any failure so the
+        scheduler (auto_schedule.py) records the stage as failed.
+    """
     print("\n[🔍] Requête API Yahoo Finance...")
 
-    try:
-        response = requests.get(API_URL, headers=HEADERS, params=PARAMS)
-        data = response.json()
+    url = f"{API_URL}?{urlencode(PARAMS)}"
+    cache = ConditionalCache([url])
 
-        quotes = data["finance"]["result"][0]["quotes"]
-        print(f"[✅] {len(quotes)} actions reçues via l'API.")
+    with Fetcher(workers=1, headers=HEADERS) as fetcher:
+        response = fetcher.fetch(url, headers=cache.headers(url))
+    if response is None or not response.ok:
+        raise RuntimeError(f"Request failed: {'no response' if response is None else f'HTTP {response.status_code}'}")
+    if cache.is_unchanged(url, response):
+        print(f"[⏭️] Réponse inchangée, 'yahoo_all_stocks' non modifiée — {cache.summary()}")
+        return
+    data = response.json()
 
-        transformed = [transform_quote(q) for q in quotes]
-        cleaned = [q for q in transformed if q is not None]
+    quotes = data["finance"]["result"][0]["quotes"]
+    print(f"[✅] {len(quotes)} actions reçues via l'API.")
 
-        if not cleaned:
-            print("[⚠️] Aucune action valide à enregistrer.")
-            return
+    transformed = [transform_quote(q) for q in quotes]
+    cleaned = [q for q in transformed if q is not None]
 
-        collection.delete_many({})
-        collection.insert_many(cleaned)
-        print(f"[📦] {len(cleaned)} actions enregistrées dans la collection 'yahoo_all_stocks'.")
-    except Exception as e:
-        print(f"[❌] Erreur globale : {e}")
+    if not cleaned:
+        raise RuntimeError("Aucune action valide à enregistrer.")
+
+    replace_all_stocks(cleaned)
+    print(f"[📦] {len(cleaned)} actions enregistrées dans la collection 'yahoo_all_stocks'.")
+    print(f"[📼] {price_store.append_quotes(cleaned)} barres ajoutées à l’historique local.")
+    cache.mark_processed(url, response)
+    cache.save()
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    except Exception as e:
+        print(f"[❌] Erreur globale : {e}")
+        sys.exit(1)
+    finally:
+        close_client()
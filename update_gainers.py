@@ -1,49 +1,47 @@
-import requests
-import os
+import sys
 from dotenv import load_dotenv
-from pymongo import MongoClient
 from datetime import datetime, timezone
 
+from core import price_store
+from core.database import close_client, replace_gainers
+from core.http_fetcher import ConditionalCache, Fetcher
+
 # 🇫🇷 Chargement des variables d’environnement (.env)
 load_dotenv()
 
-# 🇩🇪 Verbindung zur MongoDB-Datenbank
-MONGO_URI = os.getenv("MONGO_URI")
-client = MongoClient(MONGO_URI)
-db = client["gainers_db"]
-collection = db["yahoo_gainers"]
-
 # 🇬🇧 Yahoo Finance API endpoint for top gainers
 YF_API = "https://query1.finance.yahoo.com/v1/finance/screener/predefined/saved?scrIds=day_gainers&count=25"
 
 def fetch_yahoo_gainers():
+    """
+    🇫🇷 Remplace yahoo_gainers par les gagnants du jour ; lève une exception en cas d’échec.
+    🇩🇪 Ersetzt yahoo_gainers durch die Tagesgewinner; löst bei einem Fehler eine Ausnahme aus.
+    🇬🇧 Replaces yahoo_gainers with today's gainers. Raises on any failure so the scheduler
+        (auto_schedule.py) records the stage as failed and skips the stages that read gainers.
+    """
     print("[INFO] Scraping Yahoo Finance via API…")
-    headers = {
-        "User-Agent": "Mozilla/5.0"
-    }
+    # 🏷️ Requête conditionnelle : réponse identique au dernier passage → rien à réécrire
+    cache = ConditionalCache([YF_API])
 
-    try:
-        response = requests.get(YF_API, headers=headers)
-        data = response.json()
-    except Exception as e:
-        print(f"[❌] Request failed: {e}")
+    with Fetcher(workers=1) as fetcher:
+        response = fetcher.fetch(YF_API, headers=cache.headers(YF_API))
+    if response is None or not response.ok:
+        raise RuntimeError(f"Request failed: {'no response' if response is None else f'HTTP {response.status_code}'}")
+    if cache.is_unchanged(YF_API, response):
+        print(f"[⏭️] Réponse inchangée, MongoDB non modifiée — {cache.summary()}")
         return
+    data = response.json()
 
     if "finance" not in data or "result" not in data["finance"]:
-        print("[❌] Format inattendu.")
-        return
+        raise RuntimeError("Format inattendu.")
 
     results = data["finance"]["result"][0].get("quotes", [])
     print(f"[INFO] {len(results)} gagnants trouvés.")
 
     if not results:
-        print("[⚠️] Aucun gagnant trouvé, la collection MongoDB n’a PAS été modifiée.")
-        return
-
-    # 💥 Suppression des anciens documents
-    collection.delete_many({})
-    print("[INFO] Ancienne collection vidée.")
+        raise RuntimeError("Aucun gagnant trouvé, la collection MongoDB n’a PAS été modifiée.")
 
+    docs = []
     for item in results:
         try:
             doc = {
@@ -60,14 +58,29 @@ def fetch_yahoo_gainers():
             if doc["price"] is None:
                 raise ValueError("Pas de prix valide")
 
-            collection.insert_one(doc)
+            docs.append(doc)
             print(f"[✓] {doc['_id']} à {doc['price']} USD")
 
         except Exception as e:
             print(f"[!] Erreur {item.get('symbol')}: {e}")
 
-    print(f"[🧾] Total documents MongoDB : {collection.count_documents({})}")
+    if not docs:
+        raise RuntimeError("Aucun gagnant valide, la collection MongoDB n’a PAS été modifiée.")
+
+    # 💥 Remplacement des anciens documents (un seul insert_many)
+    total = replace_gainers(docs)
+    print(f"[🧾] Total documents MongoDB : {total}")
+    # 📼 Historique local : une barre par symbole à chaque passage
+    print(f"[📼] {price_store.append_quotes(docs)} barres ajoutées à l’historique local.")
+    cache.mark_processed(YF_API, response)
+    cache.save()
     print("[✅] Import via API terminé.")
 
 if __name__ == "__main__":
-    fetch_yahoo_gainers()
+    try:
+        fetch_yahoo_gainers()
+    except Exception as e:
+        print(f"[❌] {e}")
+        sys.exit(1)
+    finally:
+        close_client()
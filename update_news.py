@@ -1,97 +1,126 @@
 # update_news.py
 
-import os
+import sys
 import time
 from dotenv import load_dotenv
 from datetime import datetime
-from pymongo import MongoClient, UpdateOne
-import requests
-from bs4 import BeautifulSoup
+from pymongo import UpdateOne
+
+from core.database import close_client, list_gainer_symbols, news_by_symbol_collection
+from core.http_fetcher import ConditionalCache, Fetcher
+from core.news_extractors import extract_links
 
 load_dotenv()
-MONGO_URI = os.getenv("MONGO_URI")
 
-# Connexion MongoDB
-client = MongoClient(MONGO_URI)
-db = client["gainers_db"]
-gainers_col = db["yahoo_gainers"]
-news_col = db["news_by_symbol"]
+QUOTE_URL = "https://finance.yahoo.com/quote/{symbol}?p={symbol}"
+GENERAL_NEWS_URL = "https://finance.yahoo.com/topic/latest-news"
 
-# Récupération des symboles (🇫🇷 sauvegardés sous "_id")
-symbols = [doc["_id"] for doc in gainers_col.find({}, {"_id": 1})]
 
-# 🇬🇧 Scrape latest news per symbol from Yahoo Finance
-def scrape_news_for_symbol(symbol):
-    url = f"https://finance.yahoo.com/quote/{symbol}?p={symbol}"
-    headers = {"User-Agent": "Mozilla/5.0"}
-    try:
-        resp = requests.get(url, headers=headers)
-        soup = BeautifulSoup(resp.text, "html.parser")
-        news_items = soup.select("li.js-stream-content")
-        articles = []
-        for item in news_items:
-            title_tag = item.select_one("h3 a")
-            if not title_tag:
-                continue
-            title = title_tag.text.strip()
-            link = "https://finance.yahoo.com" + title_tag["href"]
-            articles.append({
-                "symbol": symbol,
-                "title": title,
-                "link": link,
-                "scraped_at": datetime.utcnow().isoformat(),
-                "sentiment": ""
-            })
-            if len(articles) >= 1:
-                break
-        return articles
-    except Exception as e:
-        print(f"[⚠️] Erreur scraping {symbol}: {e}")
-        return []
-
-# Scraping des actualités symbol par symbol
-all_articles = []
-for sym in symbols:
-    news = scrape_news_for_symbol(sym)
-    if news:
-        all_articles.extend(news)
-    time.sleep(1.5)
-
-# Si moins de 5 news récupérées, on complète avec des news générales
-if len(all_articles) < 5:
-    print("[ℹ️] Moins de 5 news spécifiques trouvées — chargement de news générales…")
+# 🇬🇧 Extract the latest news of a symbol from its Yahoo Finance quote page
+def parse_symbol_news(symbol, html):
+    # ⚡ Analyse incrémentale (core.news_extractors) : on s’arrête au premier article trouvé
+    return [{
+        "symbol": symbol,
+        "title": title,
+        "link": "https://finance.yahoo.com" + href,
+        "scraped_at": datetime.utcnow().isoformat(),
+        "sentiment": ""
+    } for title, href in extract_links(html, limit=1)]
+
+
+# 🇬🇧 Extract general market news (fallback when too few symbol news were found)
+def parse_general_news(html, articles, limit=5):
+    for title, href in extract_links(html, limit=max(limit - len(articles), 0)):
+        articles.append({
+            "symbol": "general",
+            "title": title,
+            "link": "https://finance.yahoo.com" + href,
+            "scraped_at": datetime.utcnow().isoformat(),
+            "sentiment": ""
+        })
+    return articles
+
+
+def scrape_news(symbols, fetcher, cache):
+    """
+    🇫🇷 Télécharge en parallèle les pages des symboles (débit limité) puis extrait les actualités.
+    🇩🇪 Lädt die Symbolseiten parallel (mit Ratenlimit) und extrahiert die Nachrichten.
+    🇬🇧 Fetches every quote page concurrently through the shared fetcher and parses the news.
+        Pages the cache reports as unchanged since the last run are neither parsed nor written.
+        General news are added when fewer than 5 articles were found, unless that is only because
+        pages were unchanged (their news are already stored) and none failed.
+        Raises RuntimeError when no quote page could be downloaded at all.
+    """
+    all_articles = []
+    urls = [QUOTE_URL.format(symbol=sym) for sym in symbols]
+    pages = fetcher.fetch_all(urls, headers=cache.headers)
+    failed = sum(resp is None or not resp.ok for resp in pages)
+    if symbols and failed == len(symbols):
+        raise RuntimeError(f"Aucune page téléchargée ({failed}/{len(symbols)} échecs)")
+    unchanged = 0
+    for sym, url, resp in zip(symbols, urls, pages):
+        if resp is None or not resp.ok:
+            continue
+        if cache.is_unchanged(url, resp):
+            unchanged += 1
+            continue
+        try:
+            all_articles.extend(parse_symbol_news(sym, resp.text))
+            cache.mark_processed(url, resp)
+        except Exception as e:
+            failed += 1
+            print(f"[⚠️] Erreur scraping {sym}: {e}")
+
+    # Si moins de 5 news récupérées, on complète avec des news générales — pas quand les pages étaient
+    # simplement inchangées (sinon le repli serait téléchargé à chaque passage planifié)
+    if len(all_articles) < 5 and (failed or not unchanged):
+        print("[ℹ️] Moins de 5 news spécifiques trouvées — chargement de news générales…")
+        resp = fetcher.fetch(GENERAL_NEWS_URL, headers=cache.headers(GENERAL_NEWS_URL))
+        if not cache.is_unchanged(GENERAL_NEWS_URL, resp) and resp is not None and resp.ok:
+            try:
+                parse_general_news(resp.text, all_articles)
+                cache.mark_processed(GENERAL_NEWS_URL, resp)
+            except Exception as e:
+                print(f"[⚠️] Erreur scraping news générales: {e}")
+    return all_articles
+
+
+def main():
+    start = time.perf_counter()
+    # Récupération des symboles (🇫🇷 sauvegardés sous "_id")
+    symbols = list_gainer_symbols()
+    # 🏷️ ETag / Last-Modified / hash de chaque page au dernier passage
+    cache = ConditionalCache([QUOTE_URL.format(symbol=sym) for sym in symbols] + [GENERAL_NEWS_URL])
+
+    with Fetcher() as fetcher:
+        all_articles = scrape_news(symbols, fetcher, cache)
+        stats = fetcher.get_stats()
+    print(f"[🌐] {len(symbols)} pages en {time.perf_counter() - start:.1f}s "
+          f"({stats['requests']} requêtes, {stats['retries']} reprises, {stats['failures']} échecs)")
+    print(f"[⏭️] {cache.summary()}")
+
+    # Insertion dans MongoDB sans doublons (par symbol + titre)
+    ops = []
+    for article in all_articles:
+        ops.append(UpdateOne(
+            {"symbol": article["symbol"], "title": article["title"]},
+            {"$setOnInsert": article},
+            upsert=True
+        ))
+
+    if ops:
+        result = news_by_symbol_collection().bulk_write(ops)
+        print(f"[✅] {result.upserted_count} nouveaux articles insérés.")
+    else:
+        print("[ℹ️] Aucun nouvel article trouvé.")
+    cache.save()
+
+
+if __name__ == "__main__":
     try:
-        resp = requests.get("https://finance.yahoo.com/topic/latest-news", headers={"User-Agent": "Mozilla/5.0"})
-        soup = BeautifulSoup(resp.text, "html.parser")
-        news_items = soup.select("li.js-stream-content h3 a")
-        for item in news_items:
-            title = item.text.strip()
-            link = "https://finance.yahoo.com" + item["href"]
-            all_articles.append({
-                "symbol": "general",
-                "title": title,
-                "link": link,
-                "scraped_at": datetime.utcnow().isoformat(),
-                "sentiment": ""
-            })
-            if len(all_articles) >= 5:
-                break
+        main()
     except Exception as e:
-        print(f"[⚠️] Erreur scraping news générales: {e}")
-
-# Insertion dans MongoDB sans doublons (par symbol + titre)
-ops = []
-for article in all_articles:
-    ops.append(UpdateOne(
-        {"symbol": article["symbol"], "title": article["title"]},
-        {"$setOnInsert": article},
-        upsert=True
-    ))
-
-if ops:
-    result = news_col.bulk_write(ops)
-    print(f"[✅] {result.upserted_count} nouveaux articles insérés.")
-else:
-    print("[ℹ️] Aucun nouvel article trouvé.")
-
-client.close()
+        print(f"[❌] {e}")
+        sys.exit(1)
+    finally:
+        close_client()